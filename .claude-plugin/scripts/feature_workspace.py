@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Feature workspace operations for the Specimin skills.
+Creates numbered feature branches and saves artifacts into a feature
+directory with one commit per save, on behalf of setup.feature.sh and the
+save-*.sh scripts. Branch numbers come from a single `git for-each-ref`
+call, cached in the git directory until refs change, and several artifacts
+can be staged together and committed once.
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+
+
+PLANS_ROOT = Path(".specimin") / "plans"
+
+# Branch counter cache, relative to the git common directory
+COUNTER_FILE = Path("specimin") / "branch-counter.json"
+
+# Set to 1 to stage saved artifacts without committing; `commit` then
+# records everything staged in one commit (used by automated eval runs)
+DEFER_ENV_VAR = "SPECIMIN_DEFER_COMMIT"
+
+# Leading feature number of a branch name, e.g. 012 in origin/012-user-auth
+BRANCH_NUMBER = re.compile(r"(?:^|/)(\d{3,})-")
+
+
+class WorkspaceError(Exception):
+    """A precondition for a workspace operation does not hold."""
+
+
+def git(*args, check=True):
+    """
+    Run a git command.
+
+    Args:
+        *args: git arguments
+        check (bool): Raise on a non-zero exit status
+
+    Returns:
+        subprocess.CompletedProcess: With text stdout and stderr
+
+    Raises:
+        WorkspaceError: If check is set and the command fails
+    """
+    result = subprocess.run(["git", *args], capture_output=True, text=True)
+    if check and result.returncode != 0:
+        raise WorkspaceError(result.stderr.strip() or f"git {args[0]} failed")
+    return result
+
+
+def git_common_dir():
+    """
+    Returns:
+        Path: The repository's common git directory
+
+    Raises:
+        WorkspaceError: Outside a git repository
+    """
+    result = git("rev-parse", "--git-common-dir", check=False)
+    if result.returncode != 0:
+        raise WorkspaceError("Not a git repository")
+    return Path(result.stdout.strip()).resolve()
+
+
+def list_refs(*namespaces):
+    """
+    List ref names with one `git for-each-ref` call.
+
+    Args:
+        *namespaces: Ref prefixes (defaults to local and remote branches)
+
+    Returns:
+        list: Short ref names, e.g. '012-user-auth', 'origin/012-user-auth'
+    """
+    namespaces = namespaces or ("refs/heads", "refs/remotes")
+    output = git("for-each-ref", "--format=%(refname:short)", *namespaces).stdout
+    return [line for line in output.splitlines() if line]
+
+
+def _refs_stamp(common_dir):
+    """
+    Stamp of the branch names in the ref stores.
+
+    Commits rewrite loose ref files in place, so the stamp covers the names
+    of loose refs rather than their mtimes, plus the packed-refs file (only
+    rewritten on pack, fetch or delete). A reftable store changes on every
+    update, so there the stamp is its table list.
+    """
+    digest = hashlib.sha256()
+    for name in ("packed-refs", "reftable/tables.list"):
+        try:
+            stat = (common_dir / name).stat()
+        except FileNotFoundError:
+            continue
+        digest.update(f"{name}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+
+    for namespace in ("heads", "remotes"):
+        directory = common_dir / "refs" / namespace
+        names = []
+        for parent, _, files in os.walk(directory):
+            prefix = os.path.relpath(parent, directory)
+            names.extend(os.path.join(prefix, f) for f in files if not f.endswith(".lock"))
+        digest.update(f"{namespace}:{len(names)}\n".encode())
+        digest.update("\n".join(sorted(names)).encode())
+    return digest.hexdigest()
+
+
+def highest_branch_number(common_dir=None):
+    """
+    Highest feature number among local and remote branches.
+
+    The result is cached in the git directory with a stamp of the branch
+    names in the ref stores, so repeated calls only list refs again after
+    a branch was created, deleted, fetched or packed; commits keep it.
+
+    Args:
+        common_dir (Path): Git common directory (looked up if omitted)
+
+    Returns:
+        int: Highest number, or 0 if no branch is numbered
+    """
+    common_dir = common_dir or git_common_dir()
+    cache_path = common_dir / COUNTER_FILE
+    stamp = _refs_stamp(common_dir)
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        if cached.get("stamp") == stamp:
+            return cached["highest"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        pass
+
+    highest = 0
+    for ref in list_refs():
+        match = BRANCH_NUMBER.search(ref)
+        if match:
+            highest = max(highest, int(match.group(1)))
+    _write_counter(cache_path, highest, stamp)
+    return highest
+
+
+def _write_counter(cache_path, highest, stamp):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump({"highest": highest, "stamp": stamp}, f)
+        os.replace(temp_file, cache_path)
+    except OSError:
+        pass
+
+
+def slugify(description):
+    """
+    Branch suffix from a feature description: its first two words.
+
+    Args:
+        description (str): Feature description
+
+    Returns:
+        str: e.g. 'user-authentication' for 'User authentication with JWT'
+    """
+    cleaned = re.sub(r"[^a-z0-9 -]", "", description.lower())
+    return "-".join(cleaned.split()[:2]).strip("-")
+
+
+def defer_commits():
+    """
+    Returns:
+        bool: Whether saves should stage without committing ($SPECIMIN_DEFER_COMMIT)
+    """
+    return os.environ.get(DEFER_ENV_VAR) == "1"
+
+
+def commit_staged(message):
+    """
+    Commit whatever is staged.
+
+    Args:
+        message (str): Commit message
+
+    Returns:
+        bool: Whether a commit was made (False if nothing was staged)
+    """
+    if git("diff", "--cached", "--quiet", check=False).returncode == 0:
+        return False
+    git("commit", "--quiet", "-m", message)
+    return True
+
+
+def setup_feature(description, branch_name=None, issue_number=None, commit=True):
+    """
+    Create a numbered feature branch and its planning directory.
+
+    Args:
+        description (str): Feature description
+        branch_name (str): Branch suffix (defaults to the description's first two words)
+        issue_number (str): Use this number instead of the next free one
+        commit (bool): Commit the empty directory (staged only if commits are deferred)
+
+    Returns:
+        dict: branch_name, feature_dir, absolute_path, status
+
+    Raises:
+        WorkspaceError: Outside a git repository, with uncommitted changes,
+            or if the branch already exists
+    """
+    common_dir = git_common_dir()
+    # Deferred saves of earlier features may still be staged; they carry
+    # over to the new branch and land in the next `commit`
+    pathspec = [f":(exclude){PLANS_ROOT.as_posix()}"] if defer_commits() else []
+    if git("diff-index", "--quiet", "HEAD", "--", *pathspec, check=False).returncode != 0:
+        raise WorkspaceError("Uncommitted changes exist. Commit or stash first.")
+
+    highest = None
+    if issue_number:
+        try:
+            number = int(issue_number)
+        except ValueError:
+            raise WorkspaceError(f"Invalid issue number '{issue_number}'")
+    else:
+        highest = highest_branch_number(common_dir)
+        number = highest + 1
+
+    name = f"{number:03d}-{branch_name or slugify(description)}"
+    if git("rev-parse", "--verify", "--quiet", name, check=False).returncode == 0:
+        raise WorkspaceError(f"Branch '{name}' already exists")
+
+    feature_dir = PLANS_ROOT / name
+    feature_dir.mkdir(parents=True, exist_ok=True)
+    git("checkout", "--quiet", "-b", name)
+    if highest is not None:
+        # The new branch is now the highest; no need to list refs next time
+        _write_counter(common_dir / COUNTER_FILE, number, _refs_stamp(common_dir))
+
+    if commit:
+        (feature_dir / ".gitkeep").touch()
+        git("add", "--", str(feature_dir))
+        if not defer_commits():
+            commit_staged(f"Initialize feature: {description}")
+
+    return {
+        "branch_name": name,
+        "feature_dir": feature_dir.as_posix(),
+        "absolute_path": (Path.cwd() / feature_dir).as_posix(),
+        "status": "success"
+    }
+
+
+class ArtifactTransaction:
+    """
+    Stage several artifacts of a feature and record them in one commit.
+
+    Files are copied into the feature directory as they are staged; the
+    previous contents are kept so that leaving the block with an exception
+    restores every file and unstages it. On success all paths are added
+    with a single `git add` and committed once; in copy-only mode git is
+    not touched and the files stay untracked.
+
+        with ArtifactTransaction(feature_dir, "Add plan") as tx:
+            tx.stage("plan.md", "/tmp/plan-draft.md")
+    """
+
+    def __init__(self, feature_dir, message, commit=True, add_all=False, copy_only=False):
+        """
+        Args:
+            feature_dir (str): Feature directory, e.g. .specimin/plans/012-user-auth
+            message (str): Commit message
+            commit (bool): Commit on success (otherwise only stage)
+            add_all (bool): Also stage every other change in the work tree
+            copy_only (bool): Only copy the files; run no git commands
+        """
+        self.feature_dir = Path(feature_dir)
+        self.message = message
+        self.commit = commit and not copy_only
+        self.add_all = add_all
+        self.copy_only = copy_only
+        self.staged = []
+        self.committed = False
+        self._backups = {}
+
+    def __enter__(self):
+        return self
+
+    def next_number(self, pattern):
+        """
+        Next free number for a numbered artifact.
+
+        Args:
+            pattern (str): Path relative to the feature directory with '{n}',
+                e.g. 'reviews/review_{n}.md'
+
+        Returns:
+            int: One more than the highest existing number (1 if none)
+        """
+        directory = (self.feature_dir / pattern).parent
+        prefix, _, suffix = Path(pattern).name.partition("{n}")
+        numbered = re.compile(re.escape(prefix) + r"(\d+)" + re.escape(suffix) + "$")
+        highest = 0
+        if directory.is_dir():
+            for entry in os.listdir(directory):
+                match = numbered.match(entry)
+                if match:
+                    highest = max(highest, int(match.group(1)))
+        return highest + 1
+
+    def stage(self, name, source):
+        """
+        Copy a file into the feature directory.
+
+        Args:
+            name (str): Destination relative to the feature directory; a
+                '{n}' is replaced by the next free number
+            source (str): File to copy
+
+        Returns:
+            Path: The destination path
+
+        Raises:
+            WorkspaceError: If the source file does not exist
+        """
+        source = Path(source)
+        if not source.is_file():
+            raise WorkspaceError(f"File not found: {source}")
+        if "{n}" in name:
+            name = name.replace("{n}", str(self.next_number(name)))
+
+        destination = self.feature_dir / name
+        if destination not in self._backups:
+            self._backups[destination] = destination.read_bytes() if destination.exists() else None
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = destination.with_name(f".{destination.name}.tmp")
+        shutil.copyfile(source, temp_file)
+        os.replace(temp_file, destination)
+        self.staged.append(destination)
+        return destination
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            if self.copy_only:
+                return False
+            try:
+                paths = [str(p) for p in self.staged]
+                if self.add_all:
+                    git("add", "-A")
+                elif paths:
+                    git("add", "--", *paths)
+                if self.commit:
+                    self.committed = commit_staged(self.message)
+                return False
+            except WorkspaceError:
+                self._rollback()
+                raise
+        self._rollback()
+        return False
+
+    def _rollback(self):
+        if self.staged and not self.copy_only:
+            git("reset", "--quiet", "--", *[str(p) for p in self._backups], check=False)
+        for path, content in self._backups.items():
+            if content is None:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            else:
+                path.write_bytes(content)
+
+
+def save_artifacts(branch, artifacts, message, root=PLANS_ROOT, require=(), on_branch=False,
+                   commit=True, add_all=False, copy_only=False):
+    """
+    Validate a feature and save artifacts into it with one commit.
+
+    Args:
+        branch (str): Feature branch name
+        artifacts (list): (name relative to the feature directory, source path) pairs
+        message (str): Commit message
+        root (str): Directory holding feature directories
+        require (list): Files (relative to the feature directory) that must exist
+        on_branch (bool): Require the branch to be checked out
+        commit (bool): Commit (otherwise stage only; also off when commits are deferred)
+        add_all (bool): Stage every other change in the work tree too
+        copy_only (bool): Copy the artifacts without staging or committing them
+
+    Returns:
+        dict: feature_dir, branch_name, artifacts (name -> path), committed
+
+    Raises:
+        WorkspaceError: If a precondition fails
+    """
+    git_common_dir()
+    feature_dir = Path(root) / branch
+    if not feature_dir.is_dir():
+        raise WorkspaceError(f"Feature directory not found: {feature_dir}")
+
+    if on_branch:
+        current = git("branch", "--show-current").stdout.strip()
+        if current != branch:
+            raise WorkspaceError(f"Not on branch '{branch}' (currently on '{current}')")
+
+    for name in require:
+        if not (feature_dir / name).exists():
+            raise WorkspaceError(f"{name} not found at {feature_dir / name}")
+
+    saved = {}
+    with ArtifactTransaction(feature_dir, message, commit and not defer_commits(), add_all,
+                             copy_only) as tx:
+        for name, source in artifacts:
+            saved[name] = tx.stage(name, source).as_posix()
+
+    return {
+        "feature_dir": feature_dir.as_posix(),
+        "branch_name": branch,
+        "artifacts": saved,
+        "committed": tx.committed
+    }
+
+
+def _parse_artifact(value):
+    name, sep, source = value.partition("=")
+    if not sep or not name or not source:
+        raise argparse.ArgumentTypeError(f"expected NAME=SOURCE, got '{value}'")
+    return name, source
+
+
+def main():
+    """Main entry point when run as script."""
+    parser = argparse.ArgumentParser(description="Create feature branches and save feature artifacts.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("next-number", help="Print the next feature branch number")
+
+    setup = subparsers.add_parser("setup", help="Create a feature branch and planning directory")
+    setup.add_argument("description")
+    setup.add_argument("--json", action="store_true")
+    setup.add_argument("--no-commit", action="store_true")
+    setup.add_argument("--branch-name")
+    setup.add_argument("--issue-number")
+
+    save = subparsers.add_parser("save", help="Copy artifacts into a feature directory and commit once")
+    save.add_argument("branch")
+    save.add_argument("--artifact", action="append", type=_parse_artifact, default=[], metavar="NAME=SOURCE",
+                      help="Copy SOURCE to NAME in the feature directory ('{n}' numbers it); repeatable")
+    save.add_argument("--message", "-m", default=None, help="Commit message")
+    save.add_argument("--root", default=str(PLANS_ROOT), help=f"Feature directories (default: {PLANS_ROOT})")
+    save.add_argument("--require", action="append", default=[], metavar="FILE",
+                      help="File in the feature directory that must exist; repeatable")
+    save.add_argument("--on-branch", action="store_true", help="Require the branch to be checked out")
+    save.add_argument("--add-all", action="store_true", help="Also commit every other change in the work tree")
+    save.add_argument("--no-commit", action="store_true", help="Stage without committing")
+    save.add_argument("--copy-only", action="store_true",
+                      help="Copy without staging or committing (leaves the files untracked)")
+    save.add_argument("--hint", default=None, help="Printed after a validation error")
+    save.add_argument("--path-only", action="store_true", help="Print only the last saved path")
+
+    commit = subparsers.add_parser("commit", help="Commit staged artifacts (after deferred saves)")
+    commit.add_argument("--message", "-m", required=True)
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "next-number":
+            print(f"{highest_branch_number() + 1:03d}")
+        elif args.command == "setup":
+            result = setup_feature(args.description, args.branch_name, args.issue_number, not args.no_commit)
+            if args.json:
+                print(json.dumps(result, indent=2))
+            else:
+                print(f"\033[0;32mSUCCESS: Feature setup complete!\033[0m\n\nBranch: {result['branch_name']}\n"
+                      f"Directory: {result['feature_dir']}")
+                if not args.no_commit:
+                    print(f"\nNext: Use spec template to create {result['feature_dir']}/spec.md")
+        elif args.command == "save":
+            if not args.artifact and not args.add_all:
+                parser.error("save needs at least one --artifact or --add-all")
+            if args.copy_only and args.add_all:
+                parser.error("--copy-only cannot be combined with --add-all")
+            try:
+                result = save_artifacts(
+                    args.branch, args.artifact, args.message or f"Update feature artifacts: {args.branch}",
+                    root=args.root, require=args.require, on_branch=args.on_branch,
+                    commit=not args.no_commit, add_all=args.add_all, copy_only=args.copy_only
+                )
+            except WorkspaceError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                if args.hint:
+                    print(args.hint, file=sys.stderr)
+                sys.exit(1)
+            if not (args.no_commit or args.copy_only) and not defer_commits() and not result["committed"]:
+                print("Warning: No changes to commit", file=sys.stderr)
+            if args.path_only:
+                print(list(result["artifacts"].values())[-1] if result["artifacts"] else result["feature_dir"])
+            else:
+                print(json.dumps(result))
+        else:
+            if not commit_staged(args.message):
+                print("Warning: Nothing staged to commit", file=sys.stderr)
+    except WorkspaceError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
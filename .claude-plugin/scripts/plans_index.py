@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Query index over Specimin feature artifacts.
+Indexes spec.md, plan.md, implementation.md, tasks/phase_N.md and the task
+manifest of every feature in .specimin/plans into a local SQLite database
+(full-text search over markdown sections, task status, referenced file
+paths), so skills can fetch the sections they need instead of reading
+whole artifacts. Files are reindexed only when their content changes.
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+from pathlib import Path
+
+
+PLANS_DIR = Path(".specimin") / "plans"
+
+# Index database, relative to the project root
+INDEX_FILE = Path(".specimin") / ".cache" / "plans_index.sqlite"
+
+# Bump when the schema or extraction changes; older indexes are rebuilt
+SCHEMA_VERSION = 2
+
+# Feature file (relative to the feature directory) -> kind
+ARTIFACT_PATTERNS = {
+    "spec.md": "spec",
+    "plan.md": "plan",
+    "implementation.md": "implementation",
+    "tasks/phase_*.md": "phase",
+    "tasks/manifest.json": "manifest",
+    "tasks/status.jsonl": "status"
+}
+
+# Kinds that feed the tasks table
+TASK_KINDS = ("implementation", "manifest", "status")
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+# Bold label opening a line, as in the spec template: '**Acceptance Criteria**: ...'
+BOLD_LABEL = re.compile(r"^\*\*([^*]+)\*\*\s*(.*)$")
+
+# Section level of a bold label: below every heading, so it ends at the next
+# heading or label and a heading's section keeps the labels under it
+LABEL_LEVEL = 7
+FENCE = re.compile(r"^\s*(```|~~~)")
+TASK_LINE = re.compile(r"^\s*- \[([ xX])\]\s+(T\d+)\s+(.*)$")
+
+# File paths mentioned in artifacts: anything with a directory separator,
+# or a bare file name with a common source extension
+PATH_REF = re.compile(
+    r"(?<![\w/.])(?:[\w.{}-]+/)+[\w.{}-]*[\w}]"
+    r"|(?<![\w/.-])[\w-]+\.(?:py|md|sh|json|jsonl|ya?ml|toml|ex|exs|js|jsx|ts|tsx|rb|go|rs|java|kt|swift|c|h|cpp|css|html|sql|txt)\b"
+)
+
+SCHEMA = """
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    feature TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE sections USING fts5(
+    heading, body,
+    path UNINDEXED, feature UNINDEXED, kind UNINDEXED,
+    level UNINDEXED, line_start UNINDEXED, line_end UNINDEXED
+);
+CREATE TABLE tasks (
+    feature TEXT NOT NULL,
+    id TEXT NOT NULL,
+    description TEXT NOT NULL,
+    phase INTEGER,
+    status TEXT NOT NULL,
+    source TEXT NOT NULL,
+    PRIMARY KEY (feature, id)
+);
+CREATE TABLE refs (
+    ref TEXT NOT NULL,
+    path TEXT NOT NULL,
+    feature TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX refs_by_path ON refs (path);
+CREATE INDEX refs_by_ref ON refs (ref);
+"""
+
+
+def _plain_heading(text):
+    """Heading text without emphasis markers or a trailing colon."""
+    return text.strip().strip("*_").strip().rstrip(":").strip("*_").strip()
+
+
+def split_sections(text):
+    """
+    Split markdown into sections at headings and bold labels, ignoring fenced code.
+
+    Heading text is stored without emphasis ('## **Scope**' -> 'Scope').
+    A line opening with a bold label ('**Acceptance Criteria**: ...')
+    starts a section at LABEL_LEVEL; text after the label is its first line.
+
+    Args:
+        text (str): Markdown content
+
+    Returns:
+        list: (heading, level, line_start, line_end, body) per section, with
+            1-based inclusive line numbers. Text before the first heading is
+            a section with heading '' and level 0.
+    """
+    sections = []
+    heading, level, start, body = "", 0, 1, []
+    in_fence = False
+    lines = text.splitlines()
+    for number, line in enumerate(lines, 1):
+        if FENCE.match(line):
+            in_fence = not in_fence
+        match = label = None
+        if not in_fence:
+            match = HEADING.match(line)
+            label = None if match else BOLD_LABEL.match(line)
+        if match or label:
+            if heading or any(l.strip() for l in body):
+                sections.append((heading, level, start, number - 1, "\n".join(body).strip()))
+            if match:
+                heading, level, body = _plain_heading(match.group(2)), len(match.group(1)), []
+            else:
+                rest = label.group(2).lstrip(":").strip()
+                heading, level, body = _plain_heading(label.group(1)), LABEL_LEVEL, [rest] if rest else []
+            start = number
+        else:
+            body.append(line)
+    if heading or any(l.strip() for l in body):
+        sections.append((heading, level, start, len(lines), "\n".join(body).strip()))
+    return sections
+
+
+def extract_refs(text):
+    """
+    Find file paths mentioned in text.
+
+    Args:
+        text (str): Artifact content
+
+    Returns:
+        list: (path, line number) pairs in order of appearance
+    """
+    refs = []
+    for number, line in enumerate(text.splitlines(), 1):
+        for match in PATH_REF.finditer(line):
+            ref = match.group(0)
+            refs.append((ref[2:] if ref.startswith("./") else ref, number))
+    return refs
+
+
+def fts_query(query):
+    """Quote a search string as an FTS5 phrase per word, so punctuation is literal."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+class PlansIndex:
+    """
+    SQLite index over the feature artifacts of one project.
+
+    update() compares every artifact's mtime and size with the index and
+    rehashes only files whose stamp changed; files with new content are
+    reindexed, deleted files are dropped. Queries call update() first, so
+    results always reflect the files on disk.
+    """
+
+    def __init__(self, root=".", db_path=None):
+        """
+        Args:
+            root (str): Project root containing .specimin/plans
+            db_path (str): Index database (defaults to INDEX_FILE under root)
+        """
+        self.root = Path(root).resolve()
+        self.plans_dir = self.root / PLANS_DIR
+        self.db_path = Path(db_path) if db_path else self.root / INDEX_FILE
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._create_schema()
+
+    def _create_schema(self):
+        with self.conn:
+            for table in ("files", "sections", "tasks", "refs"):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def artifacts(self):
+        """
+        Returns:
+            dict: Path relative to the root -> (feature, kind) for every
+                artifact currently on disk
+        """
+        found = {}
+        if not self.plans_dir.is_dir():
+            return found
+        for feature_dir in sorted(p for p in self.plans_dir.iterdir() if p.is_dir()):
+            for pattern, kind in ARTIFACT_PATTERNS.items():
+                for path in sorted(feature_dir.glob(pattern)):
+                    found[path.relative_to(self.root).as_posix()] = (feature_dir.name, kind)
+        return found
+
+    def update(self):
+        """
+        Bring the index up to date with the files on disk.
+
+        Returns:
+            dict: Counts of 'indexed', 'unchanged' and 'removed' files
+        """
+        stats = {"indexed": 0, "unchanged": 0, "removed": 0}
+        known = {row["path"]: row for row in self.conn.execute("SELECT * FROM files")}
+        current = self.artifacts()
+        task_features = set()
+
+        with self.conn:
+            for path in known.keys() - current.keys():
+                row = known[path]
+                self._drop_file(path)
+                if row["kind"] in TASK_KINDS:
+                    task_features.add(row["feature"])
+                stats["removed"] += 1
+
+            for path, (feature, kind) in current.items():
+                stat = (self.root / path).stat()
+                row = known.get(path)
+                if row is not None and (row["mtime_ns"], row["size"]) == (stat.st_mtime_ns, stat.st_size):
+                    stats["unchanged"] += 1
+                    continue
+
+                data = (self.root / path).read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                if row is None or row["sha256"] != digest:
+                    self._drop_file(path)
+                    self._index_file(path, feature, kind, data.decode("utf-8", errors="replace"))
+                    if kind in TASK_KINDS:
+                        task_features.add(feature)
+                    stats["indexed"] += 1
+                else:
+                    stats["unchanged"] += 1
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, feature, kind, stat.st_mtime_ns, stat.st_size, digest)
+                )
+
+            for feature in task_features:
+                self._index_tasks(feature)
+
+        return stats
+
+    def _drop_file(self, path):
+        for table in ("files", "sections", "refs"):
+            self.conn.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+    def _index_file(self, path, feature, kind, text):
+        if path.endswith(".md"):
+            self.conn.executemany(
+                "INSERT INTO sections (heading, body, path, feature, kind, level, line_start, line_end) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(heading, body, path, feature, kind, level, start, end)
+                 for heading, level, start, end, body in split_sections(text)]
+            )
+        self.conn.executemany(
+            "INSERT INTO refs (ref, path, feature, kind, line) VALUES (?, ?, ?, ?, ?)",
+            [(ref, path, feature, kind, line) for ref, line in extract_refs(text)]
+        )
+
+    def _index_tasks(self, feature):
+        """Rebuild a feature's tasks from its manifest and status journal, or implementation.md."""
+        self.conn.execute("DELETE FROM tasks WHERE feature = ?", (feature,))
+        feature_dir = self.plans_dir / feature
+        manifest_path = feature_dir / "tasks" / "manifest.json"
+        rows = {}
+
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, 'r') as f:
+                    manifest = json.load(f)
+            except json.JSONDecodeError:
+                manifest = []
+            for task in manifest if isinstance(manifest, list) else []:
+                if isinstance(task, dict) and "id" in task:
+                    rows[task["id"]] = [task["id"], task.get("description", ""), task.get("phase"),
+                                        task.get("status", "pending"), "manifest.json"]
+            # Status changes journaled by task_graph.py, last one wins
+            journal_path = feature_dir / "tasks" / "status.jsonl"
+            if journal_path.exists():
+                with open(journal_path, 'r') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if record.get("id") in rows:
+                            rows[record["id"]][3] = record.get("status", rows[record["id"]][3])
+        elif (feature_dir / "implementation.md").exists():
+            phase = None
+            with open(feature_dir / "implementation.md", 'r', errors="replace") as f:
+                for line in f:
+                    match = re.match(r"^#+\s+Phase\s+(\d+)", line)
+                    if match:
+                        phase = int(match.group(1))
+                        continue
+                    match = TASK_LINE.match(line)
+                    if match:
+                        status = "pending" if match.group(1) == " " else "completed"
+                        rows.setdefault(match.group(2), [match.group(2), match.group(3), phase, status,
+                                                         "implementation.md"])
+
+        self.conn.executemany(
+            "INSERT INTO tasks (feature, id, description, phase, status, source) VALUES (?, ?, ?, ?, ?, ?)",
+            [(feature, *row) for row in rows.values()]
+        )
+
+    def search(self, query, feature=None, kind=None, limit=20):
+        """
+        Full-text search over markdown sections.
+
+        Args:
+            query (str): Words to match (all must appear), e.g. 'AC3'
+            feature (str): Only this feature directory
+            kind (str): Only this artifact kind (spec, plan, implementation, phase)
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Dicts with feature, path, kind, heading, line_start,
+                line_end and a snippet, best match first
+
+        Raises:
+            ValueError: If the query has no words
+        """
+        if not query.split():
+            raise ValueError("Search query is empty")
+        self.update()
+        sql = ("SELECT feature, path, kind, heading, line_start, line_end, "
+               "snippet(sections, 1, '[', ']', '...', 12) AS snippet "
+               "FROM sections WHERE sections MATCH ?")
+        params = [fts_query(query)]
+        if feature:
+            sql += " AND feature = ?"
+            params.append(feature)
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def tasks(self, status=None, feature=None):
+        """
+        List tasks across features.
+
+        Args:
+            status (str): Only tasks with this status (e.g. 'pending')
+            feature (str): Only this feature directory
+
+        Returns:
+            list: Dicts with feature, id, description, phase, status, source
+        """
+        self.update()
+        sql = "SELECT feature, id, description, phase, status, source FROM tasks WHERE 1 = 1"
+        params = []
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        if feature:
+            sql += " AND feature = ?"
+            params.append(feature)
+        sql += " ORDER BY feature, id"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def touching(self, path, kind=None):
+        """
+        Find artifact lines that mention a file path.
+
+        Args:
+            path (str): Path or path fragment, e.g. 'lib/app/accounts.ex'
+            kind (str): Only this artifact kind (e.g. 'phase')
+
+        Returns:
+            list: Dicts with ref, feature, path, kind and line
+        """
+        self.update()
+        pattern = "%" + path.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        sql = "SELECT ref, feature, path, kind, line FROM refs WHERE ref LIKE ? ESCAPE '\\'"
+        params = [pattern]
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " ORDER BY feature, path, line"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def section(self, path, heading):
+        """
+        Read one section of an artifact, including its subsections.
+
+        Args:
+            path (str): Artifact path relative to the project root
+            heading (str): Heading or bold label text without emphasis
+                (case-insensitive; a prefix is enough)
+
+        Returns:
+            str: The section's lines, or None if no heading matches
+        """
+        self.update()
+        rows = self.conn.execute(
+            "SELECT heading, level, line_start FROM sections WHERE path = ? ORDER BY CAST(line_start AS INTEGER)",
+            (path,)
+        ).fetchall()
+        wanted = heading.strip().lower()
+        for i, row in enumerate(rows):
+            if row["heading"].lower().startswith(wanted):
+                end = None
+                for later in rows[i + 1:]:
+                    if later["level"] and later["level"] <= row["level"]:
+                        end = later["line_start"] - 1
+                        break
+                lines = (self.root / path).read_text().splitlines()
+                return "\n".join(lines[row["line_start"] - 1:end]).rstrip() + "\n"
+        return None
+
+
+def main():
+    """Main entry point when run as script."""
+    parser = argparse.ArgumentParser(
+        description="Query the feature artifacts in .specimin/plans through an incremental index."
+    )
+    parser.add_argument("--root", default=".", help="Project root (default: current directory)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("update", help="Index changed artifacts and print counts")
+
+    search = subparsers.add_parser("search", help="Full-text search over markdown sections")
+    search.add_argument("query")
+    search.add_argument("--feature")
+    search.add_argument("--kind", choices=[k for k in ARTIFACT_PATTERNS.values() if k not in ("manifest", "status")])
+    search.add_argument("--limit", type=int, default=20)
+
+    tasks = subparsers.add_parser("tasks", help="List tasks across features")
+    tasks.add_argument("--status")
+    tasks.add_argument("--feature")
+
+    touches = subparsers.add_parser("touches", help="Artifact lines mentioning a file path")
+    touches.add_argument("path")
+    touches.add_argument("--kind")
+
+    section = subparsers.add_parser("section", help="Print one section of an artifact")
+    section.add_argument("path", help="Artifact path, e.g. .specimin/plans/005-x/spec.md")
+    section.add_argument("heading")
+
+    args = parser.parse_args()
+
+    try:
+        index = PlansIndex(args.root)
+    except sqlite3.Error as e:
+        print(f"Error: Could not open plans index: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.command == "update":
+            print(json.dumps(index.update(), indent=2))
+        elif args.command == "search":
+            print(json.dumps(index.search(args.query, args.feature, args.kind, args.limit), indent=2))
+        elif args.command == "tasks":
+            print(json.dumps(index.tasks(args.status, args.feature), indent=2))
+        elif args.command == "touches":
+            print(json.dumps(index.touching(args.path, args.kind), indent=2))
+        else:
+            path = Path(os.path.relpath(Path(args.path).resolve(), index.root)).as_posix()
+            text = index.section(path, args.heading)
+            if text is None:
+                print(f"Error: No section '{args.heading}' in {path}", file=sys.stderr)
+                sys.exit(1)
+            sys.stdout.write(text)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except sqlite3.Error as e:
+        print(f"Error: Plans index query failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
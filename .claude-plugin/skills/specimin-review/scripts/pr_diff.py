@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+PR diff extractor for the specimin-review skill.
+Reads `git diff MAIN...BRANCH` once as a stream, splits it into per-file
+hunks with stats, ranks files by relevance to the feature's acceptance
+criteria and prints as much of the diff as fits a size budget, followed by
+a manifest of what was left out.
+"""
+
+import re
+import sys
+import json
+import argparse
+import subprocess
+from fnmatch import fnmatch
+from pathlib import Path
+
+
+# Characters of diff text printed by default
+DEFAULT_BUDGET = 60000
+
+# Files summarized but never printed: lockfiles and generated or vendored code
+LOCKFILES = (
+    "package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml", "bun.lockb",
+    "Cargo.lock", "poetry.lock", "Pipfile.lock", "uv.lock", "Gemfile.lock", "composer.lock",
+    "go.sum", "mix.lock", "pubspec.lock", "Podfile.lock", "flake.lock"
+)
+GENERATED_PATTERNS = (
+    "*.min.js", "*.min.css", "*.map", "*_pb2.py", "*_pb2_grpc.py", "*.pb.go", "*.snap",
+    "*.generated.*", "dist/*", "build/*", "vendor/*", "node_modules/*", "*/dist/*",
+    "*/build/*", "*/vendor/*", "*/node_modules/*", "priv/static/*"
+)
+
+# Words too common in acceptance criteria to say anything about a file
+STOPWORDS = frozenset("""
+    able about after also among been before being could does each
+    either every from have into just like made make more most must need only
+    other over same should such than that their them then there these they
+    this those through under until user users using when where which while
+    will with within would your shall file files code feature support
+    supports created create update updated
+""".split())
+
+# Start of the acceptance criteria in a spec: '## Acceptance Criteria',
+# '## **Acceptance Criteria**' or the template's '**Acceptance Criteria**: ...'
+CRITERIA_START = re.compile(r"^\s*(?:#{1,6}\s+)?(?:\*\*)?\s*Acceptance Criteria\s*:?\s*(?:\*\*)?\s*:?(.*)$", re.I)
+# Start of the next section: a heading or a line opening with a bold label
+SECTION_START = re.compile(r"^\s*(?:#{1,6}\s|\*\*[^*]+\*\*)")
+
+PATH_IN_TEXT = re.compile(r"(?:[\w.-]+/)+[\w.-]+|[\w-]+\.[A-Za-z]{1,5}\b")
+WORD = re.compile(r"[A-Za-z][A-Za-z0-9_]{3,}")
+
+
+class FileDiff:
+    """One file's part of the diff: header, hunks and line counts."""
+
+    __slots__ = ("path", "old_path", "status", "header", "hunks", "hunk_count", "additions",
+                 "deletions", "binary", "stored", "truncated", "score")
+
+    def __init__(self, path):
+        self.path = path
+        self.old_path = path
+        self.status = "M"
+        self.header = []
+        self.hunks = []
+        self.hunk_count = 0
+        self.additions = 0
+        self.deletions = 0
+        self.binary = False
+        self.stored = 0
+        self.truncated = False
+        self.score = 0
+
+    def to_json(self):
+        return {
+            "path": self.path,
+            "old_path": self.old_path if self.old_path != self.path else None,
+            "status": self.status,
+            "additions": self.additions,
+            "deletions": self.deletions,
+            "binary": self.binary,
+            "score": self.score
+        }
+
+
+def _split_diff_git_line(line):
+    """Paths from 'diff --git a/X b/Y', assuming X == Y when ambiguous."""
+    rest = line.rstrip("\n")[len("diff --git "):]
+    half = (len(rest) - 1) // 2
+    if rest[:half].startswith("a/") and rest[half + 1:].startswith("b/") and rest[2:half] == rest[half + 3:]:
+        return rest[2:half]
+    old, _, new = rest.partition(" b/")
+    return new or old[2:]
+
+
+def parse_diff(lines, max_stored):
+    """
+    Split a unified git diff into per-file records in one pass.
+
+    Args:
+        lines: Iterable of diff lines (with newlines)
+        max_stored (int): Characters of text kept per file; past this, only
+            line counts are kept and the file is marked truncated. Only
+            whole hunks are kept: one that does not fit is dropped.
+
+    Returns:
+        list: FileDiff per file, in diff order
+    """
+    files = []
+    current = None
+    in_hunk = False
+    for line in lines:
+        if line.startswith("diff --git "):
+            current = FileDiff(_split_diff_git_line(line))
+            current.header.append(line)
+            current.stored = len(line)
+            files.append(current)
+            in_hunk = False
+            continue
+        if current is None:
+            continue
+
+        if line.startswith("@@"):
+            in_hunk = True
+            current.hunk_count += 1
+            if not current.truncated and current.stored + len(line) <= max_stored:
+                current.hunks.append([line])
+                current.stored += len(line)
+            else:
+                current.truncated = True
+            continue
+
+        if in_hunk:
+            if line.startswith("+"):
+                current.additions += 1
+            elif line.startswith("-"):
+                current.deletions += 1
+            if current.truncated:
+                continue
+            if current.stored + len(line) <= max_stored:
+                current.hunks[-1].append(line)
+                current.stored += len(line)
+            else:
+                # Drop the partial hunk; only whole hunks are printed
+                dropped = current.hunks.pop()
+                current.stored -= sum(len(l) for l in dropped)
+                current.truncated = True
+            continue
+
+        # Extended header lines
+        current.header.append(line)
+        current.stored += len(line)
+        if line.startswith("new file mode"):
+            current.status = "A"
+        elif line.startswith("deleted file mode"):
+            current.status = "D"
+        elif line.startswith("rename from "):
+            current.old_path = line[len("rename from "):].rstrip("\n")
+            current.status = "R"
+        elif line.startswith("rename to "):
+            current.path = line[len("rename to "):].rstrip("\n")
+        elif line.startswith("copy from "):
+            current.old_path = line[len("copy from "):].rstrip("\n")
+            current.status = "C"
+        elif line.startswith("copy to "):
+            current.path = line[len("copy to "):].rstrip("\n")
+        elif line.startswith("Binary files ") or line.startswith("GIT binary patch"):
+            current.binary = True
+        elif line.startswith("+++ b/"):
+            current.path = line[len("+++ b/"):].rstrip("\n")
+        elif line.startswith("--- a/"):
+            current.old_path = line[len("--- a/"):].rstrip("\n")
+    return files
+
+
+def stream_diff(base, branch, max_stored):
+    """
+    Run git diff base...branch once and parse its output as it arrives.
+
+    Args:
+        base (str): Main branch
+        branch (str): Feature branch
+        max_stored (int): Characters of text kept per file
+
+    Returns:
+        list: FileDiff per changed file
+
+    Raises:
+        RuntimeError: If git diff fails
+    """
+    cmd = ["git", "-c", "core.quotePath=false", "diff", "--no-color", "--no-ext-diff", "-M",
+           f"{base}...{branch}"]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, encoding="utf-8", errors="replace")
+    files = parse_diff(proc.stdout, max_stored)
+    stderr = proc.stderr.read()
+    if proc.wait() != 0:
+        raise RuntimeError(stderr.strip() or f"git diff {base}...{branch} failed")
+    return files
+
+
+def noise_reason(path, excludes=()):
+    """
+    Classify files whose diff is not worth reviewing line by line.
+
+    Args:
+        path (str): File path
+        excludes (list): Extra glob patterns to leave out
+
+    Returns:
+        str: 'lockfile', 'generated' or 'excluded', or None to keep the file
+    """
+    name = path.rsplit("/", 1)[-1]
+    if name in LOCKFILES:
+        return "lockfile"
+    if any(fnmatch(path, pattern) for pattern in GENERATED_PATTERNS):
+        return "generated"
+    if any(fnmatch(path, pattern) or fnmatch(name, pattern) for pattern in excludes):
+        return "excluded"
+    return None
+
+
+def acceptance_criteria(spec_text):
+    """
+    The acceptance criteria section of a spec.
+
+    Accepts a heading ('## Acceptance Criteria', '## **Acceptance Criteria**')
+    or the spec template's bold label ('**Acceptance Criteria**', optionally
+    followed by ': text'); the section ends at the next heading or bold label.
+
+    Args:
+        spec_text (str): Contents of spec.md
+
+    Returns:
+        str: Section text, or None if the spec has no such section
+    """
+    lines = spec_text.splitlines()
+    for number, line in enumerate(lines):
+        match = CRITERIA_START.match(line)
+        if not match:
+            continue
+        body = [match.group(1)]
+        for following in lines[number + 1:]:
+            if SECTION_START.match(following):
+                break
+            body.append(following)
+        return "\n".join(body)
+    return None
+
+
+def criteria_terms(spec_text):
+    """
+    Keywords and file paths from a spec's acceptance criteria.
+
+    Args:
+        spec_text (str): Contents of spec.md
+
+    Returns:
+        tuple: (set of lowercase keywords, set of mentioned paths)
+    """
+    criteria = acceptance_criteria(spec_text)
+    text = criteria if criteria is not None else spec_text
+    words = {w.lower() for w in WORD.findall(text)} - STOPWORDS
+    paths = {p[2:] if p.startswith("./") else p for p in PATH_IN_TEXT.findall(text)}
+    return words, paths
+
+
+def score_file(file_diff, words, paths):
+    """
+    Relevance of a file to the acceptance criteria.
+
+    A path named in the criteria scores highest; then each keyword found in
+    the path, then each distinct keyword on added lines.
+    """
+    path = file_diff.path.lower()
+    score = 0
+    if any(p and (file_diff.path.endswith(p) or p.endswith(file_diff.path)) for p in paths):
+        score += 100
+    path_words = set(re.split(r"[^a-z0-9]+", path))
+    score += 10 * sum(1 for w in words if w in path_words or w in path)
+    added = "".join(line[1:] for hunk in file_diff.hunks for line in hunk if line.startswith("+")).lower()
+    score += sum(1 for w in words if w in added)
+    return score
+
+
+def rank_files(files, spec_text=None):
+    """
+    Order files for review: most relevant to the criteria first, then smallest.
+
+    Args:
+        files (list): FileDiff records
+        spec_text (str): Contents of spec.md, if any
+
+    Returns:
+        list: The records, sorted; each gets its score
+    """
+    words, paths = criteria_terms(spec_text) if spec_text else (set(), set())
+    for file_diff in files:
+        file_diff.score = score_file(file_diff, words, paths) if spec_text else 0
+    return sorted(files, key=lambda f: (-f.score, f.additions + f.deletions, f.path))
+
+
+def select(files, budget, excludes=()):
+    """
+    Choose the diff text to print within a budget.
+
+    Files are taken in ranked order. A file that does not fit whole is
+    included up to its last hunk that fits, and is reported as partial;
+    hunks dropped while parsing (see parse_diff) count as not shown.
+
+    Args:
+        files (list): Ranked FileDiff records
+        budget (int): Characters of diff text to print
+        excludes (list): Extra glob patterns to leave out
+
+    Returns:
+        tuple: (list of (FileDiff, hunks) to print, list of omitted dicts)
+    """
+    printed = []
+    omitted = []
+    remaining = budget
+    for file_diff in files:
+        reason = "binary" if file_diff.binary else noise_reason(file_diff.path, excludes)
+        if reason:
+            omitted.append(dict(file_diff.to_json(), reason=reason))
+            continue
+
+        header_size = sum(len(line) for line in file_diff.header)
+        hunks = []
+        used = header_size
+        for hunk in file_diff.hunks:
+            size = sum(len(line) for line in hunk)
+            if used + size > remaining:
+                break
+            hunks.append(hunk)
+            used += size
+
+        if not hunks and (file_diff.hunk_count or header_size > remaining):
+            omitted.append(dict(file_diff.to_json(), reason="budget"))
+            continue
+        remaining -= used
+        printed.append((file_diff, hunks))
+        if len(hunks) < file_diff.hunk_count:
+            omitted.append(dict(file_diff.to_json(), reason="partial",
+                                hunks_shown=len(hunks), hunks_total=file_diff.hunk_count))
+    return printed, omitted
+
+
+def format_stat(files):
+    """Per-file change counts in the style of git diff --stat."""
+    width = max((len(f.path) for f in files), default=0)
+    lines = []
+    for f in files:
+        changes = "Bin" if f.binary else f"{f.additions + f.deletions} {'+' * min(f.additions, 30)}{'-' * min(f.deletions, 30)}"
+        lines.append(f" {f.path.ljust(width)} | {changes}".rstrip())
+    insertions = sum(f.additions for f in files)
+    deletions = sum(f.deletions for f in files)
+    lines.append(f" {len(files)} files changed, {insertions} insertions(+), {deletions} deletions(-)")
+    return "\n".join(lines)
+
+
+def format_name_status(files):
+    """Status and paths in the style of git diff --name-status."""
+    return "\n".join(
+        f"{f.status}\t{f.old_path}\t{f.path}" if f.status in ("R", "C") else f"{f.status}\t{f.path}"
+        for f in files
+    )
+
+
+def resolve_main_branch(name):
+    """Return the main branch, falling back to master as get-pr-diff.sh did; None if neither exists."""
+    for candidate in (name, "master"):
+        check = subprocess.run(["git", "show-ref", "--verify", "--quiet", f"refs/heads/{candidate}"])
+        if check.returncode == 0:
+            return candidate
+    return None
+
+
+def main():
+    """Main entry point when run as script."""
+    parser = argparse.ArgumentParser(
+        description="Print a PR's diff ranked by relevance to the spec, within a size budget."
+    )
+    parser.add_argument("branch", help="Feature branch")
+    parser.add_argument("main_branch", nargs="?", default="main", help="Base branch (default: main, else master)")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET,
+                        help=f"Characters of diff text to print (default: {DEFAULT_BUDGET})")
+    parser.add_argument("--spec", default=None,
+                        help="Spec to rank files against (default: .specimin/plans/{branch}/spec.md)")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Leave out matching files (repeatable)")
+    parser.add_argument("--json", action="store_true",
+                        help="Print files, diff text and omissions as one JSON object")
+    args = parser.parse_args()
+
+    base = resolve_main_branch(args.main_branch)
+    if base is None:
+        print("Error: Could not find main or master branch", file=sys.stderr)
+        sys.exit(1)
+
+    spec_path = Path(args.spec or Path(".specimin") / "plans" / args.branch / "spec.md")
+    spec_text = spec_path.read_text(errors="replace") if spec_path.is_file() else None
+
+    try:
+        files = stream_diff(base, args.branch, max(args.budget, 0))
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    ranked = rank_files(files, spec_text)
+    printed, omitted = select(ranked, args.budget, args.exclude)
+
+    if args.json:
+        print(json.dumps({
+            "base": base,
+            "branch": args.branch,
+            "spec": str(spec_path) if spec_text else None,
+            "budget": args.budget,
+            "files": [f.to_json() for f in ranked],
+            "diff": "".join("".join(f.header) + "".join("".join(h) for h in hunks) for f, hunks in printed),
+            "omitted": omitted
+        }, indent=2))
+        return
+
+    print("=== DIFF STATS ===")
+    print(format_stat(files))
+    print()
+    print("=== FILES CHANGED ===")
+    print(format_name_status(files))
+    print()
+    print(f"=== FULL DIFF === (ranked by relevance to {spec_path if spec_text else 'size'}; budget {args.budget} chars)")
+    for file_diff, hunks in printed:
+        sys.stdout.write("".join(file_diff.header))
+        for hunk in hunks:
+            sys.stdout.write("".join(hunk))
+    if omitted:
+        print()
+        print("=== OMITTED ===")
+        for entry in omitted:
+            detail = (f"{entry['hunks_shown']}/{entry['hunks_total']} hunks shown"
+                      if entry["reason"] == "partial" else f"+{entry['additions']} -{entry['deletions']}")
+            print(f"{entry['reason']}\t{entry['path']}\t{detail}")
+
+
+if __name__ == "__main__":
+    main()
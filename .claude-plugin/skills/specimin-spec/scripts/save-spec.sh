@@ -46,13 +46,10 @@ if [ -z "$FEATURE_DIR" ] || [ "$FEATURE_DIR" = "null" ]; then
   exit 1
 fi
 
-# Copy spec file to feature directory
+# Copy spec file to feature directory and commit
 SPEC_DEST="$FEATURE_DIR/spec.md"
-cp "$SPEC_FILE_PATH" "$SPEC_DEST"
-
-# Commit
-git add "$SPEC_DEST"
-git commit -m "Add specification: $USER_REQUIREMENT"
+python3 "$SCRIPT_DIR/../../../scripts/feature_workspace.py" save "$BRANCH_NAME" \
+  --artifact "spec.md=$SPEC_FILE_PATH" --message "Add specification: $USER_REQUIREMENT" > /dev/null
 
 # Output success message with JSON
 echo "{\"feature_dir\": \"$FEATURE_DIR\", \"branch_name\": \"$BRANCH_NAME\", \"spec_path\": \"$SPEC_DEST\"}"
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Dependency-graph view of a feature's task manifest.
+Loads tasks/manifest.json into an indexed DAG, computes waves of tasks that
+can run in parallel and the critical path, and records status changes in an
+append-only journal next to the manifest instead of rewriting it.
+"""
+
+import os
+import sys
+import json
+import heapq
+from pathlib import Path
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+
+MANIFEST_FILE = "manifest.json"
+
+# Status changes appended since the manifest was last compacted
+JOURNAL_FILE = "status.jsonl"
+
+STATUSES = ("pending", "in_progress", "completed")
+
+# Journal lines before status changes are folded back into manifest.json;
+# at least one per task, so compaction stays amortized O(1) per update
+MIN_COMPACT_RECORDS = 64
+
+
+def resolve_manifest(path):
+    """
+    Find a manifest from a manifest path, tasks directory or feature directory.
+
+    Args:
+        path (str): manifest.json, its tasks/ directory or .specimin/plans/{branch}
+
+    Returns:
+        Path: Path to manifest.json
+
+    Raises:
+        FileNotFoundError: If no manifest is found
+    """
+    path = Path(path)
+    for candidate in (path, path / MANIFEST_FILE, path / "tasks" / MANIFEST_FILE):
+        if candidate.is_file():
+            return candidate
+    raise FileNotFoundError(f"Task manifest not found: {path}")
+
+
+def implicit_dependencies(tasks):
+    """
+    Derive dependency edges for tasks that do not declare `depends_on`.
+
+    Phases run in order: the first tasks of a phase wait for the tasks of the
+    previous phase that nothing else in it depends on. Within a phase, tasks
+    run in listed order, except that tasks marked `"parallel": true` (the
+    [P] marker) only wait for the last unmarked task before them, and the
+    next unmarked task waits for all of them.
+
+    Args:
+        tasks (list): Manifest entries in manifest order
+
+    Returns:
+        dict: Task id -> list of task ids it depends on
+    """
+    dependencies = {}
+    previous_phase = []
+    by_phase = {}
+    for task in tasks:
+        by_phase.setdefault(task.get("phase"), []).append(task)
+
+    for phase in sorted(by_phase, key=lambda p: (p is None, p)):
+        anchor = list(previous_phase)
+        since_anchor = []
+        for task in by_phase[phase]:
+            if "depends_on" in task:
+                dependencies[task["id"]] = list(task["depends_on"])
+            elif task.get("parallel"):
+                dependencies[task["id"]] = list(anchor)
+            else:
+                dependencies[task["id"]] = anchor + since_anchor
+            if task.get("parallel") and "depends_on" not in task:
+                since_anchor.append(task["id"])
+            else:
+                anchor = [task["id"]]
+                since_anchor = []
+
+        # Tasks of this phase nothing else in it waits for
+        depended_on = {d for t in by_phase[phase] for d in dependencies[t["id"]]}
+        previous_phase = [t["id"] for t in by_phase[phase] if t["id"] not in depended_on]
+
+    return dependencies
+
+
+class TaskGraph:
+    """
+    Indexed DAG over one task manifest.
+
+    Tasks are indexed by id with their dependencies, dependents and the
+    number of unfinished dependencies, so readiness checks and status
+    updates touch only the task and its direct dependents. Status changes
+    are appended to JOURNAL_FILE (one fsynced line each) and replayed on
+    load; compact() folds them back into manifest.json.
+    """
+
+    def __init__(self, manifest_path):
+        """
+        Args:
+            manifest_path (str): Path to tasks/manifest.json
+
+        Raises:
+            ValueError: If the manifest is malformed, references unknown
+                tasks or has a dependency cycle
+        """
+        self.path = Path(manifest_path)
+        self.journal_path = self.path.with_name(JOURNAL_FILE)
+        self.journal_records = 0
+        with self._locked():
+            self._load()
+
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive lock on the manifest and journal for the block."""
+        # Lock the directory: compact() replaces manifest.json and removes the journal
+        fd = os.open(self.path.parent, os.O_RDONLY)
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _load(self):
+        with open(self.path, 'r') as f:
+            tasks = json.load(f)
+        if not isinstance(tasks, list) or not all(isinstance(t, dict) and "id" in t for t in tasks):
+            raise ValueError(f"Malformed task manifest: {self.path}")
+
+        self.tasks = {}
+        for task in tasks:
+            if task["id"] in self.tasks:
+                raise ValueError(f"Duplicate task id {task['id']} in {self.path}")
+            self.tasks[task["id"]] = task
+
+        self.dependencies = implicit_dependencies(tasks)
+        self.dependents = {task_id: [] for task_id in self.tasks}
+        for task_id, deps in self.dependencies.items():
+            for dep in deps:
+                if dep not in self.tasks:
+                    raise ValueError(f"Task {task_id} depends on unknown task {dep}")
+                self.dependents[dep].append(task_id)
+
+        self.order = self._topological_order()
+        self._replay_journal()
+        self._count_unfinished()
+
+    def _count_unfinished(self):
+        self.unfinished = {
+            task_id: sum(1 for d in deps if self.status(d) != "completed")
+            for task_id, deps in self.dependencies.items()
+        }
+
+    def _topological_order(self):
+        """Kahn's algorithm, keeping manifest order among ready tasks."""
+        position = {task_id: i for i, task_id in enumerate(self.tasks)}
+        indegree = {task_id: len(deps) for task_id, deps in self.dependencies.items()}
+        ready = [position[task_id] for task_id in self.tasks if indegree[task_id] == 0]
+        ids = list(self.tasks)
+        order = []
+        while ready:
+            task_id = ids[heapq.heappop(ready)]
+            order.append(task_id)
+            for dependent in self.dependents[task_id]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    heapq.heappush(ready, position[dependent])
+
+        if len(order) < len(self.tasks):
+            cycle = sorted(task_id for task_id, n in indegree.items() if n > 0)
+            raise ValueError(f"Dependency cycle among tasks: {', '.join(cycle)}")
+        return order
+
+    def _replay_journal(self):
+        """Apply journaled status changes and drop a partial trailing record."""
+        if not self.journal_path.exists():
+            return
+
+        data = self.journal_path.read_bytes()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(end)
+
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self.journal_records += 1
+            if record.get("id") in self.tasks:
+                self.tasks[record["id"]]["status"] = record["status"]
+
+    def set_status(self, task_id, status):
+        """
+        Durably change a task's status.
+
+        The change is one appended journal line; manifest.json is compacted
+        once the journal holds as many records as there are tasks (and at
+        least MIN_COMPACT_RECORDS).
+
+        Args:
+            task_id (str): Task identifier
+            status (str): One of STATUSES
+
+        Raises:
+            KeyError: If the manifest has no such task
+            ValueError: If the status is not one of STATUSES
+        """
+        if task_id not in self.tasks:
+            raise KeyError(task_id)
+        if status not in STATUSES:
+            raise ValueError(f"Invalid status '{status}' (expected one of: {', '.join(STATUSES)})")
+
+        previous = self.tasks[task_id].get("status")
+        record = {"id": task_id, "status": status, "time": datetime.now().isoformat()}
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._locked():
+            fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self.journal_records += 1
+
+        self.tasks[task_id]["status"] = status
+        if (previous == "completed") != (status == "completed"):
+            delta = -1 if status == "completed" else 1
+            for dependent in self.dependents[task_id]:
+                self.unfinished[dependent] += delta
+
+        if self.journal_records >= max(MIN_COMPACT_RECORDS, len(self.tasks)):
+            self.compact()
+
+    def compact(self):
+        """Fold journaled status changes into manifest.json and clear the journal."""
+        with self._locked():
+            # Pick up changes appended by other processes since we loaded
+            self.journal_records = 0
+            self._replay_journal()
+            self._count_unfinished()
+            temp_file = self.path.with_name(f"{self.path.name}.tmp")
+            with open(temp_file, 'w') as f:
+                json.dump(list(self.tasks.values()), f, indent=2, ensure_ascii=False)
+                f.write("\n")
+            os.replace(temp_file, self.path)
+            try:
+                os.remove(self.journal_path)
+            except FileNotFoundError:
+                pass
+            self.journal_records = 0
+
+    def status(self, task_id):
+        """
+        Returns:
+            str: Current status of a task (journal included)
+        """
+        return self.tasks[task_id].get("status", "pending")
+
+    def ready(self):
+        """
+        Tasks that can start now.
+
+        Returns:
+            list: Ids of pending tasks whose dependencies are all completed,
+                in topological order
+        """
+        return [
+            task_id for task_id in self.order
+            if self.status(task_id) == "pending" and self.unfinished[task_id] == 0
+        ]
+
+    def waves(self):
+        """
+        Group unfinished tasks into waves that can run in parallel.
+
+        Wave 1 holds the tasks whose dependencies are all completed; every
+        later wave holds the tasks whose dependencies finish in earlier ones.
+
+        Returns:
+            list: Lists of task ids, one per wave
+        """
+        level = {}
+        for task_id in self.order:
+            if self.status(task_id) == "completed":
+                continue
+            level[task_id] = 1 + max((level.get(d, 0) for d in self.dependencies[task_id]), default=0)
+
+        waves = [[] for _ in range(max(level.values(), default=0))]
+        for task_id in self.order:
+            if task_id in level:
+                waves[level[task_id] - 1].append(task_id)
+        return waves
+
+    def critical_path(self):
+        """
+        Longest chain of unfinished tasks, which bounds how fast the rest can finish.
+
+        Every task counts as one unit of work.
+
+        Returns:
+            list: Task ids along the path, first to last
+        """
+        length = {}
+        via = {}
+        for task_id in self.order:
+            if self.status(task_id) == "completed":
+                continue
+            best = max(
+                (d for d in self.dependencies[task_id] if d in length),
+                key=length.get, default=None
+            )
+            length[task_id] = 1 + (length[best] if best else 0)
+            via[task_id] = best
+
+        if not length:
+            return []
+        task_id = max(length, key=length.get)
+        path = []
+        while task_id is not None:
+            path.append(task_id)
+            task_id = via[task_id]
+        return path[::-1]
+
+    def summary(self):
+        """
+        Returns:
+            dict: Task counts per status, ready tasks, waves and critical path
+        """
+        counts = {status: 0 for status in STATUSES}
+        for task_id in self.tasks:
+            counts[self.status(task_id)] = counts.get(self.status(task_id), 0) + 1
+        waves = self.waves()
+        return {
+            "manifest": str(self.path),
+            "tasks": len(self.tasks),
+            "status": counts,
+            "ready": self.ready(),
+            "waves": len(waves),
+            "critical_path": self.critical_path()
+        }
+
+
+def main():
+    """Main entry point when run as script."""
+    usage = ("Usage: task_graph.py <summary|ready|waves|critical-path|graph|compact> <manifest>\n"
+             "       task_graph.py set <manifest> <task_id> <status>")
+    commands = ("summary", "ready", "waves", "critical-path", "graph", "compact", "set")
+    if len(sys.argv) < 3 or sys.argv[1] not in commands or (sys.argv[1] == "set") != (len(sys.argv) == 5):
+        print(usage, file=sys.stderr)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    try:
+        graph = TaskGraph(resolve_manifest(sys.argv[2]))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if command == "set":
+        task_id, status = sys.argv[3], sys.argv[4]
+        try:
+            graph.set_status(task_id, status)
+        except KeyError:
+            print(f"Error: No task {task_id} in {graph.path}", file=sys.stderr)
+            sys.exit(1)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps({"id": task_id, "status": status, "ready": graph.ready()}))
+    elif command == "compact":
+        graph.compact()
+        print(json.dumps(graph.summary(), indent=2))
+    elif command == "summary":
+        print(json.dumps(graph.summary(), indent=2))
+    elif command == "ready":
+        print(json.dumps([graph.tasks[t] for t in graph.ready()], indent=2, ensure_ascii=False))
+    elif command == "waves":
+        print(json.dumps(graph.waves(), indent=2))
+    elif command == "critical-path":
+        print(json.dumps(graph.critical_path(), indent=2))
+    else:
+        print(json.dumps([
+            dict(graph.tasks[t], depends_on=graph.dependencies[t]) for t in graph.order
+        ], indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,63 +17,23 @@ if [ -z "$BRANCH_NAME" ]; then
   exit 1
 fi
 
-# Verify we're in a git repository
-if ! git rev-parse --git-dir > /dev/null 2>&1; then
-  echo "Error: Not in a git repository"
-  exit 1
-fi
-
-# Verify branch exists
-if ! git rev-parse --verify "$BRANCH_NAME" > /dev/null 2>&1; then
-  echo "Error: Branch '$BRANCH_NAME' does not exist"
-  exit 1
-fi
-
-# Verify we're on the correct branch
-CURRENT_BRANCH=$(git branch --show-current)
-if [ "$CURRENT_BRANCH" != "$BRANCH_NAME" ]; then
-  echo "Error: Not on branch '$BRANCH_NAME' (currently on '$CURRENT_BRANCH')"
-  exit 1
-fi
-
 FEATURE_DIR=".specimin/ui/$BRANCH_NAME"
-
-# Verify feature directory exists
-if [ ! -d "$FEATURE_DIR" ]; then
-  echo "Error: Feature directory not found: $FEATURE_DIR"
-  echo "Run specimin:ui-understand first"
-  exit 1
-fi
-
-# Verify generation-report.md exists
-GENERATION_REPORT="$FEATURE_DIR/generation-report.md"
-if [ ! -f "$GENERATION_REPORT" ]; then
-  echo "Error: generation-report.md not found at $GENERATION_REPORT"
-  echo "Run specimin:ui-generate first"
-  exit 1
-fi
+REPORT_DEST="$FEATURE_DIR/accessibility-report.md"
+REPORT_TEMP="/tmp/ui-accessibility-report.md"
 
 # Check if accessibility report exists in /tmp
-REPORT_TEMP="/tmp/ui-accessibility-report.md"
 if [ ! -f "$REPORT_TEMP" ]; then
   echo "Error: Accessibility report not found at $REPORT_TEMP"
-  echo "The skill should write the accessibility report to /tmp/ui-accessibility-report.md"
+  echo "The skill should write the accessibility report to $REPORT_TEMP"
   exit 1
 fi
 
-# Copy accessibility report to feature directory
-REPORT_DEST="$FEATURE_DIR/accessibility-report.md"
-cp "$REPORT_TEMP" "$REPORT_DEST"
-
-# Add all changes (accessibility enhancements + report)
-git add -A
-
-# Check if there are changes to commit
-if git diff --cached --quiet; then
-  echo "Warning: No changes to commit (accessibility enhancements may already be staged)"
-else
-  # Commit with descriptive message
-  git commit -m "Apply accessibility enhancements
+# Verify the branch is checked out and generation-report.md exists, copy the
+# report and commit it together with all other changes
+WORKSPACE="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../../scripts" && pwd)/feature_workspace.py"
+python3 "$WORKSPACE" save "$BRANCH_NAME" --root .specimin/ui --on-branch --require generation-report.md \
+  --artifact "accessibility-report.md=$REPORT_TEMP" --add-all --hint "Run specimin:ui-generate first" \
+  --message "Apply accessibility enhancements
 
 - Fixed semantic HTML violations
 - Added ARIA attributes where needed
@@ -81,8 +41,7 @@ else
 - Enhanced focus management
 - See accessibility-report.md for full details
 
-⚠️  MANUAL TESTING REQUIRED before production deployment"
-fi
+⚠️  MANUAL TESTING REQUIRED before production deployment" > /dev/null
 
 # Output success message with JSON
 echo "{\"feature_dir\": \"$FEATURE_DIR\", \"branch_name\": \"$BRANCH_NAME\", \"report_path\": \"$REPORT_DEST\"}"
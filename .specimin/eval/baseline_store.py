@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Append-only baseline store for Specimin evaluation framework.
+Keeps baseline entries in a JSON-lines log with a fixed-width offset index,
+giving atomic appends, O(1) access to the latest entry and range queries
+by timestamp or plugin version without rewriting history.
+"""
+
+import os
+import re
+import sys
+import json
+import struct
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+EVAL_DIR = Path(__file__).parent
+
+LOG_FILE = "baselines.jsonl"
+INDEX_FILE = "baselines.idx"
+LOCK_FILE = "baselines.lock"
+LEGACY_FILE = "baselines.json"
+
+# Index record: log offset, line length, timestamp (epoch seconds), plugin version
+VERSION_BYTES = 24
+INDEX_RECORD = struct.Struct(f"<QId{VERSION_BYTES}s")
+
+
+def _paths(store_dir):
+    store_dir = Path(store_dir or EVAL_DIR)
+    return store_dir / LOG_FILE, store_dir / INDEX_FILE, store_dir / LOCK_FILE
+
+
+@contextmanager
+def _locked(store_dir):
+    """Hold an exclusive lock on the store for the duration of the block."""
+    _, _, lock_path = _paths(store_dir)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _parse_timestamp(value):
+    """Convert an ISO8601 string (or datetime) to epoch seconds."""
+    if value is None:
+        return 0.0
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def entry_plugin_version(entry):
+    """
+    Determine the plugin version a baseline entry was produced with.
+
+    Args:
+        entry (dict): Baseline entry
+
+    Returns:
+        str: Version string, or '' if unknown
+    """
+    if entry.get("plugin_version"):
+        return entry["plugin_version"]
+
+    # Run directories are named runs/v{version}
+    match = re.search(r"v(\d+\.\d+\.\d+[^/\\]*)$", str(entry.get("run_directory", "")))
+    return match.group(1) if match else ""
+
+
+def _index_record(offset, length, entry):
+    version = entry_plugin_version(entry).encode("utf-8")[:VERSION_BYTES]
+    return INDEX_RECORD.pack(offset, length, _parse_timestamp(entry.get("timestamp")), version)
+
+
+def _unpack(record):
+    offset, length, timestamp, version = INDEX_RECORD.unpack(record)
+    return offset, length, timestamp, version.rstrip(b"\0").decode("utf-8")
+
+
+def _sync_index(store_dir):
+    """
+    Bring the index up to date with the log.
+
+    Covers a crash between the log append and the index append, an index
+    that was deleted or truncated mid-record, and an index left over from a
+    log that was removed or replaced by a shorter one (it is rebuilt).
+    Lines that are not valid JSON are not indexed. Must be called under the lock.
+    """
+    log_path, index_path, _ = _paths(store_dir)
+    if not log_path.exists():
+        if index_path.exists():
+            index_path.unlink()
+        return
+
+    index_size = index_path.stat().st_size if index_path.exists() else 0
+    if index_size % INDEX_RECORD.size:
+        index_size -= index_size % INDEX_RECORD.size
+        with open(index_path, 'r+b') as f:
+            f.truncate(index_size)
+
+    log_end = _index_end(index_path) if index_size else 0
+    log_size = log_path.stat().st_size
+
+    if log_size < log_end:
+        with open(index_path, 'r+b') as f:
+            f.truncate(0)
+        log_end = 0
+
+    if log_size <= log_end:
+        return
+
+    with open(log_path, 'rb') as log, open(index_path, 'ab') as index:
+        log.seek(log_end)
+        offset = log_end
+        for line in log:
+            if not line.endswith(b"\n"):
+                break  # Partial trailing write; ignored until completed
+            try:
+                entry = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                entry = None
+            if isinstance(entry, dict):
+                index.write(_index_record(offset, len(line), entry))
+            offset += len(line)
+        index.flush()
+        os.fsync(index.fileno())
+
+
+def migrate_legacy_baselines(store_dir=None):
+    """
+    Move entries from a legacy baselines.json list into the log.
+
+    The legacy file is renamed to baselines.json.migrated afterwards, so the
+    migration runs at most once.
+
+    Args:
+        store_dir (str): Directory holding the store (defaults to the eval directory)
+
+    Returns:
+        int: Number of entries migrated
+    """
+    store_dir = Path(store_dir or EVAL_DIR)
+    legacy_path = store_dir / LEGACY_FILE
+    if not legacy_path.exists():
+        return 0
+
+    with _locked(store_dir):
+        if not legacy_path.exists():
+            return 0
+
+        try:
+            with open(legacy_path, 'r') as f:
+                legacy = json.load(f)
+        except json.JSONDecodeError:
+            print("Warning: Corrupted baselines.json, skipping migration", file=sys.stderr)
+            legacy = []
+
+        for entry in legacy:
+            _append_unlocked(store_dir, entry)
+
+        legacy_path.rename(legacy_path.with_name(LEGACY_FILE + ".migrated"))
+        return len(legacy)
+
+
+def _append_unlocked(store_dir, entry):
+    log_path, index_path, _ = _paths(store_dir)
+    _sync_index(store_dir)
+
+    # Drop a partial line left behind by a crashed append
+    if log_path.exists():
+        log_end = _index_end(index_path) if index_path.exists() else 0
+        if log_path.stat().st_size > log_end:
+            with open(log_path, 'r+b') as log:
+                log.truncate(log_end)
+
+    line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+
+    with open(log_path, 'ab') as log:
+        offset = log.tell()
+        log.write(line)
+        log.flush()
+        os.fsync(log.fileno())
+
+    with open(index_path, 'ab') as index:
+        position = index.tell() // INDEX_RECORD.size
+        index.write(_index_record(offset, len(line), entry))
+        index.flush()
+        os.fsync(index.fileno())
+
+    return position
+
+
+def append_entry(entry, store_dir=None):
+    """
+    Atomically append a baseline entry.
+
+    Args:
+        entry (dict): Baseline entry
+        store_dir (str): Directory holding the store (defaults to the eval directory)
+
+    Returns:
+        int: Position of the new entry
+    """
+    migrate_legacy_baselines(store_dir)
+    with _locked(store_dir):
+        return _append_unlocked(store_dir, entry)
+
+
+def _index_end(index_path):
+    """Return the log offset just past the last indexed entry."""
+    size = index_path.stat().st_size
+    size -= size % INDEX_RECORD.size
+    if size == 0:
+        return 0
+    with open(index_path, 'rb') as f:
+        f.seek(size - INDEX_RECORD.size)
+        offset, length, _, _ = _unpack(f.read(INDEX_RECORD.size))
+    return offset + length
+
+
+def _ensure_index(store_dir):
+    """
+    Migrate legacy data and repair the index if it lags behind the log.
+
+    Returns:
+        bool: Whether the store has a log to read from
+    """
+    migrate_legacy_baselines(store_dir)
+    log_path, index_path, _ = _paths(store_dir)
+    if not log_path.exists():
+        return False
+
+    # Cheap staleness check before taking the lock
+    if (not index_path.exists()
+            or index_path.stat().st_size % INDEX_RECORD.size
+            or _index_end(index_path) != log_path.stat().st_size):
+        with _locked(store_dir):
+            _sync_index(store_dir)
+    return True
+
+
+def _read_records(store_dir):
+    """Read all index records as (offset, length, timestamp, version) tuples."""
+    if not _ensure_index(store_dir):
+        return []
+
+    _, index_path, _ = _paths(store_dir)
+    with open(index_path, 'rb') as f:
+        data = f.read()
+    usable = len(data) - len(data) % INDEX_RECORD.size
+    return [_unpack(data[i:i + INDEX_RECORD.size]) for i in range(0, usable, INDEX_RECORD.size)]
+
+
+def _read_entry(log, offset, length):
+    log.seek(offset)
+    return json.loads(log.read(length))
+
+
+def count_entries(store_dir=None):
+    """
+    Count baseline entries.
+
+    Args:
+        store_dir (str): Directory holding the store (defaults to the eval directory)
+
+    Returns:
+        int: Number of entries
+    """
+    return len(_read_records(store_dir))
+
+
+def get_entry(position, store_dir=None):
+    """
+    Read a single entry by position (negative positions count from the end).
+
+    Args:
+        position (int): Entry position
+        store_dir (str): Directory holding the store (defaults to the eval directory)
+
+    Returns:
+        dict: Baseline entry, or None if out of range
+    """
+    if not _ensure_index(store_dir):
+        return None
+
+    log_path, index_path, _ = _paths(store_dir)
+    count = index_path.stat().st_size // INDEX_RECORD.size
+    if position < 0:
+        position += count
+    if position < 0 or position >= count:
+        return None
+
+    with open(index_path, 'rb') as f:
+        f.seek(position * INDEX_RECORD.size)
+        offset, length, _, _ = _unpack(f.read(INDEX_RECORD.size))
+
+    with open(log_path, 'rb') as log:
+        return _read_entry(log, offset, length)
+
+
+def latest_entry(store_dir=None):
+    """
+    Read the most recent baseline entry in O(1).
+
+    Args:
+        store_dir (str): Directory holding the store (defaults to the eval directory)
+
+    Returns:
+        dict: Most recent baseline entry, or None if the store is empty
+    """
+    return get_entry(-1, store_dir)
+
+
+def recent_entries(count, store_dir=None):
+    """
+    Read the last `count` entries without touching older history.
+
+    Args:
+        count (int): Maximum number of entries
+        store_dir (str): Directory holding the store (defaults to the eval directory)
+
+    Returns:
+        list: Up to `count` baseline entries, oldest first
+    """
+    if count <= 0 or not _ensure_index(store_dir):
+        return []
+
+    log_path, index_path, _ = _paths(store_dir)
+    total = index_path.stat().st_size // INDEX_RECORD.size
+    first = max(0, total - count)
+
+    with open(index_path, 'rb') as f:
+        f.seek(first * INDEX_RECORD.size)
+        data = f.read((total - first) * INDEX_RECORD.size)
+
+    records = [_unpack(data[i:i + INDEX_RECORD.size]) for i in range(0, len(data), INDEX_RECORD.size)]
+    with open(log_path, 'rb') as log:
+        return [_read_entry(log, offset, length) for offset, length, _, _ in records]
+
+
+def iter_entries(store_dir=None):
+    """
+    Yield every baseline entry in append order.
+
+    Args:
+        store_dir (str): Directory holding the store (defaults to the eval directory)
+
+    Yields:
+        dict: Baseline entry
+    """
+    records = _read_records(store_dir)
+    if not records:
+        return
+
+    log_path, _, _ = _paths(store_dir)
+    with open(log_path, 'rb') as log:
+        for offset, length, _, _ in records:
+            yield _read_entry(log, offset, length)
+
+
+def query_entries(start=None, end=None, plugin_version=None, store_dir=None):
+    """
+    Return entries within a timestamp range and/or for a plugin version.
+
+    Filtering uses only the index; the log is read for matching entries.
+
+    Args:
+        start (str): Inclusive ISO8601 lower bound on timestamp
+        end (str): Inclusive ISO8601 upper bound on timestamp
+        plugin_version (str): Only entries produced with this plugin version
+        store_dir (str): Directory holding the store (defaults to the eval directory)
+
+    Returns:
+        list: Matching baseline entries in append order
+    """
+    start_ts = _parse_timestamp(start) if start else None
+    end_ts = _parse_timestamp(end) if end else None
+
+    matches = [
+        (offset, length)
+        for offset, length, timestamp, version in _read_records(store_dir)
+        if (start_ts is None or timestamp >= start_ts)
+        and (end_ts is None or timestamp <= end_ts)
+        and (plugin_version is None or version == plugin_version)
+    ]
+    if not matches:
+        return []
+
+    log_path, _, _ = _paths(store_dir)
+    with open(log_path, 'rb') as log:
+        return [_read_entry(log, offset, length) for offset, length in matches]
+
+
+def main():
+    """Main entry point when run as script."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the baseline store.")
+    parser.add_argument("--latest", action="store_true", help="Print only the most recent entry")
+    parser.add_argument("--since", help="ISO8601 lower bound on timestamp")
+    parser.add_argument("--until", help="ISO8601 upper bound on timestamp")
+    parser.add_argument("--version", dest="plugin_version", help="Plugin version to filter by")
+    args = parser.parse_args()
+
+    if args.latest:
+        print(json.dumps(latest_entry(), indent=2))
+    else:
+        entries = query_entries(args.since, args.until, args.plugin_version)
+        print(json.dumps(entries, indent=2))
+
+
+if __name__ == "__main__":
+    main()
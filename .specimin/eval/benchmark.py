@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarking for Specimin evaluation framework.
+Times benchmark callables declared in test_cases.json against generated
+code, records peak memory and estimates how run time scales with input size.
+"""
+
+import sys
+import json
+import math
+import time
+import subprocess
+import statistics
+from pathlib import Path
+
+import manifest
+
+
+DEFAULT_WARMUP = 1
+DEFAULT_REPEATS = 5
+DEFAULT_TIMEOUT = 60
+
+
+def load_benchmark_spec(test_id, manifest_path=None):
+    """
+    Look up the benchmark declared for a test case.
+
+    Args:
+        test_id (str): Test case identifier
+        manifest_path (str): Path to test_cases.json (defaults to the eval directory)
+
+    Returns:
+        dict: Benchmark spec, or None if the test case declares none
+    """
+    test_case = manifest.load(manifest_path).get(test_id)
+    return test_case.get("benchmark") if test_case else None
+
+
+def scaling_exponent(measurements):
+    """
+    Estimate k in time ~ n^k by least squares on log(time) vs log(size).
+
+    Args:
+        measurements (list): Dicts with 'size' and 'median_seconds'
+
+    Returns:
+        float: Estimated exponent, or None with fewer than 2 usable points
+    """
+    points = [
+        (math.log(m["size"]), math.log(m["median_seconds"]))
+        for m in measurements
+        if m["size"] > 0 and m["median_seconds"] > 0
+    ]
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return sxy / sxx if sxx else None
+
+
+def measure(test_dir, spec):
+    """
+    Time the benchmark callable in the current interpreter.
+
+    The generated code.py is imported as `implementation`, the spec's code
+    is executed to define the callable, and each size is run `warmup` times
+    untimed, `repeats` times timed, and once under tracemalloc.
+
+    Args:
+        test_dir (str): Directory containing code.py
+        spec (dict): Benchmark spec
+
+    Returns:
+        list: Per size {size, min_seconds, median_seconds, mean_seconds, peak_memory_bytes}
+    """
+    import importlib.util
+    import tracemalloc
+
+    module_spec = importlib.util.spec_from_file_location(
+        "implementation", str(Path(test_dir) / "code.py")
+    )
+    implementation = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(implementation)
+
+    namespace = {}
+    exec(spec["code"], namespace)
+    bench = namespace[spec.get("function", "bench")]
+
+    warmup = spec.get("warmup", DEFAULT_WARMUP)
+    repeats = spec.get("repeats", DEFAULT_REPEATS)
+    max_seconds = spec.get("max_seconds")
+
+    measurements = []
+    for size in spec["sizes"]:
+        for _ in range(warmup):
+            bench(implementation, size)
+
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            bench(implementation, size)
+            times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            bench(implementation, size)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        measurements.append({
+            "size": size,
+            "min_seconds": min(times),
+            "median_seconds": statistics.median(times),
+            "mean_seconds": statistics.mean(times),
+            "peak_memory_bytes": peak
+        })
+
+        # Larger sizes would only be slower
+        if max_seconds is not None and min(times) > max_seconds:
+            break
+
+    return measurements
+
+
+def run_benchmark(test_dir, spec):
+    """
+    Run a benchmark in a separate interpreter and evaluate its scaling.
+
+    Args:
+        test_dir (str): Directory containing code.py
+        spec (dict): Benchmark spec with keys:
+            - code (str): Python source defining the benchmark callable
+            - function (str): Callable name, called as f(implementation, size) (default 'bench')
+            - sizes (list): Input sizes, smallest first
+            - warmup (int): Untimed calls per size (default 1)
+            - repeats (int): Timed calls per size (default 5)
+            - max_seconds (float): Per-call budget; exceeding it stops larger sizes
+            - max_exponent (float): Highest acceptable scaling exponent
+            - timeout (int): Wall-clock limit for the whole benchmark (default 60)
+
+    Returns:
+        dict: Benchmark result with keys:
+            - status (str): 'ok', 'slow', 'timeout' or 'error'
+            - measurements (list): Per-size timings and peak memory
+            - scaling_exponent (float): Estimated k in time ~ n^k
+            - message (str): Explanation when status is not 'ok'
+    """
+    timeout = spec.get("timeout", DEFAULT_TIMEOUT)
+    # The worker runs inside test_dir, so a relative path would be doubled
+    test_dir = Path(test_dir).resolve()
+
+    try:
+        proc = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--worker", str(test_dir)],
+            input=json.dumps(spec),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=str(test_dir)
+        )
+    except subprocess.TimeoutExpired:
+        return {
+            "status": "timeout",
+            "measurements": [],
+            "scaling_exponent": None,
+            "message": f"Benchmark timed out after {timeout} seconds"
+        }
+
+    if proc.returncode != 0:
+        return {
+            "status": "error",
+            "measurements": [],
+            "scaling_exponent": None,
+            "message": proc.stderr.strip() or f"Benchmark exited with code {proc.returncode}"
+        }
+
+    measurements = json.loads(proc.stdout)
+    exponent = scaling_exponent(measurements)
+    result = {
+        "status": "ok",
+        "measurements": measurements,
+        "scaling_exponent": round(exponent, 3) if exponent is not None else None,
+        "message": None
+    }
+
+    max_exponent = spec.get("max_exponent")
+    max_seconds = spec.get("max_seconds")
+    if max_seconds is not None and measurements and measurements[-1]["min_seconds"] > max_seconds:
+        result["status"] = "slow"
+        result["message"] = (
+            f"Size {measurements[-1]['size']} took {measurements[-1]['min_seconds']:.3f}s "
+            f"(budget {max_seconds}s)"
+        )
+    elif max_exponent is not None and exponent is not None and exponent > max_exponent:
+        result["status"] = "slow"
+        result["message"] = f"Run time scales as n^{exponent:.2f} (expected at most n^{max_exponent})"
+
+    return result
+
+
+def main():
+    """Main entry point when run as script."""
+    if len(sys.argv) == 3 and sys.argv[1] == "--worker":
+        # Child process: read the spec from stdin, print measurements
+        from contextlib import redirect_stdout
+        spec = json.load(sys.stdin)
+        # Keep anything the generated code prints out of the JSON output
+        with redirect_stdout(sys.stderr):
+            measurements = measure(sys.argv[2], spec)
+        print(json.dumps(measurements))
+        return
+
+    if len(sys.argv) != 2:
+        print("Usage: benchmark.py <test_directory>", file=sys.stderr)
+        sys.exit(1)
+
+    test_dir = Path(sys.argv[1])
+    spec = load_benchmark_spec(test_dir.name)
+    if spec is None:
+        print(f"Error: No benchmark declared for test case: {test_dir.name}", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps(run_benchmark(test_dir, spec), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Checkpoint journal for Specimin evaluation framework.
+Records stage completion per test case in an append-only log inside the
+run directory, so an interrupted run can resume without redoing finished
+stages.
+"""
+
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+
+
+JOURNAL_FILE = ".checkpoint.jsonl"
+
+
+def file_digest(path):
+    """
+    Hash a file's contents.
+
+    Args:
+        path (str): File path
+
+    Returns:
+        str: sha256 hex digest, or None if the file does not exist
+    """
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of completed pipeline stages for one run directory.
+
+    Every line is a JSON record written with a single append and fsync, so
+    a crash loses at most the line being written; a partial last line is
+    discarded when the journal is next opened. Each run of the pipeline is
+    a session that starts with a {"event": "start"} record.
+    """
+
+    def __init__(self, run_dir):
+        """
+        Args:
+            run_dir (str): Run directory holding the journal
+        """
+        self.run_dir = Path(run_dir)
+        self.path = self.run_dir / JOURNAL_FILE
+        self.session = 0
+        self.stages = {}
+
+    def _read(self):
+        """Load completed stages and truncate a partial trailing record."""
+        if not self.path.exists():
+            return
+
+        data = self.path.read_bytes()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(end)
+
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("event") == "start":
+                self.session = max(self.session, record.get("session", 0))
+            elif record.get("status") == "ok":
+                self.stages[(record["test_id"], record["stage"])] = record
+
+    def _append(self, record):
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def open_session(self, resume=False):
+        """
+        Start a new session of the run.
+
+        Args:
+            resume (bool): Keep stages completed by earlier sessions; otherwise
+                they are forgotten and every stage runs again
+
+        Returns:
+            int: Session number (1 for the first run of the directory)
+        """
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self._read()
+        if not resume:
+            self.stages = {}
+
+        self.session += 1
+        self._append({
+            "event": "start",
+            "session": self.session,
+            "mode": "resume" if resume else "fresh",
+            "time": datetime.now().isoformat()
+        })
+        return self.session
+
+    def completed(self, test_id, stage, files=()):
+        """
+        Return the record of a completed stage if it is still valid.
+
+        Args:
+            test_id (str): Test case identifier
+            stage (str): Stage name
+            files (list): Files (relative to the test case directory) whose
+                contents must match what the stage saw when it completed
+
+        Returns:
+            dict: The stage's journal record (with 'output'), or None if the
+                stage has not completed or one of its files changed since
+        """
+        record = self.stages.get((test_id, stage))
+        if record is None:
+            return None
+
+        test_dir = self.run_dir / test_id
+        recorded = record.get("files", {})
+        for name in files:
+            if recorded.get(name) != file_digest(test_dir / name):
+                return None
+        return record
+
+    def record(self, test_id, stage, output=None, files=()):
+        """
+        Durably record that a stage completed.
+
+        Args:
+            test_id (str): Test case identifier
+            stage (str): Stage name
+            output: JSON-serializable stage output to restore on resume
+            files (list): Files (relative to the test case directory) to
+                fingerprint for completed()
+        """
+        test_dir = self.run_dir / test_id
+        record = {
+            "session": self.session,
+            "test_id": test_id,
+            "stage": stage,
+            "status": "ok",
+            "output": output,
+            "files": {name: file_digest(test_dir / name) for name in files},
+            "time": datetime.now().isoformat()
+        }
+        self._append(record)
+        self.stages[(test_id, stage)] = record
+
+
+def main():
+    """Main entry point when run as script."""
+    if len(sys.argv) != 2:
+        print("Usage: checkpoint.py <run_directory>", file=sys.stderr)
+        sys.exit(1)
+
+    run_dir = Path(sys.argv[1])
+    if not (run_dir / JOURNAL_FILE).exists():
+        print(f"Error: No checkpoint journal in {run_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    journal = CheckpointJournal(run_dir)
+    journal._read()
+
+    completed = {}
+    for (test_id, stage), record in sorted(journal.stages.items()):
+        completed.setdefault(test_id, {})[stage] = record["session"]
+    print(json.dumps({"sessions": journal.session, "completed": completed}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
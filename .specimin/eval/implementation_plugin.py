@@ -0,0 +1,116 @@
+"""
+pytest plugin supplying generated code to test cases for Specimin evaluation framework.
+Makes a test case's code.py importable as `implementation`, provides an
+`implementation` fixture and binds the module as a global of the test
+module, so test.py runs as written without staging a modified copy.
+
+Used as `python3 -m pytest -p implementation_plugin --implementation code.py test.py`
+(with this directory on PYTHONPATH), or registered directly with
+ImplementationPlugin(code_path) for in-process runs.
+"""
+
+import sys
+import builtins
+import importlib
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+MODULE_NAME = "implementation"
+
+# Registered plugin name, used to avoid registering twice
+PLUGIN_NAME = "specimin-implementation"
+
+
+class ImplementationFinder:
+    """Meta path finder that resolves MODULE_NAME to one code.py file."""
+
+    def __init__(self, code_path):
+        """
+        Args:
+            code_path (str): Path to the generated code.py
+        """
+        self.code_path = str(Path(code_path).resolve())
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname != MODULE_NAME:
+            return None
+        return importlib.util.spec_from_file_location(MODULE_NAME, self.code_path)
+
+
+class ImplementationModule(pytest.Module):
+    """
+    Test module whose body already sees `implementation` as a global.
+
+    The name is provided through builtins only while the module is
+    imported, so module-level uses (e.g. `Parser = implementation.Parser`)
+    work, and is then bound as a real global of the module. A broken
+    code.py surfaces as a collection error of the test module.
+    """
+
+    def _getobj(self):
+        implementation = importlib.import_module(MODULE_NAME)
+        missing = object()
+        previous = getattr(builtins, MODULE_NAME, missing)
+        setattr(builtins, MODULE_NAME, implementation)
+        try:
+            module = super()._getobj()
+        finally:
+            if previous is missing:
+                delattr(builtins, MODULE_NAME)
+            else:
+                setattr(builtins, MODULE_NAME, previous)
+        if not hasattr(module, MODULE_NAME):
+            setattr(module, MODULE_NAME, implementation)
+        return module
+
+
+class ImplementationPlugin:
+    """
+    Installs the import hook for the duration of a pytest session.
+
+    A test module that imports `implementation` itself gets the hook's
+    module; otherwise the module is bound before the test module's body
+    runs (see ImplementationModule). Either way a broken code.py surfaces
+    as a collection error, recorded in the JUnit results; the fixture
+    reports it as a setup error.
+    """
+
+    def __init__(self, code_path):
+        """
+        Args:
+            code_path (str): Path to the generated code.py
+        """
+        self.finder = ImplementationFinder(code_path)
+
+    def pytest_sessionstart(self, session):
+        sys.modules.pop(MODULE_NAME, None)
+        sys.meta_path.insert(0, self.finder)
+
+    def pytest_sessionfinish(self, session):
+        if self.finder in sys.meta_path:
+            sys.meta_path.remove(self.finder)
+        sys.modules.pop(MODULE_NAME, None)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_pycollect_makemodule(self, module_path, parent):
+        if module_path.name == "__init__.py":
+            return None
+        return ImplementationModule.from_parent(parent, path=module_path)
+
+    @pytest.fixture(name=MODULE_NAME)
+    def implementation_fixture(self):
+        return importlib.import_module(MODULE_NAME)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--implementation", metavar="PATH",
+                     help="Generated code.py to expose as the `implementation` module")
+
+
+def pytest_configure(config):
+    code_path = config.getoption("implementation")
+    if code_path and not config.pluginmanager.has_plugin(PLUGIN_NAME):
+        config.pluginmanager.register(ImplementationPlugin(code_path), PLUGIN_NAME)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+In-process test execution engine for Specimin evaluation framework.
+Runs pytest inside warm worker interpreters instead of spawning a new
+interpreter per test case. test_runner.run_test() remains the fallback.
+"""
+
+import os
+import sys
+import io
+import signal
+import tempfile
+from pathlib import Path
+from contextlib import redirect_stdout, redirect_stderr
+
+import test_runner
+import pytest_results
+import implementation_plugin
+
+
+class _TestTimeout(KeyboardInterrupt):
+    """Raised inside a worker when a test case exceeds its time limit."""
+
+
+# Set by the SIGALRM handler so a timeout can be told apart from Ctrl-C
+_alarm_fired = False
+
+
+def init_worker():
+    """
+    Warm up a worker process by importing pytest and its plugins ahead of time.
+
+    Used as the ProcessPoolExecutor initializer so the import cost is paid
+    once per worker instead of once per test case.
+    """
+    import pytest  # noqa: F401
+    import _pytest.python  # noqa: F401
+    import _pytest.assertion.rewrite  # noqa: F401
+
+
+def _on_timeout(signum, frame):
+    global _alarm_fired
+    _alarm_fired = True
+    # KeyboardInterrupt makes pytest abort the session cleanly
+    raise _TestTimeout()
+
+
+def run_test_inprocess(test_dir, timeout=None):
+    """
+    Run pytest on code and test files in the current interpreter.
+
+    The generated modules are imported into a fresh module namespace for
+    each call: sys.path and any modules imported by the test run are
+    restored afterwards, so one worker can run many test cases in turn.
+    Nothing is written to the test directory (see test_runner.pytest_command).
+
+    Args:
+        test_dir (str): Directory containing code.py and test.py
+        timeout (int): Wall-clock limit in seconds (defaults to test_runner.TEST_TIMEOUT)
+
+    Returns:
+        dict: Test result with the same keys as test_runner.run_test()
+    """
+    global _alarm_fired
+    import pytest
+
+    _alarm_fired = False
+    timeout = timeout or test_runner.TEST_TIMEOUT
+    test_dir = Path(test_dir).resolve()
+    test_id = test_dir.name
+
+    error = test_runner.check_test_files(test_dir)
+    if error:
+        return error
+
+    fd, junit_file = tempfile.mkstemp(suffix=".xml", prefix=f"{test_id}-")
+    os.close(fd)
+    saved_path = list(sys.path)
+    saved_modules = dict(sys.modules)
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    timed_out = False
+
+    use_alarm = hasattr(signal, "SIGALRM")
+    previous_handler = None
+
+    saved_dont_write_bytecode = sys.dont_write_bytecode
+
+    try:
+        sys.dont_write_bytecode = True
+        if use_alarm:
+            previous_handler = signal.signal(signal.SIGALRM, _on_timeout)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                exit_code = pytest.main(
+                    [str(test_dir / "test.py"), "-v", "-p", "no:cacheprovider",
+                     "--import-mode=importlib", "--rootdir", str(test_dir)]
+                    + pytest_results.junit_args(junit_file),
+                    plugins=[implementation_plugin.ImplementationPlugin(test_dir / "code.py")]
+                )
+        except _TestTimeout:
+            timed_out = True
+            exit_code = None
+
+    except Exception as e:
+        return {
+            "test_id": test_id,
+            "passed": False,
+            "error_type": "execution_error",
+            "error_message": str(e),
+            "stdout": stdout.getvalue(),
+            "stderr": str(e)
+        }
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            if previous_handler is not None:
+                signal.signal(signal.SIGALRM, previous_handler)
+        sys.dont_write_bytecode = saved_dont_write_bytecode
+        sys.path[:] = saved_path
+        for name in list(sys.modules):
+            if name not in saved_modules:
+                del sys.modules[name]
+        sys.modules.update(saved_modules)
+        tests = pytest_results.read_junit(junit_file)
+        if os.path.exists(junit_file):
+            os.unlink(junit_file)
+
+    # pytest swallows the interrupt itself when the alarm fires inside a test
+    if timed_out or _alarm_fired:
+        return {
+            "test_id": test_id,
+            "passed": False,
+            "error_type": "timeout",
+            "error_message": f"Test execution timed out after {timeout} seconds",
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue()
+        }
+
+    return test_runner.build_pytest_result(
+        test_id, int(exit_code), stdout.getvalue(), stderr.getvalue(), tests
+    )
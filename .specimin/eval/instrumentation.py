@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Instrumentation for Specimin evaluation framework.
+Records named spans and counters (I/O bytes, subprocess spawns, cache hits)
+per test case and stage into a run directory, exports them as Chrome
+trace-event JSON and summarizes them for the reports.
+
+Every invocation that enables recording starts a session, which worker
+processes and child scripts join. The log keeps all sessions; the summary
+counts only the latest recording of each span, so re-running a stage for a
+test case replaces its earlier timings instead of adding to them.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import contextvars
+from pathlib import Path
+from contextlib import contextmanager
+
+
+# Event log in the run directory; every process appends to it
+TRACE_FILE = ".trace.jsonl"
+
+# Chrome trace written next to the reports (open in chrome://tracing or Perfetto)
+CHROME_TRACE_FILE = "trace.json"
+
+# Set by enable() so worker processes and child scripts record into the same run
+TRACE_ENV_VAR = "SPECIMIN_TRACE_DIR"
+
+# Set by enable() so worker processes and child scripts join the same session
+SESSION_ENV_VAR = "SPECIMIN_TRACE_SESSION"
+
+# Span arguments inherited by nested spans and counters
+INHERITED_ARGS = ("test_id", "stage")
+
+
+_current = contextvars.ContextVar("specimin_span", default=None)
+_lock = threading.Lock()
+_buffer = []
+_trace_dir = None
+_session = None
+
+
+class Span:
+    """A timed region with its own counters; see span()."""
+
+    __slots__ = ("name", "args", "counters", "parent", "track", "stage_root", "start_us", "start_ns")
+
+    def __init__(self, name, args, parent, track):
+        self.name = name
+        self.parent = parent
+        self.args = {k: parent.args[k] for k in INHERITED_ARGS if parent and k in parent.args}
+        self.args.update(args)
+        self.track = track or (parent.track if parent else None)
+        # Outermost span of a stage, counted once in the stage totals
+        self.stage_root = "stage" in args and (parent is None or parent.args.get("stage") != args["stage"])
+        self.counters = {}
+
+    def count(self, name, value=1):
+        """Add to one of this span's counters."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+
+def enable(run_dir, session=None):
+    """
+    Record spans and counters of this process into a run directory.
+
+    The directory and session are also exported through $SPECIMIN_TRACE_DIR
+    and $SPECIMIN_TRACE_SESSION, so worker processes and scripts started
+    from this one record into the same session.
+
+    Args:
+        run_dir (str): Run directory receiving TRACE_FILE
+        session (str): Session to join; defaults to the inherited session
+            when the parent records into the same directory, else a new one
+    """
+    global _trace_dir, _session
+    _trace_dir = Path(run_dir).resolve()
+    if session is None and os.environ.get(TRACE_ENV_VAR) == str(_trace_dir):
+        session = os.environ.get(SESSION_ENV_VAR)
+    _session = session or f"{time.time_ns():x}-{os.getpid()}"
+    os.environ[TRACE_ENV_VAR] = str(_trace_dir)
+    os.environ[SESSION_ENV_VAR] = _session
+
+
+def disable():
+    """Flush buffered events and stop recording in this process."""
+    global _trace_dir, _session
+    flush()
+    _trace_dir = None
+    _session = None
+    os.environ.pop(TRACE_ENV_VAR, None)
+    os.environ.pop(SESSION_ENV_VAR, None)
+
+
+def trace_dir():
+    """
+    Returns:
+        Path: Run directory being recorded into, or None if disabled
+    """
+    return _trace_dir if is_enabled() else None
+
+
+def session():
+    """
+    Returns:
+        str: Session being recorded, or None if disabled
+    """
+    return _session if is_enabled() else None
+
+
+def is_enabled():
+    """
+    Returns:
+        bool: Whether spans and counters are being recorded
+    """
+    global _trace_dir, _session
+    if _trace_dir is None and os.environ.get(TRACE_ENV_VAR):
+        _trace_dir = Path(os.environ[TRACE_ENV_VAR])
+        _session = os.environ.get(SESSION_ENV_VAR) or f"{time.time_ns():x}-{os.getpid()}"
+    return _trace_dir is not None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def count(self, name, value=1):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+@contextmanager
+def _recorded_span(name, args, track):
+    parent = _current.get()
+    current = Span(name, args, parent, track)
+    token = _current.set(current)
+    current.start_us = time.time_ns() // 1000
+    current.start_ns = time.perf_counter_ns()
+    try:
+        yield current
+    finally:
+        duration_us = (time.perf_counter_ns() - current.start_ns) // 1000
+        _current.reset(token)
+        _emit({
+            "type": "span",
+            "session": _session,
+            "name": name,
+            "ts": current.start_us,
+            "dur": duration_us,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "track": current.track,
+            "stage_root": current.stage_root,
+            "args": current.args,
+            "counters": current.counters
+        })
+        if parent is None:
+            flush()
+
+
+@contextmanager
+def _null_span():
+    yield _NULL_SPAN
+
+
+def span(name, track=None, **args):
+    """
+    Time a region of code.
+
+    Spans nest per thread and per asyncio task; 'test_id' and 'stage'
+    arguments are inherited by nested spans. Counters added while the span
+    is innermost are attributed to it. When recording is disabled this is
+    a no-op.
+
+    Args:
+        name (str): Span name, e.g. 'test_runner.run_test'
+        track (str): Timeline row for spans that overlap on one thread
+            (e.g. concurrent asyncio tasks); defaults to the thread
+        **args: JSON-serializable attributes such as test_id and stage
+
+    Returns:
+        A context manager yielding the span (with a count() method)
+    """
+    if not is_enabled():
+        return _null_span()
+    return _recorded_span(name, args, track)
+
+
+def count(name, value=1):
+    """
+    Add to a counter of the innermost span.
+
+    Outside any span the increment is recorded as a standalone counter event.
+
+    Args:
+        name (str): Counter name, e.g. 'bytes_read'
+        value (int): Amount to add
+    """
+    if not is_enabled():
+        return
+    current = _current.get()
+    if current is not None:
+        current.count(name, value)
+        return
+    _emit({
+        "type": "counter",
+        "session": _session,
+        "name": name,
+        "value": value,
+        "ts": time.time_ns() // 1000,
+        "pid": os.getpid()
+    })
+
+
+def _emit(event):
+    with _lock:
+        _buffer.append(event)
+
+
+def flush():
+    """Append buffered events to the run directory's trace log."""
+    if not _buffer or _trace_dir is None:
+        return
+    with _lock:
+        events = _buffer[:]
+        del _buffer[:]
+    data = "".join(json.dumps(e, separators=(",", ":")) + "\n" for e in events).encode("utf-8")
+    try:
+        fd = os.open(_trace_dir / TRACE_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    except OSError:
+        return
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _clear_after_fork():
+    # Events buffered and spans opened by the parent belong to the parent
+    del _buffer[:]
+    _current.set(None)
+
+
+atexit.register(flush)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_clear_after_fork)
+
+
+def load_events(run_dir):
+    """
+    Read a run directory's trace log.
+
+    Args:
+        run_dir (str): Run directory
+
+    Returns:
+        list: Events in the order they were flushed (empty if none)
+    """
+    events = []
+    try:
+        with open(Path(run_dir) / TRACE_FILE, 'r') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return events
+
+
+def chrome_trace(events):
+    """
+    Convert trace events to the Chrome trace-event format.
+
+    Spans become complete ('X') events. Spans with a track are placed on a
+    named row per process, so overlapping asyncio stages stay readable.
+
+    Args:
+        events (list): Events from load_events()
+
+    Returns:
+        dict: {"traceEvents": [...], "displayTimeUnit": "ms"}
+    """
+    trace = []
+    rows = {}
+    for event in events:
+        if event["type"] == "counter":
+            trace.append({
+                "name": event["name"], "ph": "C", "ts": event["ts"], "pid": event["pid"],
+                "args": {event["name"]: event["value"]}
+            })
+            continue
+
+        tid = event["tid"]
+        if event.get("track"):
+            key = (event["pid"], event["track"])
+            if key not in rows:
+                rows[key] = len(rows) + 1
+                trace.append({
+                    "name": "thread_name", "ph": "M", "pid": event["pid"], "tid": rows[key],
+                    "args": {"name": event["track"]}
+                })
+            tid = rows[key]
+
+        trace.append({
+            "name": event["name"],
+            "cat": event["name"].split(".", 1)[0],
+            "ph": "X",
+            "ts": event["ts"],
+            "dur": event["dur"],
+            "pid": event["pid"],
+            "tid": tid,
+            "args": dict(event["args"], **event["counters"])
+        })
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(run_dir, output=None):
+    """
+    Write the run's trace as Chrome trace-event JSON.
+
+    Args:
+        run_dir (str): Run directory
+        output (str): Output path (defaults to CHROME_TRACE_FILE in run_dir)
+
+    Returns:
+        Path: The written file, or None if nothing was recorded
+    """
+    events = load_events(run_dir)
+    if not events:
+        return None
+
+    output = Path(output or Path(run_dir) / CHROME_TRACE_FILE)
+    temp_file = output.with_name(f"{output.name}.tmp")
+    with open(temp_file, 'w') as f:
+        json.dump(chrome_trace(events), f)
+    os.replace(temp_file, output)
+    return output
+
+
+def current_events(events):
+    """
+    Drop events superseded by a later session.
+
+    Events are grouped by type, name, test case and stage; of each group
+    only the events of the last session that recorded it are kept. Outermost
+    stage spans are also grouped by test case and stage alone, so a stage
+    re-run through another entry point (e.g. test_runner.py after the
+    orchestrator) replaces the earlier stage time. Events from logs written
+    before sessions were recorded count as one session.
+
+    Args:
+        events (list): Events from load_events(), in log order
+
+    Returns:
+        list: The events of the latest recording of each group
+    """
+    def keys(event):
+        args = event.get("args", {})
+        yield (event["type"], event["name"], args.get("test_id"), args.get("stage"))
+        if event.get("stage_root"):
+            yield ("stage", args.get("test_id"), args.get("stage"))
+
+    latest = {}
+    for event in events:
+        for key in keys(event):
+            latest[key] = event.get("session")
+
+    def is_current(event):
+        return all(latest[key] == event.get("session") for key in keys(event))
+
+    return [e for e in events if is_current(e)]
+
+
+def summarize(events):
+    """
+    Aggregate trace events for the reports.
+
+    Only the latest recording of each span counts (see current_events()).
+
+    Args:
+        events (list): Events from load_events()
+
+    Returns:
+        dict: Summary with keys:
+            - processes (int): Processes that recorded events
+            - spans (dict): Span name -> {count, total_seconds, max_seconds}
+            - stages (dict): Stage -> total seconds of its outermost spans
+            - counters (dict): Counter name -> total
+        or None if there are no events
+    """
+    events = current_events(events)
+    if not events:
+        return None
+
+    spans = {}
+    stages = {}
+    counters = {}
+    for event in events:
+        if event["type"] == "counter":
+            counters[event["name"]] = counters.get(event["name"], 0) + event["value"]
+            continue
+
+        seconds = event["dur"] / 1e6
+        entry = spans.setdefault(event["name"], {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+        entry["count"] += 1
+        entry["total_seconds"] += seconds
+        entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+        stage = event["args"].get("stage")
+        if stage and event.get("stage_root"):
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+        for name, value in event["counters"].items():
+            counters[name] = counters.get(name, 0) + value
+
+    for entry in spans.values():
+        entry["total_seconds"] = round(entry["total_seconds"], 3)
+        entry["max_seconds"] = round(entry["max_seconds"], 3)
+
+    return {
+        "processes": len({e["pid"] for e in events}),
+        "spans": dict(sorted(spans.items(), key=lambda kv: -kv[1]["total_seconds"])),
+        "stages": {k: round(v, 3) for k, v in sorted(stages.items(), key=lambda kv: -kv[1])},
+        "counters": dict(sorted(counters.items()))
+    }
+
+
+def main():
+    """Main entry point when run as script."""
+    if len(sys.argv) not in (3, 4) or sys.argv[1] not in ("export", "summary"):
+        print("Usage: instrumentation.py <export|summary> <run_directory> [output]", file=sys.stderr)
+        sys.exit(1)
+
+    run_dir = Path(sys.argv[2])
+    if not (run_dir / TRACE_FILE).exists():
+        print(f"Error: No trace recorded in {run_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    if sys.argv[1] == "export":
+        print(export_chrome_trace(run_dir, sys.argv[3] if len(sys.argv) == 4 else None))
+    else:
+        print(json.dumps(summarize(load_events(run_dir)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Indexed test case manifest for Specimin evaluation framework.
+Builds a byte-offset index of test_cases.json so a single test case can be
+loaded without parsing the whole manifest, and test case metadata can be
+listed without materializing test bodies. test_cases.json stays the source
+of truth; the index is a cache rebuilt whenever the manifest changes.
+"""
+
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+
+
+EVAL_DIR = Path(__file__).parent
+
+MANIFEST_FILE = EVAL_DIR / "test_cases.json"
+
+# Sidecar indexes, one per manifest path
+INDEX_DIR = EVAL_DIR / ".cache" / "manifest"
+
+# Bump when the index layout changes
+INDEX_VERSION = 1
+
+# Large fields left out of the metadata kept in the index
+BODY_FIELDS = ("test_code", "benchmark")
+
+# Manifests opened by load(), by resolved path
+_loaded = {}
+
+
+def file_stamp(path):
+    """
+    Cheap change detector for a file.
+
+    Args:
+        path (Path): File path
+
+    Returns:
+        list: [mtime_ns, size]
+    """
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _skip_whitespace(text, pos):
+    while pos < len(text) and text[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def _expect(text, pos, char):
+    pos = _skip_whitespace(text, pos)
+    if pos >= len(text) or text[pos] != char:
+        raise ValueError(f"Malformed manifest: expected '{char}' at offset {pos}")
+    return pos + 1
+
+
+def build_index(data):
+    """
+    Scan manifest bytes once, recording where each test case lies.
+
+    Args:
+        data (bytes): Contents of test_cases.json
+
+    Returns:
+        dict: Index with keys:
+            - header (dict): Top-level fields other than test_cases
+            - cases (list): [test_id, byte offset, byte length, metadata] in
+                manifest order; metadata omits BODY_FIELDS
+
+    Raises:
+        ValueError: If the manifest is not a JSON object of the expected shape
+    """
+    text = data.decode("utf-8")
+    decoder = json.JSONDecoder()
+    ascii_only = len(text) == len(data)
+
+    # Character -> byte offsets, advanced incrementally for non-ASCII manifests
+    mark = [0, 0]
+
+    def byte_offset(pos):
+        if ascii_only:
+            return pos
+        mark[1] += len(text[mark[0]:pos].encode("utf-8"))
+        mark[0] = pos
+        return mark[1]
+
+    header = {}
+    cases = []
+
+    pos = _expect(text, 0, "{")
+    pos = _skip_whitespace(text, pos)
+    if text.startswith("}", pos):
+        return {"header": header, "cases": cases}
+
+    while True:
+        pos = _skip_whitespace(text, pos)
+        key, pos = decoder.raw_decode(text, pos)
+        pos = _expect(text, pos, ":")
+        pos = _skip_whitespace(text, pos)
+
+        if key != "test_cases":
+            header[key], pos = decoder.raw_decode(text, pos)
+        else:
+            pos = _skip_whitespace(text, _expect(text, pos, "["))
+            closed = text.startswith("]", pos)
+            if closed:
+                pos += 1
+            while not closed:
+                start = _skip_whitespace(text, pos)
+                test_case, end = decoder.raw_decode(text, start)
+                if not isinstance(test_case, dict) or "id" not in test_case:
+                    raise ValueError(f"Malformed manifest: test case without id at offset {start}")
+                offset = byte_offset(start)
+                length = byte_offset(end) - offset
+                metadata = {k: v for k, v in test_case.items() if k not in BODY_FIELDS}
+                metadata["has_benchmark"] = "benchmark" in test_case
+                cases.append([test_case["id"], offset, length, metadata])
+
+                pos = _skip_whitespace(text, end)
+                if pos >= len(text) or text[pos] not in ",]":
+                    raise ValueError(f"Malformed manifest: expected ',' or ']' at offset {pos}")
+                closed = text[pos] == "]"
+                pos += 1
+
+        pos = _skip_whitespace(text, pos)
+        if text.startswith("}", pos):
+            return {"header": header, "cases": cases}
+        pos = _expect(text, pos, ",")
+
+
+class Manifest:
+    """
+    Read-only view of test_cases.json backed by a byte-offset index.
+
+    The index lives in INDEX_DIR and records the manifest's mtime, size and
+    sha256. It is reused while mtime and size match; if only the mtime
+    changed, the hash decides, so touching the manifest does not force a
+    rebuild. Any other change rebuilds the index on first use.
+    """
+
+    def __init__(self, path=None, index_dir=None):
+        """
+        Args:
+            path (str): Path to test_cases.json (defaults to the eval directory)
+            index_dir (str): Where to keep the index (defaults to INDEX_DIR)
+        """
+        self.path = Path(path or MANIFEST_FILE).resolve()
+        key = hashlib.sha256(str(self.path).encode()).hexdigest()[:16]
+        self.index_path = Path(index_dir or INDEX_DIR) / f"{key}.json"
+        self.header = {}
+        self._stamp = None
+        self._cases = []
+        self._positions = {}
+        self._load()
+
+    def refresh(self):
+        """Reload the index if the manifest changed since it was loaded."""
+        if file_stamp(self.path) != self._stamp:
+            self._load()
+
+    def _load(self, force=False):
+        """Load the sidecar index, rebuilding it if the manifest changed."""
+        stamp = file_stamp(self.path)
+        index = None if force else self._read_index()
+
+        if index is not None and index["stamp"] != stamp:
+            digest = hashlib.sha256(self.path.read_bytes()).hexdigest()
+            if digest == index["sha256"]:
+                index["stamp"] = stamp
+                self._write_index(index)
+            else:
+                index = None
+
+        if index is None:
+            data = self.path.read_bytes()
+            index = build_index(data)
+            index.update(version=INDEX_VERSION, stamp=stamp, sha256=hashlib.sha256(data).hexdigest())
+            self._write_index(index)
+
+        self.header = index["header"]
+        self._stamp = stamp
+        self._cases = index["cases"]
+        self._positions = {}
+        for position, entry in enumerate(self._cases):
+            self._positions.setdefault(entry[0], position)
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return index if index.get("version") == INDEX_VERSION else None
+
+    def _write_index(self, index):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(temp_file, self.index_path)
+
+    def _read_case(self, entry):
+        _, offset, length, _ = entry
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def __len__(self):
+        return len(self._cases)
+
+    def __contains__(self, test_id):
+        return test_id in self._positions
+
+    def __iter__(self):
+        """
+        Yield full test cases in manifest order, parsing one at a time.
+
+        Iterates over the ids present when iteration starts; if the manifest
+        changes meanwhile, each remaining id is looked up in the reloaded
+        index and ids that were removed are skipped.
+        """
+        for test_id in self.ids():
+            test_case = self.get(test_id)
+            if test_case is not None:
+                yield test_case
+
+    def ids(self):
+        """
+        Returns:
+            list: Test case identifiers in manifest order
+        """
+        return [entry[0] for entry in self._cases]
+
+    def metadata(self):
+        """
+        Test case metadata without test bodies.
+
+        Returns:
+            list: Test case dicts without BODY_FIELDS, with 'has_benchmark',
+                in manifest order
+        """
+        return [dict(entry[3]) for entry in self._cases]
+
+    def get(self, test_id):
+        """
+        Load one test case by reading only its bytes.
+
+        Args:
+            test_id (str): Test case identifier
+
+        Returns:
+            dict: Full test case, or None if the manifest has no such id
+        """
+        # The manifest may have changed since the index was loaded
+        self.refresh()
+        position = self._positions.get(test_id)
+        return None if position is None else self._read_case(self._cases[position])
+
+
+def load(path=None):
+    """
+    Open a manifest, reusing the instance from an earlier call.
+
+    Long-lived processes (see specimin_eval.py) keep the index in memory
+    this way; it is refreshed whenever the manifest changes on disk.
+
+    Args:
+        path (str): Path to test_cases.json (defaults to the eval directory)
+
+    Returns:
+        Manifest: The manifest, up to date with the file
+    """
+    resolved = Path(path or MANIFEST_FILE).resolve()
+    manifest = _loaded.get(resolved)
+    if manifest is None:
+        manifest = _loaded[resolved] = Manifest(resolved)
+    else:
+        manifest.refresh()
+    return manifest
+
+
+def main():
+    """Main entry point when run as script."""
+    if len(sys.argv) < 2 or sys.argv[1] not in ("index", "list", "show"):
+        print("Usage: manifest.py <index|list|show test_id> [manifest_path]", file=sys.stderr)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    args = sys.argv[2:]
+    test_id = args.pop(0) if command == "show" and args else None
+    if command == "show" and test_id is None:
+        print("Usage: manifest.py show <test_id> [manifest_path]", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        manifest = Manifest(args[0] if args else None)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if command == "index":
+        print(json.dumps({
+            "manifest": str(manifest.path),
+            "index": str(manifest.index_path),
+            "test_cases": len(manifest)
+        }, indent=2))
+    elif command == "list":
+        print(json.dumps(manifest.metadata(), indent=2))
+    else:
+        test_case = manifest.get(test_id)
+        if test_case is None:
+            print(f"Error: No test case {test_id} in {manifest.path}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(test_case, indent=2))
+
+
+if __name__ == "__main__":
+    main()
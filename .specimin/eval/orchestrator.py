@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Asynchronous pipeline orchestrator for Specimin evaluation framework.
+Runs every test case as a DAG of stages (artifact generation, pytest, judge
+scoring) so that independent stages of different test cases overlap, with
+bounded concurrency per stage type.
+"""
+
+import os
+import re
+import sys
+import json
+import asyncio
+import argparse
+import functools
+import importlib
+import contextvars
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import reporter
+import manifest
+import sharding
+import workspace
+import scheduler
+import checkpoint
+import test_runner
+import score_artifacts
+import instrumentation
+
+
+# Generation stage -> file the generated content is written to
+GENERATED_FILES = {
+    "spec": "spec.md",
+    "plan": "plan.md",
+    "implement": "implementation.md",
+    "code": "code.py"
+}
+
+# Stage -> (stage type, dependencies); listed in dependency order
+PIPELINE = {
+    "spec": ("generate", ()),
+    "plan": ("generate", ("spec",)),
+    "implement": ("generate", ("plan",)),
+    "code": ("generate", ("implement",)),
+    "test": ("test", ("code",)),
+    "score_spec": ("score", ("spec",)),
+    "score_plan": ("score", ("plan",)),
+    "score_implementation": ("score", ("implement",)),
+    "record": ("record", ("test", "score_spec", "score_plan", "score_implementation"))
+}
+
+# Files (relative to the test case directory) a checkpointed stage depends
+# on; a resumed run redoes the stage if any of them changed
+STAGE_FILES = {
+    "spec": ("spec.md",),
+    "plan": ("plan.md",),
+    "implement": ("implementation.md",),
+    "code": ("code.py",),
+    "test": ("code.py", "test.py"),
+    "score_spec": ("spec.md",),
+    "score_plan": ("plan.md",),
+    "score_implementation": ("implementation.md",)
+}
+
+# Maximum concurrently running stages per stage type
+DEFAULT_CONCURRENCY = {
+    "generate": 4,
+    "test": os.cpu_count() or 4,
+    "score": 4,
+    "record": 4
+}
+
+
+class Backend:
+    """
+    Pluggable producers of generated artifacts and judge responses.
+
+    Both callables may be plain functions (run in a worker thread) or
+    coroutine functions (awaited on the event loop).
+
+    Attributes:
+        generate: f(stage, test_case, test_dir) -> str, the content of the
+            stage's file in GENERATED_FILES
+        judge: f(artifact_type, prompt) -> str, the judge's raw response
+        model (str): Judge model identifier used for the score cache
+    """
+
+    def __init__(self, generate, judge, model):
+        self.generate = generate
+        self.judge = judge
+        self.model = model
+
+
+def stub_generate(stage, test_case, test_dir):
+    """
+    Produce placeholder artifacts without an LLM.
+
+    The generated code defines each expected function or class so that the
+    test stage runs, but every call raises NotImplementedError.
+    """
+    if stage != "code":
+        return f"# {stage.title()}: {test_case.get('name', test_case['id'])}\n\n{test_case.get('feature_description', '')}\n"
+
+    lines = ['"""Stub implementation generated without an LLM."""', ""]
+    for name in test_case.get("expected_functions", []):
+        if name[:1].isupper():
+            lines += [f"class {name}:", "    def __init__(self, *args, **kwargs):",
+                      "        raise NotImplementedError", ""]
+        else:
+            lines += [f"def {name}(*args, **kwargs):", "    raise NotImplementedError", ""]
+    return "\n".join(lines)
+
+
+def stub_judge(artifact_type, prompt):
+    """Answer every rubric dimension of the prompt with a middle score."""
+    dimensions = re.findall(r"^\*\*(.+?):\*\*\s*\[1-5\]", prompt, re.MULTILINE)
+    return "\n".join(f"**{d}:** 3\n*Justification:* Stub judge score." for d in dimensions)
+
+
+STUB_BACKEND = Backend(stub_generate, stub_judge, model="stub")
+
+
+def load_backend(spec):
+    """
+    Resolve a backend from 'stub' or a 'module:attribute' reference.
+
+    The attribute may be a Backend (anything with generate, judge and model
+    attributes) or a zero-argument callable returning one.
+
+    Args:
+        spec (str): Backend reference
+
+    Returns:
+        Backend: The resolved backend
+    """
+    if spec == "stub":
+        return STUB_BACKEND
+
+    # Backends live in the caller's project, not next to this script
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    module_name, _, attr = spec.partition(":")
+    backend = getattr(importlib.import_module(module_name), attr or "backend")
+    return backend if hasattr(backend, "generate") else backend()
+
+
+def load_test_cases(manifest_path=None, test_ids=None):
+    """
+    Load test cases from the manifest.
+
+    Args:
+        manifest_path (str): Path to test_cases.json (defaults to the eval directory)
+        test_ids (list): Only return these test cases (None returns all)
+
+    Returns:
+        list: Test case dicts in manifest order
+    """
+    test_cases = manifest.load(manifest_path)
+    if not test_ids:
+        return list(test_cases)
+    wanted = set(test_ids)
+    return [test_cases.get(test_id) for test_id in test_cases.ids() if test_id in wanted]
+
+
+class Pipeline:
+    """Runs the stage DAG of many test cases on one event loop."""
+
+    def __init__(self, run_dir, backend, concurrency=None, limits=None, resume=False):
+        """
+        Args:
+            run_dir (str): Run directory; each test case gets a subdirectory
+            backend (Backend): Artifact generator and judge
+            concurrency (dict): Overrides of DEFAULT_CONCURRENCY
+            limits (dict): Resource limits for sandboxed pytest runs (see sandbox.DEFAULT_LIMITS)
+            resume (bool): Reuse stages completed by an earlier, interrupted run
+        """
+        self.run_dir = Path(run_dir)
+        self.backend = backend
+        self.limits = limits
+        self.resume = resume
+        self.journal = checkpoint.CheckpointJournal(run_dir)
+        self.timing_history = {}
+        self.concurrency = dict(DEFAULT_CONCURRENCY, **(concurrency or {}))
+        self.semaphores = None
+        self.executor = None
+
+    async def _call(self, stage_type, fn, *args):
+        """
+        Run a stage callable while holding its stage type's semaphore.
+
+        Synchronous callables run on the thread pool in a copy of the
+        caller's context, so their spans nest under the stage's span.
+        """
+        async with self.semaphores[stage_type]:
+            if asyncio.iscoroutinefunction(fn):
+                return await fn(*args)
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(self.executor, functools.partial(context.run, fn, *args))
+
+    async def _generate(self, stage, test_case, test_dir, outputs):
+        content = await self._call("generate", self.backend.generate, stage, test_case, str(test_dir))
+        (test_dir / GENERATED_FILES[stage]).write_text(content)
+
+    async def _test(self, stage, test_case, test_dir, outputs):
+        (test_dir / "test.py").write_text(test_case.get("test_code", ""))
+        timeout = scheduler.adaptive_timeout(
+            self.timing_history.get(test_case["id"], []), test_runner.TEST_TIMEOUT
+        )
+        run_fn = functools.partial(test_runner.run_test, limits=self.limits)
+        return await self._call("test", test_runner.timed_run, run_fn, str(test_dir), timeout)
+
+    async def _score(self, stage, test_case, test_dir, outputs):
+        artifact_type = stage[len("score_"):]
+        model = self.backend.model
+
+        scores = score_artifacts.lookup_scores(test_dir, artifact_type, model)
+        if scores is not None:
+            return scores
+
+        prompt = score_artifacts.generate_evaluation_prompt(test_dir, artifact_type)
+        response = await self._call("score", self.backend.judge, artifact_type, prompt)
+        return score_artifacts.score_response(test_dir, artifact_type, response, model)
+
+    async def run_test_case(self, test_case):
+        """
+        Run every stage of one test case, each as soon as its dependencies finish.
+
+        A stage whose dependency failed is skipped; the record stage always
+        runs and writes results.json from whatever completed. Every other
+        stage is checkpointed when it succeeds. When resuming, a stage is
+        restored from the journal instead of run if all its dependencies
+        were restored too and none of its STAGE_FILES changed.
+
+        Args:
+            test_case (dict): Test case from test_cases.json
+
+        Returns:
+            dict: {test_id, stages: {stage: 'ok' | 'resumed' | 'skipped' | 'failed: <error>'}}
+        """
+        test_dir = self.run_dir / test_case["id"]
+        test_dir.mkdir(parents=True, exist_ok=True)
+
+        runners = {
+            "generate": self._generate,
+            "test": self._test,
+            "score": self._score
+        }
+        statuses = {}
+        outputs = {}
+        tasks = {}
+
+        test_id = test_case["id"]
+
+        async def run_stage(stage):
+            stage_type, deps = PIPELINE[stage]
+            await asyncio.gather(*(tasks[d] for d in deps))
+
+            if stage_type == "record":
+                resumed = sorted(s for s, status in statuses.items() if status == "resumed")
+                with instrumentation.span("orchestrator.record", track=f"{test_id} {stage}",
+                                          test_id=test_id, stage=stage):
+                    outputs[stage] = await self._call(
+                        "record", record_results, test_dir, test_case, outputs, resumed
+                    )
+                statuses[stage] = "ok"
+                return
+
+            if any(statuses[d] not in ("ok", "resumed") for d in deps):
+                statuses[stage] = "skipped"
+                return
+
+            if all(statuses[d] == "resumed" for d in deps):
+                done = self.journal.completed(test_id, stage, STAGE_FILES[stage])
+                if done is not None:
+                    outputs[stage] = done["output"]
+                    statuses[stage] = "resumed"
+                    return
+
+            try:
+                with instrumentation.span(f"orchestrator.{stage_type}", track=f"{test_id} {stage}",
+                                          test_id=test_id, stage=stage):
+                    outputs[stage] = await runners[stage_type](stage, test_case, test_dir, outputs)
+                statuses[stage] = "ok"
+            except Exception as e:
+                statuses[stage] = f"failed: {e}"
+                outputs[stage] = None
+                return
+            self.journal.record(test_id, stage, outputs[stage], STAGE_FILES[stage])
+
+        for stage in PIPELINE:
+            tasks[stage] = asyncio.ensure_future(run_stage(stage))
+        await asyncio.gather(*tasks.values())
+
+        return {"test_id": test_id, "stages": {s: statuses[s] for s in PIPELINE}}
+
+    async def run(self, test_cases):
+        """
+        Run all test cases concurrently, then regenerate the reports.
+
+        Test cases start longest-first by recorded wall time, and each pytest
+        stage gets an adaptive timeout (see scheduler.py).
+
+        Args:
+            test_cases (list): Test cases from test_cases.json
+
+        Returns:
+            dict: Summary with per-test-case stage statuses and report statistics
+        """
+        self.semaphores = {t: asyncio.Semaphore(n) for t, n in self.concurrency.items()}
+        self.timing_history = scheduler.load_timing_history()
+        session = self.journal.open_session(self.resume)
+
+        with ThreadPoolExecutor(max_workers=sum(self.concurrency.values())) as executor:
+            self.executor = executor
+            # Start the historically slowest test cases first; report in manifest order
+            plan = scheduler.plan_schedule([tc["id"] for tc in test_cases], self.timing_history)
+            by_id = {tc["id"]: tc for tc in test_cases}
+            with instrumentation.span("orchestrator.run", session=session):
+                tasks = {test_id: asyncio.ensure_future(self.run_test_case(by_id[test_id]))
+                         for test_id, _, _ in plan}
+                cases = await asyncio.gather(*(tasks[tc["id"]] for tc in test_cases))
+
+            loop = asyncio.get_running_loop()
+            report = await loop.run_in_executor(executor, reporter.stream_reports, str(self.run_dir))
+
+        return {
+            "run_directory": str(self.run_dir),
+            "session": session,
+            "resumed": self.resume,
+            "test_cases": list(cases),
+            "statistics": report["statistics"]
+        }
+
+
+def record_results(test_dir, test_case, outputs, resumed_stages=()):
+    """
+    Write a test case's results.json from its pipeline stage outputs.
+
+    Args:
+        test_dir (str): Test case directory
+        test_case (dict): Test case from test_cases.json
+        outputs (dict): Stage -> output (run_test() result for 'test',
+            parse_scores() output for 'score_*'; None for failed stages)
+        resumed_stages (list): Stages restored from the checkpoint journal;
+            recorded with an 'origin' of 'resumed' instead of 'fresh'
+    """
+    test_dir = Path(test_dir)
+    results_file = test_dir / "results.json"
+
+    record = {}
+    if results_file.exists():
+        try:
+            with open(results_file, 'r') as f:
+                record = json.load(f)
+        except json.JSONDecodeError:
+            record = {}
+
+    record["test_name"] = test_case.get("name", test_case["id"])
+    record["origin"] = "resumed" if resumed_stages else "fresh"
+    record["resumed_stages"] = list(resumed_stages)
+    record["rubric_scores"] = {
+        artifact_type: outputs[f"score_{artifact_type}"]
+        for artifact_type in score_artifacts.ARTIFACT_TYPES
+        if outputs.get(f"score_{artifact_type}")
+    }
+
+    temp_file = results_file.with_suffix(".json.tmp")
+    with open(temp_file, 'w') as f:
+        json.dump(record, f, indent=2)
+    os.replace(temp_file, results_file)
+
+    result = outputs.get("test")
+    if result is None:
+        result = {
+            "test_id": test_case["id"],
+            "passed": False,
+            "error_type": "pipeline_error",
+            "error_message": "Code was not generated, so tests did not run",
+            "stdout": "",
+            "stderr": ""
+        }
+    test_runner.write_results(test_dir, result)
+
+
+def main():
+    """Main entry point when run as script."""
+    parser = argparse.ArgumentParser(
+        description="Run the evaluation pipeline with concurrent stages across test cases."
+    )
+    parser.add_argument("--backend", required=True,
+                        help="'stub' or module:attribute naming a Backend (or a factory returning one)")
+    parser.add_argument("--test-case", action="append", dest="test_ids", metavar="ID",
+                        help="Only run this test case (repeatable)")
+    parser.add_argument("--run-dir", default=None,
+                        help="Run directory (default: runs/v{version} from workspace.py)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run, skipping stages it completed")
+    parser.add_argument("--shard", default=None, metavar="I/N",
+                        help="Only run shard I of N and write a partial run (see sharding.py merge)")
+    parser.add_argument("--shard-strategy", choices=sharding.STRATEGIES, default="hash",
+                        help="Assign test cases to shards by stable hash (default) or historical duration")
+    parser.add_argument("--shard-assignment", default=None, metavar="FILE",
+                        help="Use a shared assignment from 'sharding.py plan --export' instead of computing one")
+    for stage_type in DEFAULT_CONCURRENCY:
+        parser.add_argument(f"--{stage_type}-concurrency", type=int, default=None, metavar="N",
+                            help=f"Concurrent {stage_type} stages (default: {DEFAULT_CONCURRENCY[stage_type]})")
+    args = parser.parse_args()
+
+    try:
+        backend = load_backend(args.backend)
+    except (ImportError, AttributeError, ValueError) as e:
+        print(f"Error: Could not load backend {args.backend}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    test_cases = load_test_cases(test_ids=args.test_ids)
+
+    shard = None
+    if args.shard:
+        try:
+            shard = sharding.parse_shard(args.shard)
+            if args.shard_assignment:
+                shard_strategy, assignment = sharding.load_assignment(args.shard_assignment, shard[1])
+            else:
+                shard_strategy = args.shard_strategy
+                durations = sharding.historical_durations() if shard_strategy == "duration" else None
+                assignment = sharding.assign_shards([tc["id"] for tc in test_cases], shard[1],
+                                                    shard_strategy, durations)
+            test_cases = sharding.select_shard(test_cases, shard[0], assignment)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    if not test_cases:
+        print("Error: No matching test cases in test_cases.json", file=sys.stderr)
+        sys.exit(1)
+
+    concurrency = {
+        t: getattr(args, f"{t}_concurrency")
+        for t in DEFAULT_CONCURRENCY
+        if getattr(args, f"{t}_concurrency") is not None
+    }
+    if args.run_dir:
+        run_dir = workspace.prepare_run_directory(args.run_dir, resume=args.resume)
+    else:
+        run_dir = workspace.create_run_directory(resume=args.resume)
+    instrumentation.enable(run_dir)
+
+    if shard is not None:
+        sharding.write_shard_manifest(run_dir, *shard, shard_strategy, assignment)
+
+    summary = asyncio.run(Pipeline(run_dir, backend, concurrency, resume=args.resume).run(test_cases))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Structured pytest result capture for Specimin evaluation framework.
+Parses pytest's JUnit XML into compact per-test outcome records and
+classifies failures from exception types instead of raw output text.
+"""
+
+import re
+import sys
+import json
+import xml.etree.ElementTree as ET
+
+
+# Length limits for the compact per-test records
+MAX_MESSAGE_CHARS = 300
+MAX_TRACEBACK_LINES = 15
+
+# Location line pytest ends a traceback with, e.g. "test_x.py:4: AttributeError"
+_LOCATION_RE = re.compile(r"^\S+:\d+: ([A-Za-z_][\w.]*)$")
+# Exception line in pytest output, e.g. "E   ModuleNotFoundError: No module named 'x'"
+_EXCEPTION_RE = re.compile(r"^E\s+([A-Za-z_][\w.]*(?:Error|Exception|Exit|Interrupt|Warning)):?")
+
+# Failure classes by exception type
+IMPORT_ERRORS = {"ImportError", "ModuleNotFoundError"}
+MISSING_FUNCTION_ERRORS = {"AttributeError"}
+
+
+def junit_args(xml_path):
+    """
+    Build the pytest arguments that write a JUnit XML report.
+
+    Args:
+        xml_path (str): Where pytest should write the report
+
+    Returns:
+        list: Extra pytest command line arguments
+    """
+    return [f"--junitxml={xml_path}"]
+
+
+def exception_type(traceback_text):
+    """
+    Extract the exception type from a pytest failure traceback.
+
+    Args:
+        traceback_text (str): Text of a JUnit failure or error element
+
+    Returns:
+        str: Exception class name, or None if it cannot be determined
+    """
+    lines = traceback_text.rstrip().splitlines()
+    if lines:
+        match = _LOCATION_RE.match(lines[-1].strip())
+        if match:
+            return match.group(1).rsplit(".", 1)[-1]
+
+    for line in reversed(lines):
+        match = _EXCEPTION_RE.match(line)
+        if match:
+            return match.group(1).rsplit(".", 1)[-1]
+    return None
+
+
+def _short_traceback(text):
+    lines = text.rstrip().splitlines()
+    if len(lines) > MAX_TRACEBACK_LINES:
+        lines = ["..."] + lines[-MAX_TRACEBACK_LINES:]
+    return "\n".join(lines)
+
+
+def parse_junit(xml_path):
+    """
+    Parse a pytest JUnit XML report into per-test outcome records.
+
+    Args:
+        xml_path (str): Path to the JUnit XML file
+
+    Returns:
+        list: One dict per test with keys:
+            - node_id (str): 'module::test' (or the module name for collection errors)
+            - outcome (str): 'passed', 'failed', 'error' or 'skipped'
+            - duration (float): Seconds spent in the test
+            - exception_type (str): Exception class for failures and errors
+            - message (str): Short failure message
+            - traceback (str): Last lines of the failure traceback
+    """
+    tree = ET.parse(xml_path)
+    tests = []
+
+    for case in tree.iter("testcase"):
+        classname = case.get("classname", "")
+        name = case.get("name", "")
+        record = {
+            "node_id": f"{classname}::{name}" if classname else name,
+            "outcome": "passed",
+            "duration": float(case.get("time") or 0.0),
+            "exception_type": None,
+            "message": None,
+            "traceback": None
+        }
+
+        for tag in ("failure", "error", "skipped"):
+            element = case.find(tag)
+            if element is None:
+                continue
+            record["outcome"] = {"failure": "failed", "error": "error", "skipped": "skipped"}[tag]
+            record["message"] = (element.get("message") or "")[:MAX_MESSAGE_CHARS]
+            if tag != "skipped":
+                text = element.text or ""
+                record["exception_type"] = exception_type(text)
+                record["traceback"] = _short_traceback(text)
+            break
+
+        tests.append(record)
+
+    return tests
+
+
+def read_junit(xml_path):
+    """
+    Parse a JUnit XML report, tolerating a missing or truncated file.
+
+    Args:
+        xml_path (str): Path to the JUnit XML file
+
+    Returns:
+        list: Records as from parse_junit(), or None if unreadable
+    """
+    try:
+        return parse_junit(xml_path)
+    except (OSError, ET.ParseError):
+        return None
+
+
+def classify_tests(tests):
+    """
+    Determine the error type of a failed run from structured outcomes.
+
+    Args:
+        tests (list): Records from parse_junit()
+
+    Returns:
+        str: 'import_error', 'missing_function' or 'assertion_failure'
+    """
+    types = {t["exception_type"] for t in tests if t["outcome"] in ("failed", "error")}
+    if types & IMPORT_ERRORS:
+        return "import_error"
+    if types & MISSING_FUNCTION_ERRORS:
+        return "missing_function"
+    return "assertion_failure"
+
+
+def summarize_failures(tests, limit=5):
+    """
+    Build a short error message listing failed tests.
+
+    Args:
+        tests (list): Records from parse_junit()
+        limit (int): Maximum number of tests to list
+
+    Returns:
+        str: One line per failed test, e.g. 'test::x - AssertionError: assert 1 == 2'
+    """
+    failed = [t for t in tests if t["outcome"] in ("failed", "error")]
+    lines = []
+    for t in failed[:limit]:
+        detail = t["message"] or t["exception_type"] or t["outcome"]
+        if t["exception_type"] and not detail.startswith(t["exception_type"]):
+            detail = f"{t['exception_type']}: {detail}"
+        lines.append(f"{t['node_id']} - {detail}")
+    if len(failed) > limit:
+        lines.append(f"... and {len(failed) - limit} more")
+    return "\n".join(lines)
+
+
+def count_outcomes(tests):
+    """
+    Count tests per outcome.
+
+    Args:
+        tests (list): Records from parse_junit()
+
+    Returns:
+        dict: Outcome -> count
+    """
+    counts = {}
+    for t in tests:
+        counts[t["outcome"]] = counts.get(t["outcome"], 0) + 1
+    return counts
+
+
+def main():
+    """Main entry point when run as script."""
+    if len(sys.argv) != 2:
+        print("Usage: pytest_results.py <junit_xml_path>", file=sys.stderr)
+        sys.exit(1)
+
+    tests = read_junit(sys.argv[1])
+    if tests is None:
+        print(f"Error: Could not read JUnit XML: {sys.argv[1]}", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps(tests, indent=2))
+
+
+if __name__ == "__main__":
+    main()
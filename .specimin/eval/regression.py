@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Statistical regression detection for Specimin evaluation framework.
+Compares a run against a rolling window of past baselines using prediction
+intervals, score trends and per-test-case pass/fail flips, instead of a
+fixed threshold against the single previous run.
+"""
+
+import sys
+import json
+import math
+
+import baseline_store
+
+
+# Number of past baselines compared against by default
+DEFAULT_WINDOW = 10
+
+# Minimum history before statistical detection replaces the fixed threshold
+MIN_HISTORY = 3
+
+# Drops smaller than this are never flagged, even with zero variance history
+MIN_DELTA = {
+    "pass_rate": 1.0,
+    "scores": 0.1
+}
+
+# Two-sided 95% Student t critical values by degrees of freedom
+T_CRITICAL_95 = [
+    None, 12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262,
+    2.228, 2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093,
+    2.086, 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045,
+    2.042
+]
+
+
+def t_critical(df):
+    """
+    Return the two-sided 95% t critical value for df degrees of freedom.
+
+    Args:
+        df (int): Degrees of freedom (>= 1)
+
+    Returns:
+        float: Critical value (normal approximation above 30)
+    """
+    if df < len(T_CRITICAL_95):
+        return T_CRITICAL_95[max(df, 1)]
+    return 1.96
+
+
+def extract_metrics(entry):
+    """
+    Flatten the numeric metrics of a baseline entry.
+
+    Args:
+        entry (dict): Baseline entry
+
+    Returns:
+        dict: Metric name -> value, e.g. {'pass_rate': 90.0, 'spec.clarity': 4.1}
+    """
+    metrics = {"pass_rate": entry.get("pass_rate")}
+    for artifact, dims in (entry.get("average_scores") or {}).items():
+        for dim, score in (dims or {}).items():
+            metrics[f"{artifact}.{dim}"] = score
+    return metrics
+
+
+def build_series(entries):
+    """
+    Turn baseline entries into one column of values per metric.
+
+    Args:
+        entries (list): Baseline entries, oldest first
+
+    Returns:
+        dict: Metric name -> list of values (None where missing), aligned with entries
+    """
+    rows = [extract_metrics(e) for e in entries]
+    names = sorted({name for row in rows for name in row})
+    return {name: [row.get(name) for row in rows] for name in names}
+
+
+def rolling_statistics(values, window):
+    """
+    Compute the mean and sample standard deviation of the `window` values
+    preceding every position, in a single pass using prefix sums.
+
+    Args:
+        values (list): Series of numbers (None entries are skipped)
+        window (int): Number of preceding positions to include
+
+    Returns:
+        list: For each position, (count, mean, stdev) of the preceding window;
+            mean/stdev are None when the window holds no values
+    """
+    n = len(values)
+    count = [0] * (n + 1)
+    total = [0.0] * (n + 1)
+    squares = [0.0] * (n + 1)
+
+    for i, v in enumerate(values):
+        present = v is not None
+        count[i + 1] = count[i] + present
+        total[i + 1] = total[i] + (v if present else 0.0)
+        squares[i + 1] = squares[i] + (v * v if present else 0.0)
+
+    stats = []
+    for i in range(n):
+        lo = max(0, i - window)
+        k = count[i] - count[lo]
+        if k == 0:
+            stats.append((0, None, None))
+            continue
+        s = total[i] - total[lo]
+        mean = s / k
+        if k > 1:
+            variance = max((squares[i] - squares[lo] - s * mean) / (k - 1), 0.0)
+            stdev = math.sqrt(variance)
+        else:
+            stdev = 0.0
+        stats.append((k, mean, stdev))
+
+    return stats
+
+
+def prediction_interval(count, mean, stdev):
+    """
+    95% prediction interval for one new observation given a window's stats.
+
+    Args:
+        count (int): Number of observations in the window
+        mean (float): Window mean
+        stdev (float): Window sample standard deviation
+
+    Returns:
+        tuple: (lower, upper), or (None, None) with fewer than 2 observations
+    """
+    if count < 2 or mean is None:
+        return None, None
+    margin = t_critical(count - 1) * stdev * math.sqrt(1 + 1 / count)
+    return mean - margin, mean + margin
+
+
+def trend_slope(values):
+    """
+    Least-squares slope of a series against its position.
+
+    Args:
+        values (list): Series of numbers (None entries are skipped)
+
+    Returns:
+        float: Change per run, or None with fewer than 2 values
+    """
+    points = [(i, v) for i, v in enumerate(values) if v is not None]
+    k = len(points)
+    if k < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / k
+    mean_y = sum(y for _, y in points) / k
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return sxy / sxx if sxx else 0.0
+
+
+def _min_delta(metric):
+    return MIN_DELTA["pass_rate"] if metric == "pass_rate" else MIN_DELTA["scores"]
+
+
+def analyze_metrics(current, history, window=DEFAULT_WINDOW):
+    """
+    Compare each metric of the current entry with its rolling window.
+
+    Args:
+        current (dict): Current baseline entry
+        history (list): Past baseline entries, oldest first
+        window (int): Number of past baselines to compare against
+
+    Returns:
+        dict: Metric name -> analysis with keys:
+            - value (float): Current value
+            - window_mean (float): Mean over the window
+            - window_stdev (float): Sample standard deviation over the window
+            - interval (list): 95% prediction interval [lower, upper]
+            - trend (float): Slope per run over the window plus current run
+            - regression (bool): Value fell below the interval by more than the minimum delta
+    """
+    recent = history[-window:]
+    series = build_series(recent + [current])
+    analysis = {}
+
+    for metric, values in series.items():
+        value = values[-1]
+        if value is None:
+            continue
+
+        count, mean, stdev = rolling_statistics(values, window)[-1]
+        lower, upper = prediction_interval(count, mean, stdev)
+        regression = (
+            lower is not None
+            and value < lower
+            and mean - value > _min_delta(metric)
+        )
+
+        analysis[metric] = {
+            "value": value,
+            "window_mean": round(mean, 4) if mean is not None else None,
+            "window_stdev": round(stdev, 4) if stdev is not None else None,
+            "interval": [round(lower, 4), round(upper, 4)] if lower is not None else None,
+            "trend": round(trend_slope(values), 4) if count else None,
+            "regression": regression
+        }
+
+    return analysis
+
+
+def detect_flips(current, history, window=DEFAULT_WINDOW):
+    """
+    Find test cases whose pass/fail outcome changed.
+
+    Uses the 'test_outcomes' mapping (test_id -> passed) of baseline entries.
+
+    Args:
+        current (dict): Current baseline entry
+        history (list): Past baseline entries, oldest first
+        window (int): Number of past baselines to consider
+
+    Returns:
+        dict: Flip analysis with keys:
+            - pass_to_fail (list): Passed in the previous run, fail now
+            - fail_to_pass (list): Failed in the previous run, pass now
+            - new_failures (list): Passed in every run of the window, fail now
+            - flaky (list): Changed outcome more than once in the window
+    """
+    current_outcomes = current.get("test_outcomes") or {}
+    past = [e.get("test_outcomes") for e in history[-window:] if e.get("test_outcomes")]
+
+    result = {"pass_to_fail": [], "fail_to_pass": [], "new_failures": [], "flaky": []}
+    if not current_outcomes or not past:
+        return result
+
+    previous = past[-1]
+    for test_id, passed in sorted(current_outcomes.items()):
+        if test_id in previous:
+            if previous[test_id] and not passed:
+                result["pass_to_fail"].append(test_id)
+            elif not previous[test_id] and passed:
+                result["fail_to_pass"].append(test_id)
+
+        outcomes = [o[test_id] for o in past if test_id in o] + [passed]
+        if len(outcomes) > MIN_HISTORY and not passed and all(outcomes[:-1]):
+            result["new_failures"].append(test_id)
+
+        changes = sum(1 for a, b in zip(outcomes, outcomes[1:]) if a != b)
+        if changes > 1:
+            result["flaky"].append(test_id)
+
+    return result
+
+
+def analyze_regression(current, history, window=DEFAULT_WINDOW):
+    """
+    Run statistical regression detection for a new baseline entry.
+
+    Args:
+        current (dict): Current baseline entry
+        history (list): Past baseline entries, oldest first
+        window (int): Number of past baselines to compare against
+
+    Returns:
+        dict: Analysis with keys:
+            - has_regression (bool): A metric fell outside its interval or a
+              consistently passing test case now fails
+            - window (int): Number of past baselines actually used
+            - metrics (dict): Per-metric analysis from analyze_metrics()
+            - flips (dict): Per-test-case analysis from detect_flips()
+            - regressed_metrics (list): Names of regressed metrics
+    """
+    recent = history[-window:]
+    metrics = analyze_metrics(current, recent, window)
+    flips = detect_flips(current, recent, window)
+    regressed = sorted(name for name, m in metrics.items() if m["regression"])
+
+    return {
+        "has_regression": bool(regressed or flips["new_failures"]),
+        "window": len(recent),
+        "metrics": metrics,
+        "flips": flips,
+        "regressed_metrics": regressed
+    }
+
+
+def analyze_history(entries, window=DEFAULT_WINDOW):
+    """
+    Flag regressions at every point of a baseline history in one pass.
+
+    Each entry is compared with the `window` entries before it; rolling
+    statistics are computed once per metric over the whole history.
+
+    Args:
+        entries (list): Baseline entries, oldest first
+        window (int): Number of past baselines to compare against
+
+    Returns:
+        list: Per entry {timestamp, run_directory, regressed_metrics}
+    """
+    series = build_series(entries)
+    flagged = [[] for _ in entries]
+
+    for metric, values in series.items():
+        for i, (count, mean, stdev) in enumerate(rolling_statistics(values, window)):
+            value = values[i]
+            lower, _ = prediction_interval(count, mean, stdev)
+            if value is not None and lower is not None and value < lower and mean - value > _min_delta(metric):
+                flagged[i].append(metric)
+
+    return [
+        {
+            "timestamp": entry.get("timestamp"),
+            "run_directory": entry.get("run_directory"),
+            "regressed_metrics": sorted(flags)
+        }
+        for entry, flags in zip(entries, flagged)
+    ]
+
+
+def main():
+    """Main entry point when run as script."""
+    window = DEFAULT_WINDOW
+    if len(sys.argv) == 2:
+        try:
+            window = int(sys.argv[1])
+        except ValueError:
+            print("Usage: regression.py [window]", file=sys.stderr)
+            sys.exit(1)
+    elif len(sys.argv) > 2:
+        print("Usage: regression.py [window]", file=sys.stderr)
+        sys.exit(1)
+
+    entries = list(baseline_store.iter_entries())
+    print(json.dumps(analyze_history(entries, window), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,43 @@ Report generation module for Specimin evaluation framework.
 Aggregates test results and artifact scores into structured reports.
 """
 
+import os
 import sys
 import json
+import shutil
+import hashlib
+import argparse
+import heapq
+import textwrap
 from pathlib import Path
 from datetime import datetime
 
+import score_cache
+import instrumentation
+
+
+# Rubric dimensions averaged across test cases: report key -> rubric name
+AVERAGED_DIMENSIONS = {
+    "spec": {
+        "completeness": "Completeness",
+        "clarity": "Clarity",
+        "testability": "Testability"
+    }
+}
+
+# Result fields that may be moved out of report.json into sidecar files
+SIDECAR_FIELDS = ("stdout", "stderr")
+
+# Per-run index used for incremental report regeneration
+INDEX_FILE = ".report_index.json"
+INDEX_VERSION = 3
+
+# Reports whose per-test sections the index locates by byte offset
+REPORT_FILES = ("report.json", "report.md")
+
+# Number of slowest test cases listed in the statistics
+SLOWEST_TESTS = 5
+
 
 def load_test_results(run_dir):
     """
@@ -20,20 +52,152 @@ def load_test_results(run_dir):
     Returns:
         list: List of test result dicts
     """
+    return list(iter_test_results(run_dir))
+
+
+def iter_test_results(run_dir):
+    """
+    Yield test results from the run directory one at a time.
+
+    Args:
+        run_dir (str): Directory containing test case subdirectories
+
+    Yields:
+        dict: Test result dict, in test case directory order
+    """
     run_dir = Path(run_dir)
-    results = []
 
-    # Iterate through test case directories
-    for test_case_dir in run_dir.iterdir():
+    for test_case_dir in sorted(run_dir.iterdir()):
         if not test_case_dir.is_dir():
             continue
 
         results_file = test_case_dir / "results.json"
         if results_file.exists():
             with open(results_file, 'r') as f:
-                results.append(json.load(f))
+                content = f.read()
+            instrumentation.count("bytes_read", len(content))
+            yield json.loads(content)
+
+
+class RunningStatistics:
+    """Aggregate statistics folded in one test result at a time."""
+
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.score_sums = {
+            artifact: {dim: 0 for dim in dims}
+            for artifact, dims in AVERAGED_DIMENSIONS.items()
+        }
+        self.score_counts = {
+            artifact: {dim: 0 for dim in dims}
+            for artifact, dims in AVERAGED_DIMENSIONS.items()
+        }
+        self.failure_classes = {}
+        self.total_duration = 0.0
+        self.slowest = []
+
+    @staticmethod
+    def contribution(result):
+        """
+        Extract the part of a test result that feeds the statistics.
+
+        Args:
+            result (dict): Test result dict
+
+        Returns:
+            dict: {"test_id": str, "passed": bool, "error_type": str,
+                   "duration": float, "scores": {artifact: {dimension: score}}}
+        """
+        rubric_scores = result.get('rubric_scores', {})
+        scores = {}
+        for artifact, dims in AVERAGED_DIMENSIONS.items():
+            artifact_scores = rubric_scores.get(artifact, {})
+            for dim, rubric_name in dims.items():
+                score = artifact_scores.get(rubric_name, {}).get('score')
+                if score is not None:
+                    scores.setdefault(artifact, {})[dim] = score
+
+        passed = bool(result.get('test_passed', False))
+        error = result.get('test_error') or {}
+
+        return {
+            "test_id": result.get('test_id', 'unknown'),
+            "passed": passed,
+            "error_type": None if passed else error.get('error_type', 'unknown'),
+            "duration": sum(t.get('duration', 0.0) for t in result.get('tests', [])),
+            "scores": scores
+        }
 
-    return results
+    def add(self, result):
+        """
+        Fold a single test result into the running totals.
+
+        Args:
+            result (dict): Test result dict
+        """
+        self.add_contribution(self.contribution(result))
+
+    def add_contribution(self, contribution):
+        """
+        Fold a precomputed contribution (see contribution()) into the totals.
+
+        Args:
+            contribution (dict): Contribution of one test result
+        """
+        self.total += 1
+        if contribution["passed"]:
+            self.passed += 1
+        else:
+            error_type = contribution.get("error_type") or "unknown"
+            self.failure_classes[error_type] = self.failure_classes.get(error_type, 0) + 1
+
+        duration = contribution.get("duration", 0.0)
+        self.total_duration += duration
+        entry = (duration, contribution.get("test_id", "unknown"))
+        if len(self.slowest) < SLOWEST_TESTS:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+        for artifact, dims in contribution["scores"].items():
+            if artifact not in self.score_sums:
+                continue
+            for dim, score in dims.items():
+                if dim in self.score_sums[artifact]:
+                    self.score_sums[artifact][dim] += score
+                    self.score_counts[artifact][dim] += 1
+
+    def to_dict(self):
+        """
+        Build the statistics dict in the calculate_statistics() format.
+
+        Returns:
+            dict: Statistics including pass rate, average scores, etc.
+        """
+        pass_rate = (self.passed / self.total * 100) if self.total > 0 else 0
+
+        average_scores = {}
+        for artifact, dims in self.score_sums.items():
+            average_scores[artifact] = {}
+            for dim, total in dims.items():
+                count = self.score_counts[artifact][dim]
+                average_scores[artifact][dim] = total / count if count else None
+
+        return {
+            "total_tests": self.total,
+            "passed": self.passed,
+            "failed": self.total - self.passed,
+            "pass_rate": round(pass_rate, 2),
+            "average_scores": average_scores,
+            "failure_classes": dict(sorted(self.failure_classes.items())),
+            "test_duration_seconds": round(self.total_duration, 3),
+            "slowest_tests": [
+                {"test_id": test_id, "duration_seconds": round(duration, 3)}
+                for duration, test_id in sorted(self.slowest, reverse=True)
+                if duration > 0
+            ]
+        }
 
 
 def calculate_statistics(results):
@@ -41,38 +205,49 @@ def calculate_statistics(results):
     Calculate aggregate statistics from test results.
 
     Args:
-        results (list): List of test result dicts
+        results (iterable): Test result dicts (a list or a generator)
 
     Returns:
         dict: Statistics including pass rate, average scores, etc.
     """
-    total = len(results)
-    passed = sum(1 for r in results if r.get('test_passed', False))
-    failed = total - passed
-
-    pass_rate = (passed / total * 100) if total > 0 else 0
-
-    # Calculate average rubric scores
-    def avg_score(dimension):
-        scores = [r.get('rubric_scores', {}).get('spec', {}).get(dimension, {}).get('score')
-                  for r in results]
-        scores = [s for s in scores if s is not None]
-        return sum(scores) / len(scores) if scores else None
-
-    stats = {
-        "total_tests": total,
-        "passed": passed,
-        "failed": failed,
-        "pass_rate": round(pass_rate, 2),
-        "average_scores": {
-            "spec": {
-                "completeness": avg_score('Completeness'),
-                "clarity": avg_score('Clarity'),
-                "testability": avg_score('Testability')
-            }
-        }
-    }
+    stats = RunningStatistics()
+    for result in results:
+        stats.add(result)
+    return stats.to_dict()
+
 
+def add_score_cache_counters(stats, run_dir):
+    """
+    Add the run's judge score cache hit/miss counters to its statistics.
+
+    Args:
+        stats (dict): Statistics from calculate_statistics
+        run_dir (str): Run directory
+
+    Returns:
+        dict: `stats`, with 'score_cache' set if any scores were looked up
+    """
+    counters = score_cache.load_counters(run_dir)
+    if counters is not None:
+        stats["score_cache"] = counters
+    return stats
+
+
+def add_instrumentation_summary(stats, run_dir):
+    """
+    Add a summary of the run's recorded spans and counters to its statistics.
+
+    Args:
+        stats (dict): Statistics from calculate_statistics
+        run_dir (str): Run directory
+
+    Returns:
+        dict: `stats`, with 'instrumentation' set if a trace was recorded
+            (see instrumentation.summarize)
+    """
+    summary = instrumentation.summarize(instrumentation.load_events(run_dir))
+    if summary is not None:
+        stats["instrumentation"] = summary
     return stats
 
 
@@ -90,6 +265,9 @@ def generate_json_report(run_dir):
     results = load_test_results(run_dir)
     stats = calculate_statistics(results)
 
+    add_score_cache_counters(stats, run_dir)
+    add_instrumentation_summary(stats, run_dir)
+
     report = {
         "timestamp": datetime.now().isoformat(),
         "run_directory": str(run_dir),
@@ -100,15 +278,15 @@ def generate_json_report(run_dir):
     return report
 
 
-def generate_markdown_report(report):
+def format_summary_section(report):
     """
-    Generate formatted markdown report from report data.
+    Format the markdown header and summary for a report.
 
     Args:
-        report (dict): Report data from generate_json_report
+        report (dict): Report data with 'timestamp', 'run_directory' and 'statistics'
 
     Returns:
-        str: Formatted markdown report
+        str: Markdown up to and including the Test Results heading
     """
     stats = report['statistics']
 
@@ -128,6 +306,18 @@ def generate_markdown_report(report):
 
 """
 
+    if stats.get('score_cache'):
+        cache = stats['score_cache']
+        md += f"**Judge Score Cache:** {cache['hits']} hits, {cache['misses']} misses\n\n"
+
+    if stats.get('failure_classes'):
+        classes = ", ".join(f"{k}: {v}" for k, v in stats['failure_classes'].items())
+        md += f"**Failure Classes:** {classes}\n\n"
+
+    if stats.get('slowest_tests'):
+        slowest = ", ".join(f"{t['test_id']} ({t['duration_seconds']:.2f}s)" for t in stats['slowest_tests'])
+        md += f"**Test Time:** {stats['test_duration_seconds']:.2f}s total; slowest: {slowest}\n\n"
+
     # Add pass/fail indicator
     if stats['pass_rate'] >= 80:
         md += "**Status:** ✅ PASSING (≥80% threshold)\n\n"
@@ -136,36 +326,73 @@ def generate_markdown_report(report):
 
     md += "---\n\n## Test Results\n\n"
 
-    # List each test case
-    for result in report['test_results']:
-        test_id = result.get('test_id', 'unknown')
-        test_name = result.get('test_name', test_id)
-        passed = result.get('test_passed', False)
-        status = "✓ PASS" if passed else "✗ FAIL"
-
-        md += f"### {test_name} ({test_id})\n\n"
-        md += f"**Status:** {status}\n\n"
-
-        if not passed:
-            error = result.get('test_error', {})
-            md += f"**Error Type:** {error.get('error_type', 'unknown')}\n"
-            md += f"**Error:** {error.get('error_message', 'No details')}\n\n"
-
-        # Add rubric scores if available
-        rubrics = result.get('rubric_scores', {})
-        if rubrics:
-            md += "**Artifact Scores:**\n\n"
-            for artifact_type, scores in rubrics.items():
-                md += f"- **{artifact_type.capitalize()}:**\n"
-                for dimension, data in scores.items():
-                    score = data.get('score', 'N/A')
-                    md += f"  - {dimension}: {score}/5\n"
-            md += "\n"
-
-        md += "---\n\n"
+    return md
 
-    # Add average scores summary
-    md += "## Average Artifact Quality Scores\n\n"
+
+def format_test_section(result):
+    """
+    Format the markdown section for a single test case.
+
+    Args:
+        result (dict): Test result dict
+
+    Returns:
+        str: Markdown section for the test case
+    """
+    test_id = result.get('test_id', 'unknown')
+    test_name = result.get('test_name', test_id)
+    passed = result.get('test_passed', False)
+    status = "✓ PASS" if passed else "✗ FAIL"
+
+    md = f"### {test_name} ({test_id})\n\n"
+    md += f"**Status:** {status}\n\n"
+
+    if result.get('resumed_stages'):
+        md += f"**Resumed Stages:** {', '.join(result['resumed_stages'])}\n\n"
+
+    if not passed:
+        error = result.get('test_error') or {}
+        md += f"**Error Type:** {error.get('error_type', 'unknown')}\n"
+        md += f"**Error:** {error.get('error_message', 'No details')}\n\n"
+
+    # Add benchmark outcome if one ran
+    bench = result.get('benchmark')
+    if bench:
+        md += f"**Benchmark:** {bench.get('status', 'unknown')}"
+        if bench.get('scaling_exponent') is not None:
+            md += f" (time ~ n^{bench['scaling_exponent']})"
+        md += "\n"
+        if bench.get('message'):
+            md += f"**Benchmark Note:** {bench['message']}\n"
+        md += "\n"
+
+    # Add rubric scores if available
+    rubrics = result.get('rubric_scores', {})
+    if rubrics:
+        md += "**Artifact Scores:**\n\n"
+        for artifact_type, scores in rubrics.items():
+            md += f"- **{artifact_type.capitalize()}:**\n"
+            for dimension, data in scores.items():
+                score = data.get('score', 'N/A')
+                md += f"  - {dimension}: {score}/5\n"
+        md += "\n"
+
+    md += "---\n\n"
+
+    return md
+
+
+def format_average_scores_section(stats):
+    """
+    Format the average artifact quality scores section.
+
+    Args:
+        stats (dict): Statistics from calculate_statistics
+
+    Returns:
+        str: Markdown section with average scores
+    """
+    md = "## Average Artifact Quality Scores\n\n"
     avg_scores = stats['average_scores']
     for artifact_type, dimensions in avg_scores.items():
         md += f"### {artifact_type.capitalize()}\n\n"
@@ -177,6 +404,62 @@ def generate_markdown_report(report):
     return md
 
 
+def format_instrumentation_section(stats):
+    """
+    Format the section summarizing where the tooling spent its time.
+
+    Args:
+        stats (dict): Statistics with an optional 'instrumentation' summary
+
+    Returns:
+        str: Markdown section, or '' if nothing was recorded
+    """
+    summary = stats.get('instrumentation')
+    if not summary:
+        return ""
+
+    md = "## Instrumentation\n\n"
+    md += f"Recorded by {summary['processes']} process(es); Chrome trace in `{instrumentation.CHROME_TRACE_FILE}`.\n\n"
+
+    if summary['stages']:
+        stages = ", ".join(f"{stage}: {seconds:.2f}s" for stage, seconds in summary['stages'].items())
+        md += f"**Stage Time:** {stages}\n\n"
+
+    md += "| Span | Count | Total (s) | Max (s) |\n|------|------:|----------:|--------:|\n"
+    for name, span in summary['spans'].items():
+        md += f"| {name} | {span['count']} | {span['total_seconds']:.3f} | {span['max_seconds']:.3f} |\n"
+    md += "\n"
+
+    if summary['counters']:
+        counters = ", ".join(f"{name}: {value}" for name, value in summary['counters'].items())
+        md += f"**Counters:** {counters}\n\n"
+
+    return md
+
+
+def generate_markdown_report(report):
+    """
+    Generate formatted markdown report from report data.
+
+    Args:
+        report (dict): Report data from generate_json_report
+
+    Returns:
+        str: Formatted markdown report
+    """
+    md = format_summary_section(report)
+
+    # List each test case
+    for result in report['test_results']:
+        md += format_test_section(result)
+
+    # Add average scores summary
+    md += format_average_scores_section(report['statistics'])
+    md += format_instrumentation_section(report['statistics'])
+
+    return md
+
+
 def save_reports(run_dir, json_report, md_report):
     """
     Save JSON and markdown reports to run directory.
@@ -199,18 +482,395 @@ def save_reports(run_dir, json_report, md_report):
         f.write(md_report)
 
 
+def write_sidecars(run_dir, result, threshold):
+    """
+    Move large output fields of a result into sidecar files.
+
+    Fields longer than threshold characters are written to
+    outputs/{test_id}.{field}.txt in the run directory and replaced in the
+    result by a reference {"sidecar": <relative path>, "chars": <length>}.
+
+    Args:
+        run_dir (Path): Run directory
+        result (dict): Test result dict (modified in place)
+        threshold (int): Maximum inline field length
+
+    Returns:
+        dict: The result with large fields replaced by references
+    """
+    test_id = result.get('test_id', 'unknown')
+
+    for field in SIDECAR_FIELDS:
+        value = result.get(field)
+        if not isinstance(value, str) or len(value) <= threshold:
+            continue
+
+        outputs_dir = run_dir / "outputs"
+        outputs_dir.mkdir(exist_ok=True)
+        sidecar = outputs_dir / f"{test_id}.{field}.txt"
+        with open(sidecar, 'w') as f:
+            f.write(value)
+
+        result[field] = {
+            "sidecar": str(sidecar.relative_to(run_dir)),
+            "chars": len(value)
+        }
+
+    return result
+
+
+def format_json_fragment(result):
+    """
+    Serialize one test result as an element of report.json's test_results.
+
+    Args:
+        result (dict): Test result dict
+
+    Returns:
+        str: Indented JSON matching json.dump(report, indent=2) layout
+    """
+    return textwrap.indent(json.dumps(result, indent=2), "    ")
+
+
+def format_json_head(summary):
+    """
+    Serialize the opening of report.json up to the test_results array.
+
+    Args:
+        summary (dict): Report data with 'timestamp' and 'run_directory'
+
+    Returns:
+        str: JSON text ending with the opening bracket of test_results
+    """
+    return (
+        "{\n"
+        f'  "timestamp": {json.dumps(summary["timestamp"])},\n'
+        f'  "run_directory": {json.dumps(summary["run_directory"])},\n'
+        '  "test_results": ['
+    )
+
+
+def format_json_tail(statistics, empty=False):
+    """
+    Serialize the end of report.json after the last test result.
+
+    Args:
+        statistics (dict): Statistics from calculate_statistics
+        empty (bool): Whether test_results had no elements
+
+    Returns:
+        str: JSON text closing test_results and the report object
+    """
+    statistics_json = textwrap.indent(json.dumps(statistics, indent=2), "  ")
+    return (
+        ("],\n" if empty else "\n  ],\n")
+        + f'  "statistics": {statistics_json.lstrip()}\n'
+        + "}\n"
+    )
+
+
+def stream_reports(run_dir, sidecar_threshold=None):
+    """
+    Generate report.json and report.md while reading results one at a time.
+
+    Per-test sections are written as each results.json is read and folded
+    into running statistics, so memory use does not grow with the number of
+    test cases. Both reports are written to temporary files and moved into
+    place once complete.
+
+    Args:
+        run_dir (str): Directory containing test results
+        sidecar_threshold (int): If set, stdout/stderr longer than this many
+            characters are stored in sidecar files instead of report.json
+
+    Returns:
+        dict: Report summary (timestamp, run_directory, statistics)
+    """
+    with instrumentation.span("reporter.stream_reports", stage="report"):
+        summary = _stream_reports(Path(run_dir), sidecar_threshold)
+    instrumentation.export_chrome_trace(run_dir)
+    return summary
+
+
+def _stream_reports(run_dir, sidecar_threshold):
+    stats = RunningStatistics()
+
+    summary = {
+        "timestamp": datetime.now().isoformat(),
+        "run_directory": str(run_dir)
+    }
+
+    json_tmp = run_dir / "report.json.tmp"
+    md_body_tmp = run_dir / "report.md.body.tmp"
+    md_tmp = run_dir / "report.md.tmp"
+
+    try:
+        with open(json_tmp, 'w') as json_out, open(md_body_tmp, 'w') as md_body:
+            json_out.write(format_json_head(summary))
+
+            first = True
+            for result in iter_test_results(run_dir):
+                stats.add(result)
+                md_body.write(format_test_section(result))
+
+                if sidecar_threshold is not None:
+                    write_sidecars(run_dir, result, sidecar_threshold)
+
+                json_out.write("\n" if first else ",\n")
+                json_out.write(format_json_fragment(result))
+                first = False
+
+            summary["statistics"] = add_score_cache_counters(stats.to_dict(), run_dir)
+            add_instrumentation_summary(summary["statistics"], run_dir)
+            json_out.write(format_json_tail(summary["statistics"], empty=first))
+
+        with open(md_tmp, 'w') as md_out:
+            md_out.write(format_summary_section(summary))
+            with open(md_body_tmp, 'r') as md_body:
+                shutil.copyfileobj(md_body, md_out)
+            md_out.write(format_average_scores_section(summary["statistics"]))
+            md_out.write(format_instrumentation_section(summary["statistics"]))
+
+        os.replace(json_tmp, run_dir / "report.json")
+        os.replace(md_tmp, run_dir / "report.md")
+        report_bytes = sum((run_dir / name).stat().st_size for name in ("report.json", "report.md"))
+        instrumentation.count("bytes_written", report_bytes)
+    finally:
+        for tmp in (json_tmp, md_body_tmp, md_tmp):
+            if tmp.exists():
+                tmp.unlink()
+
+    return summary
+
+
+def _file_signature(path):
+    """[mtime_ns, size] of a file, or None if it does not exist."""
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_report_index(run_dir, sidecar_threshold=None):
+    """
+    Load the incremental report index for a run directory.
+
+    Entries point into the current report.json and report.md by byte offset,
+    so the index is discarded if either report changed since it was written,
+    as well as if it was written by a different index version or with a
+    different sidecar threshold.
+
+    Args:
+        run_dir (Path): Run directory
+        sidecar_threshold (int): Sidecar threshold of the current regeneration
+
+    Returns:
+        dict: Index with 'version', 'sidecar_threshold', 'reports' and 'entries'
+    """
+    empty = {"version": INDEX_VERSION, "sidecar_threshold": sidecar_threshold, "reports": {}, "entries": {}}
+    run_dir = Path(run_dir)
+    index_file = run_dir / INDEX_FILE
+
+    if not index_file.exists():
+        return empty
+
+    try:
+        with open(index_file, 'r') as f:
+            index = json.load(f)
+    except json.JSONDecodeError:
+        return empty
+
+    if index.get("version") != INDEX_VERSION or index.get("sidecar_threshold") != sidecar_threshold:
+        return empty
+
+    reports = index.get("reports") or {}
+    if any(reports.get(name) != _file_signature(run_dir / name) for name in REPORT_FILES):
+        return empty
+
+    return index
+
+
+def build_index_entry(run_dir, result, signature, digest, sidecar_threshold=None):
+    """
+    Compute everything the reports need from one test result.
+
+    Args:
+        run_dir (Path): Run directory
+        result (dict): Test result dict
+        signature (list): [mtime_ns, size] of results.json
+        digest (str): SHA-256 of results.json content
+        sidecar_threshold (int): Sidecar threshold, or None
+
+    Returns:
+        tuple: (entry, fragments) where entry holds the signature, digest and
+            statistics contribution, and fragments maps each report file to
+            the encoded section rendered for this result
+    """
+    contribution = RunningStatistics.contribution(result)
+    md_section = format_test_section(result)
+    if sidecar_threshold is not None:
+        write_sidecars(run_dir, result, sidecar_threshold)
+
+    entry = {
+        "signature": signature,
+        "sha256": digest,
+        "contribution": contribution
+    }
+    fragments = {
+        "report.json": format_json_fragment(result).encode("utf-8"),
+        "report.md": md_section.encode("utf-8")
+    }
+    return entry, fragments
+
+
+def update_reports(run_dir, sidecar_threshold=None):
+    """
+    Regenerate reports, re-reading only test cases whose results changed.
+
+    Each test case's results.json is checked by mtime and size against the
+    index in the run directory; only changed files are read (and, if only
+    touched, hashed) again. Statistics are then refolded from the cached
+    contributions, and the sections of unchanged test cases are copied from
+    the previous reports at the byte offsets recorded in the index.
+
+    Args:
+        run_dir (str): Directory containing test results
+        sidecar_threshold (int): If set, stdout/stderr longer than this many
+            characters are stored in sidecar files instead of report.json
+
+    Returns:
+        dict: Report summary (timestamp, run_directory, statistics) plus
+            'reread' (int), the number of results.json files read
+    """
+    with instrumentation.span("reporter.update_reports", stage="report"):
+        summary = _update_reports(Path(run_dir), sidecar_threshold)
+    instrumentation.export_chrome_trace(run_dir)
+    return summary
+
+
+def _update_reports(run_dir, sidecar_threshold):
+    index = load_report_index(run_dir, sidecar_threshold)
+    entries = index["entries"]
+    fresh = {}
+    reread = 0
+
+    present = set()
+    for test_case_dir in sorted(run_dir.iterdir()):
+        results_file = test_case_dir / "results.json"
+        if not test_case_dir.is_dir() or not results_file.exists():
+            continue
+
+        name = test_case_dir.name
+        present.add(name)
+        st = results_file.stat()
+        signature = [st.st_mtime_ns, st.st_size]
+
+        entry = entries.get(name)
+        if entry and entry["signature"] == signature:
+            continue
+
+        content = results_file.read_bytes()
+        instrumentation.count("bytes_read", len(content))
+        digest = hashlib.sha256(content).hexdigest()
+        reread += 1
+
+        if entry and entry["sha256"] == digest:
+            entry["signature"] = signature
+            continue
+
+        entries[name], fresh[name] = build_index_entry(
+            run_dir, json.loads(content), signature, digest, sidecar_threshold
+        )
+
+    for name in set(entries) - present:
+        del entries[name]
+
+    stats = RunningStatistics()
+    for name in sorted(entries):
+        stats.add_contribution(entries[name]["contribution"])
+
+    summary = {
+        "timestamp": datetime.now().isoformat(),
+        "run_directory": str(run_dir),
+        "statistics": add_score_cache_counters(stats.to_dict(), run_dir)
+    }
+    add_instrumentation_summary(summary["statistics"], run_dir)
+
+    statistics = summary["statistics"]
+    head = {
+        "report.json": format_json_head(summary),
+        "report.md": format_summary_section(summary)
+    }
+    tail = {
+        "report.json": format_json_tail(statistics, empty=not entries),
+        "report.md": format_average_scores_section(statistics) + format_instrumentation_section(statistics)
+    }
+
+    index_tmp = run_dir / f"{INDEX_FILE}.tmp"
+    temps = [run_dir / f"{name}.tmp" for name in REPORT_FILES] + [index_tmp]
+
+    try:
+        for report_name in REPORT_FILES:
+            report_file = run_dir / report_name
+            previous = open(report_file, 'rb') if report_file.exists() else None
+            try:
+                with open(run_dir / f"{report_name}.tmp", 'wb') as out:
+                    out.write(head[report_name].encode("utf-8"))
+                    for i, name in enumerate(sorted(entries)):
+                        if report_name == "report.json":
+                            out.write(b"\n" if i == 0 else b",\n")
+                        if name in fresh:
+                            fragment = fresh[name][report_name]
+                        else:
+                            offset, length = entries[name][report_name]
+                            previous.seek(offset)
+                            fragment = previous.read(length)
+                        entries[name][report_name] = [out.tell(), len(fragment)]
+                        out.write(fragment)
+                    out.write(tail[report_name].encode("utf-8"))
+            finally:
+                if previous is not None:
+                    previous.close()
+
+        for report_name in REPORT_FILES:
+            os.replace(run_dir / f"{report_name}.tmp", run_dir / report_name)
+        index["reports"] = {name: _file_signature(run_dir / name) for name in REPORT_FILES}
+        report_bytes = sum(signature[1] for signature in index["reports"].values())
+        instrumentation.count("bytes_written", report_bytes)
+
+        with open(index_tmp, 'w') as f:
+            json.dump(index, f)
+        os.replace(index_tmp, run_dir / INDEX_FILE)
+    finally:
+        for tmp in temps:
+            if tmp.exists():
+                tmp.unlink()
+
+    summary["reread"] = reread
+    return summary
+
+
 def main():
     """Main entry point when run as script."""
-    if len(sys.argv) != 2:
-        print("Usage: reporter.py <run_directory>", file=sys.stderr)
-        sys.exit(1)
-
-    run_dir = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        description="Aggregate test results into report.json and report.md."
+    )
+    parser.add_argument("run_directory", help="Run directory containing test case subdirectories")
+    parser.add_argument("--sidecar-threshold", type=int, default=None, metavar="CHARS",
+                        help="Store stdout/stderr longer than CHARS in outputs/ sidecar files")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-read test cases whose results.json changed since the last run")
+    args = parser.parse_args()
+
+    run_dir = args.run_directory
+    instrumentation.enable(run_dir)
 
     try:
-        json_report = generate_json_report(run_dir)
-        md_report = generate_markdown_report(json_report)
-        save_reports(run_dir, json_report, md_report)
+        if args.incremental:
+            update_reports(run_dir, sidecar_threshold=args.sidecar_threshold)
+        else:
+            stream_reports(run_dir, sidecar_threshold=args.sidecar_threshold)
 
         print(f"Reports generated:")
         print(f"  - {run_dir}/report.json")
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Content-addressed result cache for Specimin evaluation framework.
+Stores test_runner results keyed by a hash of code.py, test.py and the
+Python/pytest versions, so unchanged test cases are not re-executed.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import platform
+from pathlib import Path
+from functools import lru_cache
+
+
+# Default on-disk location and size bound of the cache
+CACHE_DIR = Path(__file__).parent / ".cache" / "results"
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+# Bump when the way test cases are executed changes their results
+HARNESS_VERSION = 2
+
+# Timings of the run that produced a result; a cache hit did not take them
+TIMING_FIELDS = ("wall_seconds", "timeout_seconds")
+
+# Results that depend on the host rather than the code are never cached
+UNCACHEABLE_ERRORS = {
+    "timeout", "execution_error", "cpu_limit", "memory_limit", "process_limit"
+}
+
+
+@lru_cache(maxsize=None)
+def get_runtime_fingerprint():
+    """
+    Describe the interpreter and pytest version that produce test results.
+
+    Returns:
+        str: Fingerprint such as 'CPython-3.11.7/pytest-8.3.2/harness-2'
+    """
+    try:
+        from importlib.metadata import version
+        pytest_version = version("pytest")
+    except Exception:
+        pytest_version = "unknown"
+
+    return (f"{platform.python_implementation()}-{platform.python_version()}"
+            f"/pytest-{pytest_version}/harness-{HARNESS_VERSION}")
+
+
+def cache_key(test_dir):
+    """
+    Compute the cache key for a test case directory.
+
+    Args:
+        test_dir (str): Directory containing code.py and test.py
+
+    Returns:
+        str: Hex digest, or None if either file is missing
+    """
+    test_dir = Path(test_dir)
+    digest = hashlib.sha256()
+
+    for name in ("code.py", "test.py"):
+        path = test_dir / name
+        if not path.exists():
+            return None
+        data = path.read_bytes()
+        # Length prefix keeps (code, test) boundaries unambiguous
+        digest.update(f"{name}:{len(data)}:".encode())
+        digest.update(data)
+
+    digest.update(get_runtime_fingerprint().encode())
+    return digest.hexdigest()
+
+
+def get_cached_result(test_dir, cache_dir=None):
+    """
+    Look up the stored result for a test case.
+
+    A hit refreshes the entry's mtime, which is what eviction uses as the
+    least-recently-used order.
+
+    Args:
+        test_dir (str): Directory containing code.py and test.py
+        cache_dir (str): Cache location (defaults to CACHE_DIR)
+
+    Returns:
+        dict: Result dict in run_test() shape, or None on a miss
+    """
+    key = cache_key(test_dir)
+    if key is None:
+        return None
+
+    entry = Path(cache_dir or CACHE_DIR) / f"{key}.json"
+    try:
+        with open(entry, 'r') as f:
+            result = json.load(f)
+        os.utime(entry)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    # Identical code may live under a different test id
+    result["test_id"] = Path(test_dir).name
+    # Entries from before timings were left out; keep them out of duration history
+    for field in TIMING_FIELDS:
+        result.pop(field, None)
+    return result
+
+
+def store_result(test_dir, result, cache_dir=None, max_bytes=MAX_CACHE_BYTES):
+    """
+    Store a test result and evict old entries if the cache is over budget.
+
+    Args:
+        test_dir (str): Directory containing code.py and test.py
+        result (dict): Result dict from run_test()
+        cache_dir (str): Cache location (defaults to CACHE_DIR)
+        max_bytes (int): Maximum total size of the cache
+    """
+    # Sandboxed results depend on the limits they ran under
+    if result.get("error_type") in UNCACHEABLE_ERRORS or "resource_usage" in result:
+        return
+
+    key = cache_key(test_dir)
+    if key is None:
+        return
+
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    entry = cache_dir / f"{key}.json"
+    temp_file = cache_dir / f"{key}.{os.getpid()}.tmp"
+    with open(temp_file, 'w') as f:
+        json.dump({k: v for k, v in result.items() if k not in TIMING_FIELDS}, f)
+    os.replace(temp_file, entry)
+
+    evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir=None, max_bytes=MAX_CACHE_BYTES):
+    """
+    Delete least-recently-used entries until the cache fits in max_bytes.
+
+    Args:
+        cache_dir (str): Cache location (defaults to CACHE_DIR)
+        max_bytes (int): Maximum total size of the cache
+
+    Returns:
+        int: Number of entries removed
+    """
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    if not cache_dir.exists():
+        return 0
+
+    entries = []
+    total = 0
+    for entry in cache_dir.glob("*.json"):
+        try:
+            st = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, entry))
+        total += st.st_size
+
+    removed = 0
+    entries.sort()
+    for _, size, entry in entries:
+        if total <= max_bytes:
+            break
+        try:
+            entry.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+
+    return removed
+
+
+def clear_cache(cache_dir=None):
+    """
+    Remove every entry from the cache.
+
+    Args:
+        cache_dir (str): Cache location (defaults to CACHE_DIR)
+
+    Returns:
+        int: Number of entries removed
+    """
+    return evict(cache_dir, max_bytes=-1)
+
+
+def main():
+    """Main entry point when run as script."""
+    if len(sys.argv) != 2 or sys.argv[1] not in ("clear", "stats"):
+        print("Usage: result_cache.py <clear|stats>", file=sys.stderr)
+        sys.exit(1)
+
+    if sys.argv[1] == "clear":
+        print(f"Removed {clear_cache()} cached results")
+    else:
+        entries = list(CACHE_DIR.glob("*.json")) if CACHE_DIR.exists() else []
+        print(json.dumps({
+            "cache_dir": str(CACHE_DIR),
+            "entries": len(entries),
+            "bytes": sum(e.stat().st_size for e in entries),
+            "max_bytes": MAX_CACHE_BYTES,
+            "runtime": get_runtime_fingerprint()
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Resource-limited execution for Specimin evaluation framework.
+Runs generated code under POSIX rlimits (CPU time, address space, process
+count), reports which limit was hit and measures CPU time and peak RSS.
+"""
+
+import os
+import sys
+import signal
+import tempfile
+import threading
+import subprocess
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None
+
+
+# Default per-test limits; None disables a limit
+DEFAULT_LIMITS = {
+    "cpu_seconds": 20,
+    "memory_bytes": 1024 * 1024 * 1024,
+    # RLIMIT_NPROC counts every process of the user, not just this test's,
+    # and is not enforced for root
+    "max_processes": 512
+}
+
+# Output markers for limits that surface as Python exceptions
+MEMORY_MARKERS = ("MemoryError", "Cannot allocate memory")
+PROCESS_MARKERS = ("BlockingIOError", "Resource temporarily unavailable")
+
+
+def is_supported():
+    """
+    Report whether rlimit sandboxing is available on this platform.
+
+    Returns:
+        bool: True if the resource module and fork-based preexec are usable
+    """
+    return resource is not None and hasattr(os, "wait4")
+
+
+def _apply_limits(limits):
+    """Build a preexec_fn that applies the limits in the child process."""
+    def preexec():
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+        if limits.get("cpu_seconds") is not None:
+            soft = int(limits["cpu_seconds"])
+            # SIGXCPU at the soft limit, SIGKILL one second later
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, soft + 1))
+        if limits.get("memory_bytes") is not None:
+            resource.setrlimit(resource.RLIMIT_AS, (limits["memory_bytes"], limits["memory_bytes"]))
+        if limits.get("max_processes") is not None and hasattr(resource, "RLIMIT_NPROC"):
+            resource.setrlimit(resource.RLIMIT_NPROC, (limits["max_processes"], limits["max_processes"]))
+    return preexec
+
+
+def _max_rss_bytes(rusage):
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return rusage.ru_maxrss if sys.platform == "darwin" else rusage.ru_maxrss * 1024
+
+
+def classify_limit(returncode, stdout, stderr, timed_out=False):
+    """
+    Determine which resource limit, if any, ended a sandboxed run.
+
+    Args:
+        returncode (int): Exit code (negative for a terminating signal)
+        stdout (str): Captured standard output
+        stderr (str): Captured standard error
+        timed_out (bool): Whether the wall-clock timeout fired
+
+    Returns:
+        str: 'timeout', 'cpu_limit', 'memory_limit', 'process_limit' or None
+    """
+    if timed_out:
+        return "timeout"
+    if returncode in (-signal.SIGXCPU, -signal.SIGKILL):
+        return "cpu_limit"
+
+    output = stdout + stderr
+    if any(marker in output for marker in MEMORY_MARKERS):
+        return "memory_limit"
+    if any(marker in output for marker in PROCESS_MARKERS):
+        return "process_limit"
+    return None
+
+
+def run_sandboxed(cmd, cwd, limits=None, timeout=30, env=None):
+    """
+    Run a command under resource limits and measure its resource usage.
+
+    The child runs in its own session so a wall-clock timeout kills every
+    process it started. Output goes to temporary files rather than pipes,
+    which lets the child be reaped with os.wait4() to collect its rusage.
+
+    Args:
+        cmd (list): Command and arguments
+        cwd (str): Working directory
+        limits (dict): Limits as in DEFAULT_LIMITS (defaults to DEFAULT_LIMITS)
+        timeout (int): Wall-clock limit in seconds
+        env (dict): Environment of the child (defaults to the current one)
+
+    Returns:
+        dict: Run outcome with keys:
+            - returncode (int): Exit code (negative for a terminating signal)
+            - stdout (str): Captured standard output
+            - stderr (str): Captured standard error
+            - limit_hit (str): See classify_limit(), or None
+            - resource_usage (dict): cpu_seconds and max_rss_bytes of the child
+    """
+    if not is_supported():
+        raise RuntimeError("Sandboxed execution requires a POSIX platform")
+
+    limits = dict(DEFAULT_LIMITS if limits is None else limits)
+
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            env=env,
+            stdout=out,
+            stderr=err,
+            preexec_fn=_apply_limits(limits),
+            start_new_session=True
+        )
+
+        waited = {}
+
+        def reap():
+            _, status, rusage = os.wait4(proc.pid, 0)
+            waited["status"] = status
+            waited["rusage"] = rusage
+
+        reaper = threading.Thread(target=reap, daemon=True)
+        reaper.start()
+        reaper.join(timeout)
+
+        timed_out = reaper.is_alive()
+
+        # Kill the whole session, including anything the test left running
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        reaper.join()
+
+        # Tell Popen the child is already reaped
+        status = waited["status"]
+        proc.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+
+        out.seek(0)
+        err.seek(0)
+        stdout = out.read().decode("utf-8", errors="replace")
+        stderr = err.read().decode("utf-8", errors="replace")
+
+    rusage = waited["rusage"]
+    return {
+        "returncode": proc.returncode,
+        "stdout": stdout,
+        "stderr": stderr,
+        "limit_hit": classify_limit(proc.returncode, stdout, stderr, timed_out),
+        "resource_usage": {
+            "cpu_seconds": round(rusage.ru_utime + rusage.ru_stime, 3),
+            "max_rss_bytes": _max_rss_bytes(rusage)
+        }
+    }
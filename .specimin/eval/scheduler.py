@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Duration-aware scheduling for Specimin evaluation framework.
+Uses per-test-case wall times recorded in the baseline history to run the
+slowest test cases first and to derive per-test timeouts from their p95.
+"""
+
+import sys
+import json
+import math
+from pathlib import Path
+
+import baseline_store
+
+
+# Past baselines the timing history is taken from
+HISTORY_WINDOW = 20
+
+# Timeout for test cases without enough history (test_runner.TEST_TIMEOUT)
+DEFAULT_TIMEOUT = 30
+
+# Adaptive timeout: TIMEOUT_MULTIPLIER x historical p95, clamped to the bounds
+TIMEOUT_MULTIPLIER = 3.0
+MIN_TIMEOUT = 5
+MAX_TIMEOUT = 120
+
+# Samples needed before a test case gets an adaptive timeout
+MIN_SAMPLES = 3
+
+
+def load_timing_history(window=HISTORY_WINDOW, store_dir=None):
+    """
+    Collect recorded wall times per test case from recent baselines.
+
+    Args:
+        window (int): Number of recent baselines to read
+        store_dir (str): Baseline store directory (defaults to the eval directory)
+
+    Returns:
+        dict: Test id -> list of wall times in seconds, oldest first
+    """
+    history = {}
+    for entry in baseline_store.recent_entries(window, store_dir):
+        for test_id, seconds in (entry.get("test_wall_seconds") or {}).items():
+            if seconds is not None:
+                history.setdefault(test_id, []).append(seconds)
+    return history
+
+
+def percentile(values, q):
+    """
+    Linearly interpolated percentile.
+
+    Args:
+        values (list): Numbers (at least one)
+        q (float): Percentile in [0, 100]
+
+    Returns:
+        float: The q-th percentile of values
+    """
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lo = math.floor(rank)
+    hi = math.ceil(rank)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+
+def adaptive_timeout(samples, default=DEFAULT_TIMEOUT):
+    """
+    Derive a test case's timeout from its wall time history.
+
+    Args:
+        samples (list): Past wall times in seconds
+        default (int): Timeout with fewer than MIN_SAMPLES samples
+
+    Returns:
+        int: TIMEOUT_MULTIPLIER x p95 clamped to [MIN_TIMEOUT, MAX_TIMEOUT],
+            or `default` without enough history
+    """
+    if len(samples) < MIN_SAMPLES:
+        return default
+    timeout = math.ceil(TIMEOUT_MULTIPLIER * percentile(samples, 95))
+    return max(MIN_TIMEOUT, min(MAX_TIMEOUT, timeout))
+
+
+def plan_schedule(test_ids, history, default_timeout=DEFAULT_TIMEOUT):
+    """
+    Order test cases longest-first and assign each a timeout.
+
+    Test cases without history go first, since they may be slow and
+    starting them early keeps them off the tail of the run.
+
+    Args:
+        test_ids (list): Test case identifiers
+        history (dict): From load_timing_history()
+        default_timeout (int): Timeout for test cases without enough history
+
+    Returns:
+        list: (test_id, expected_seconds or None, timeout) in run order
+    """
+    plan = []
+    for test_id in test_ids:
+        samples = history.get(test_id, [])
+        expected = percentile(samples, 50) if samples else None
+        plan.append((test_id, expected, adaptive_timeout(samples, default_timeout)))
+
+    plan.sort(key=lambda p: (p[1] is not None, -(p[1] or 0.0), p[0]))
+    return plan
+
+
+def main():
+    """Main entry point when run as script."""
+    if len(sys.argv) > 2:
+        print("Usage: scheduler.py [run_directory]", file=sys.stderr)
+        sys.exit(1)
+
+    history = load_timing_history()
+    if len(sys.argv) == 2:
+        test_ids = sorted(d.name for d in Path(sys.argv[1]).iterdir() if (d / "test.py").exists())
+    else:
+        test_ids = sorted(history)
+
+    print(json.dumps([
+        {"test_id": test_id, "expected_seconds": expected, "timeout": timeout}
+        for test_id, expected, timeout in plan_schedule(test_ids, history)
+    ], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,61 @@ Artifact scoring helper for Specimin evaluation framework.
 Generates prompts for LLM-as-judge evaluation of specs, plans, and implementations.
 """
 
+import io
+import re
 import sys
 import json
+import hashlib
+import argparse
 from pathlib import Path
+from datetime import datetime
+from functools import lru_cache
 
+import score_cache
+import instrumentation
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+ARTIFACT_TYPES = ('spec', 'plan', 'implementation')
+
+# Per-run record of the artifact+rubric hash each artifact was last scored for
+PROMPT_STATE_FILE = ".prompt_hashes.json"
+
+# Rubrics score every dimension from 1 to DEFAULT_MAX_SCORE
+DEFAULT_MAX_SCORE = 5
+
+# scores.json fields computed from the dimension scores, never parsed as dimensions
+DERIVED_FIELDS = {"total", "max_possible", "percentage"}
+
+# Percentages in scores.json are rounded to this many decimals (e.g. 93.75)
+PERCENT_DECIMALS = 2
+
+# Dimension lines in a rubric's response template: '**Clarity:** [1-5]'
+_RUBRIC_DIMENSION_RE = re.compile(r"^\*\*(.+?):\*\*\s*\[\d+-\d+\]", re.MULTILINE)
+
+# One judge output line; the named group that matched tells what the line holds
+_SCORE_LINE_RE = re.compile(r"""
+    ^\s*(?:[-*]\s+)?
+    (?:
+        # '## Spec', 'Plan scores:' or '"implementation_scores": {'
+        (?:\#+\s*)?"?(?P<section>spec|plan|implementation)(?:[_\s]scores)?"?\s*:?\s*(?P<section_end>\{?)\s*$
+        # '*Justification:* text'
+      | \*Justification:\*\s*(?P<justification>.+?)\s*$
+        # '**Notes:** text', 'notes: text' or '"notes": "text",'
+      | (?:\*\*notes:\*\*|"notes"\s*:|notes:)\s*"?(?P<notes>.+?)"?\s*,?\s*$
+        # '**Clarity:** 4', '**Clarity:** [4]' or '**Clarity:** 4/5 - text'
+      | \*\*(?P<bold>[^*]+?):\*\*\s*\[?(?P<bold_score>\d+)\]?
+        # 'clarity: 4' or '"clarity": 4,'
+      | "?(?P<key>[A-Za-z][\w ]*?)"?\s*:\s*(?P<key_score>\d+)(?:\s*/\s*\d+)?\s*,?\s*$
+    )
+""", re.VERBOSE | re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
 def load_rubric(artifact_type):
     """
     Load the rubric template for the given artifact type.
@@ -29,6 +79,41 @@ def load_rubric(artifact_type):
         return f.read()
 
 
+@lru_cache(maxsize=None)
+def rubric_dimensions():
+    """
+    Dimension names of every rubric, as used for scores.json keys.
+
+    Returns:
+        frozenset: snake_case dimension names, e.g. 'detail_level'
+    """
+    names = set()
+    for artifact_type in ARTIFACT_TYPES:
+        try:
+            rubric = load_rubric(artifact_type)
+        except FileNotFoundError:
+            continue
+        names.update(_snake_case(name) for name in _RUBRIC_DIMENSION_RE.findall(rubric))
+    return frozenset(names)
+
+
+@lru_cache(maxsize=None)
+def load_template(artifact_type):
+    """
+    Load a rubric pre-split around its content placeholder.
+
+    Args:
+        artifact_type (str): One of 'spec', 'plan', 'implementation'
+
+    Returns:
+        tuple: (parts, rubric_hash) where parts joined with the artifact
+            content give the prompt, and rubric_hash is the rubric's sha256
+    """
+    rubric = load_rubric(artifact_type)
+    parts = tuple(rubric.split(f"{{{artifact_type.upper()}_CONTENT}}"))
+    return parts, hashlib.sha256(rubric.encode()).hexdigest()
+
+
 def load_artifact(test_dir, artifact_type):
     """
     Load the artifact file from the test directory.
@@ -47,7 +132,9 @@ def load_artifact(test_dir, artifact_type):
         raise FileNotFoundError(f"Artifact file not found: {artifact_file}")
 
     with open(artifact_file, 'r') as f:
-        return f.read()
+        content = f.read()
+    instrumentation.count("bytes_read", len(content))
+    return content
 
 
 def generate_evaluation_prompt(test_dir, artifact_type):
@@ -61,16 +148,343 @@ def generate_evaluation_prompt(test_dir, artifact_type):
     Returns:
         str: Complete evaluation prompt
     """
-    rubric = load_rubric(artifact_type)
+    with instrumentation.span("score_artifacts.prompt", test_id=Path(test_dir).name,
+                              stage=f"score_{artifact_type}"):
+        parts, _ = load_template(artifact_type)
+        artifact = load_artifact(test_dir, artifact_type)
+
+        # Replace placeholder with actual content
+        return artifact.join(parts)
+
+
+def prompt_hash(artifact, rubric_hash):
+    """
+    Hash an artifact together with the rubric it is scored against.
+
+    Args:
+        artifact (str): Artifact content
+        rubric_hash (str): sha256 of the rubric, from load_template()
+
+    Returns:
+        str: Hex digest identifying the prompt
+    """
+    digest = hashlib.sha256(rubric_hash.encode())
+    digest.update(artifact.encode())
+    return digest.hexdigest()
+
+
+def load_prompt_state(run_dir):
+    """
+    Load the hashes of artifacts whose scores were stored or delivered.
+
+    Args:
+        run_dir (str): Run directory
+
+    Returns:
+        dict: '{test_id}/{artifact_type}' -> prompt hash
+    """
+    try:
+        with open(Path(run_dir) / PROMPT_STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def update_prompt_state(run_dir, updates):
+    """
+    Record artifacts as scored in a run directory's prompt state.
+
+    The state file is locked while it is updated (where fcntl is
+    available), so concurrent --store calls for the same run do not lose
+    entries.
+
+    Args:
+        run_dir (str): Run directory
+        updates (dict): '{test_id}/{artifact_type}' -> prompt hash
+    """
+    if not updates:
+        return
+
+    with open(Path(run_dir) / PROMPT_STATE_FILE, 'a+') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        try:
+            state = json.loads(f.read() or "{}")
+        except json.JSONDecodeError:
+            state = {}
+
+        state.update(updates)
+
+        f.seek(0)
+        f.truncate()
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def lookup_scores(test_dir, artifact_type, model=None):
+    """
+    Return cached judge scores for an artifact and count the lookup.
+
+    The hit or miss is recorded as the artifact's latest lookup in the run
+    directory that contains `test_dir`.
+
+    Args:
+        test_dir (str): Directory containing the artifact
+        artifact_type (str): One of 'spec', 'plan', 'implementation'
+        model (str): Judge model identifier (see score_cache.judge_model)
+
+    Returns:
+        dict: Scores in parse_scores() format, or None on a miss
+    """
+    key = score_cache.score_key(
+        load_artifact(test_dir, artifact_type), load_rubric(artifact_type), score_cache.judge_model(model)
+    )
+    scores = score_cache.get_cached_scores(key)
+
+    hit = scores is not None
+    instrumentation.count("score_cache_hits" if hit else "score_cache_misses")
+    test_dir = Path(test_dir).resolve()
+    score_cache.record_lookups(test_dir.parent, {f"{test_dir.name}/{artifact_type}": hit})
+    return scores
+
+
+def score_response(test_dir, artifact_type, evaluation_response, model=None, max_score=DEFAULT_MAX_SCORE):
+    """
+    Parse a judge response for an artifact and cache the scores.
+
+    Args:
+        test_dir (str): Directory containing the artifact
+        artifact_type (str): One of 'spec', 'plan', 'implementation'
+        evaluation_response (str): Raw LLM response
+        model (str): Judge model identifier (see score_cache.judge_model)
+        max_score (int): Highest valid score
+
+    Returns:
+        dict: Parsed scores and justifications
+
+    Raises:
+        ValueError: If a score is outside 1..max_score
+    """
+    with instrumentation.span("score_artifacts.parse", test_id=Path(test_dir).name,
+                              stage=f"score_{artifact_type}"):
+        scores = parse_scores(evaluation_response, max_score)
     artifact = load_artifact(test_dir, artifact_type)
+    key = score_cache.score_key(artifact, load_rubric(artifact_type), score_cache.judge_model(model))
+    score_cache.store_scores(key, scores)
+
+    # Only now is the artifact scored; batch runs skip it from here on
+    if scores:
+        test_dir = Path(test_dir).resolve()
+        update_prompt_state(test_dir.parent, {
+            f"{test_dir.name}/{artifact_type}": prompt_hash(artifact, load_template(artifact_type)[1])
+        })
+    return scores
+
+
+def iter_prompts(run_dir, artifact_types=ARTIFACT_TYPES, state=None, model=None, skipped=None):
+    """
+    Generate evaluation prompts for every artifact in a run directory.
+
+    Each rubric is loaded once. Artifacts whose hash matches `state` were
+    already scored and are skipped. With a judge `model`, artifacts that
+    already have cached scores for that model yield the scores instead of
+    a prompt, and `state` is updated with their hash. Emitting a prompt
+    does not update `state`: the artifact counts as scored only once its
+    scores are stored (see score_response()).
 
-    # Replace placeholder with actual content
-    prompt = rubric.replace(f"{{{artifact_type.upper()}_CONTENT}}", artifact)
+    Args:
+        run_dir (str): Run directory containing one subdirectory per test case
+        artifact_types (tuple): Artifact types to generate prompts for
+        state (dict): Hashes of scored artifacts (None emits every prompt)
+        model (str): Judge model identifier (None bypasses the score cache)
+        skipped (list): If given, the keys of skipped artifacts are appended
+
+    Yields:
+        dict: {test_id, artifact_type, hash, cached, prompt} on a miss, or
+            {test_id, artifact_type, hash, cached, scores} on a cache hit
+    """
+    templates = {t: load_template(t) for t in artifact_types}
+
+    for test_dir in sorted(Path(run_dir).iterdir()):
+        if not test_dir.is_dir() or test_dir.name.startswith('.'):
+            continue
+
+        for artifact_type in artifact_types:
+            artifact_file = test_dir / f"{artifact_type}.md"
+            if not artifact_file.exists():
+                continue
+
+            parts, rubric_hash = templates[artifact_type]
+            artifact = artifact_file.read_text()
+            instrumentation.count("bytes_read", len(artifact))
+            digest = prompt_hash(artifact, rubric_hash)
+            key = f"{test_dir.name}/{artifact_type}"
+
+            if state is not None and state.get(key) == digest:
+                if skipped is not None:
+                    skipped.append(key)
+                continue
+
+            record = {
+                "test_id": test_dir.name,
+                "artifact_type": artifact_type,
+                "hash": digest,
+                "cached": False
+            }
+
+            if model is not None:
+                scores = score_cache.get_cached_scores(
+                    score_cache.score_key(artifact, load_rubric(artifact_type), model)
+                )
+                if scores is not None:
+                    if state is not None:
+                        state[key] = digest
+                    record["cached"] = True
+                    record["scores"] = scores
+                    yield record
+                    continue
+
+            record["prompt"] = artifact.join(parts)
+            yield record
+
+
+def generate_batch_prompts(run_dir, out, artifact_types=ARTIFACT_TYPES, force=False, model=None):
+    """
+    Write prompts for a whole run directory as a JSON-lines stream.
 
-    return prompt
+    Prompts are skipped when the artifact was scored (its scores stored
+    with --store, or delivered from the cache by an earlier batch) and
+    neither it nor its rubric changed since, unless `force` is set. An
+    emitted prompt whose scores were never stored is emitted again. With a judge
+    `model`, cached scores are emitted in place of prompts and the hits
+    and misses are added to the run's score cache counters.
 
+    Args:
+        run_dir (str): Run directory containing one subdirectory per test case
+        out: Text stream to write one JSON object per line to
+        artifact_types (tuple): Artifact types to generate prompts for
+        force (bool): Emit every prompt regardless of previous runs
+        model (str): Judge model identifier (None bypasses the score cache)
 
-def parse_scores(evaluation_response):
+    Returns:
+        dict: {"emitted": int, "cached": int, "skipped": int}
+    """
+    previous = {} if force else load_prompt_state(run_dir)
+    state = dict(previous)
+    skipped = []
+    lookups = {}
+
+    with instrumentation.span("score_artifacts.batch", stage="score") as batch:
+        for record in iter_prompts(run_dir, artifact_types, state, model, skipped):
+            line = json.dumps(record) + "\n"
+            out.write(line)
+            batch.count("bytes_written", len(line))
+            lookups[f"{record['test_id']}/{record['artifact_type']}"] = record["cached"]
+
+        out.flush()
+        update_prompt_state(run_dir, {k: v for k, v in state.items() if previous.get(k) != v})
+        cached = sum(1 for hit in lookups.values() if hit)
+        emitted = len(lookups) - cached
+        if model is not None:
+            batch.count("score_cache_hits", cached)
+            batch.count("score_cache_misses", emitted)
+            score_cache.record_lookups(run_dir, lookups)
+
+    return {"emitted": emitted, "cached": cached, "skipped": len(skipped)}
+
+
+def _score_lines(source):
+    """Iterate over the lines of a string, stream or iterable of lines."""
+    if isinstance(source, str):
+        return io.StringIO(source)
+    return source
+
+
+def _snake_case(name):
+    return re.sub(r"\W+", "_", name.strip().lower()).strip("_")
+
+
+def scan_scores(source, artifact_type=None, max_score=DEFAULT_MAX_SCORE):
+    """
+    Extract scores from judge output in a single pass over its lines.
+
+    Understands the rubric response format ('**Clarity:** 4' followed by
+    '*Justification:* ...') and the scores.json format ('"clarity": 4,',
+    '"notes": "..."'), including '"spec_scores": {' or '## Spec' section
+    markers that switch the artifact subsequent scores belong to.
+
+    Only rubric dimensions (see rubric_dimensions()) and keys inside a
+    '"{artifact}_scores": {' block count as scores; other labels with a
+    number, such as 'Step 2: 10' or '**Overall Score:** 12/15', are
+    skipped. Derived fields (total, percentage) are not scores; a block's
+    max_possible is kept so existing scores.json files keep their basis.
+
+    Args:
+        source: Response text, a text stream, or an iterable of lines
+        artifact_type (str): Artifact scores belong to before any section marker
+        max_score (int): Highest valid score; scores outside 1..max_score are rejected
+
+    Returns:
+        dict: Artifact type (or None) -> {"scores": {dimension: {"score", "justification"}},
+              "notes": str or None, "max_possible": int or None}
+
+    Raises:
+        ValueError: If a dimension's score is outside 1..max_score
+    """
+    sections = {}
+    section = None
+    dimension = None
+    in_block = False
+    known = rubric_dimensions()
+
+    for line_number, line in enumerate(_score_lines(source), 1):
+        if in_block and line.lstrip().startswith("}"):
+            in_block = False
+            continue
+        # Every recognized line has a colon except bare '## Spec' headings
+        if ":" not in line and "#" not in line:
+            continue
+        match = _SCORE_LINE_RE.match(line)
+        if not match:
+            continue
+
+        kind = match.lastgroup
+        if kind == "section_end":
+            artifact = match.group("section").lower()
+            section = sections.setdefault(artifact, {"scores": {}, "notes": None, "max_possible": None})
+            dimension = None
+            in_block = match.group(kind) == "{"
+            continue
+
+        if section is None:
+            section = sections.setdefault(artifact_type, {"scores": {}, "notes": None, "max_possible": None})
+
+        if kind == "bold_score" or kind == "key_score":
+            name = (match.group("bold") or match.group("key")).strip()
+            key = _snake_case(name)
+            if key in DERIVED_FIELDS:
+                if key == "max_possible" and in_block:
+                    section["max_possible"] = int(match.group(kind))
+                continue
+            if key not in known and not in_block:
+                continue
+            score = int(match.group(kind))
+            if not 1 <= score <= max_score:
+                raise ValueError(
+                    f"Score for {name} out of range on line {line_number}: {score} (expected 1-{max_score})"
+                )
+            dimension = name
+            section["scores"][dimension] = {"score": score, "justification": ""}
+        elif kind == "justification":
+            if dimension is not None:
+                section["scores"][dimension]["justification"] = match.group(kind)
+        elif kind == "notes":
+            section["notes"] = match.group(kind)
+
+    return sections
+
+
+def parse_scores(evaluation_response, max_score=DEFAULT_MAX_SCORE):
     """
     Parse scores from LLM evaluation response.
 
@@ -79,53 +493,171 @@ def parse_scores(evaluation_response):
     *Justification:* [text]
 
     Args:
-        evaluation_response (str): Raw LLM response
+        evaluation_response: Raw LLM response, a text stream, or an iterable of lines
+        max_score (int): Highest valid score
 
     Returns:
         dict: Parsed scores and justifications
-    """
-    import re
 
+    Raises:
+        ValueError: If a score is outside 1..max_score
+    """
     scores = {}
-    lines = evaluation_response.split('\n')
-
-    current_dimension = None
-    for line in lines:
-        # Match score line: **Dimension:** [score]
-        score_match = re.match(r'\*\*(.+?):\*\*\s*(\d+)', line)
-        if score_match:
-            dimension = score_match.group(1).strip()
-            score = int(score_match.group(2))
-            current_dimension = dimension
-            scores[dimension] = {"score": score, "justification": ""}
-
-        # Match justification line
-        just_match = re.match(r'\*Justification:\*\s*(.+)', line)
-        if just_match and current_dimension:
-            scores[current_dimension]["justification"] = just_match.group(1).strip()
-
+    for section in scan_scores(evaluation_response, max_score=max_score).values():
+        scores.update(section["scores"])
     return scores
 
 
-def main():
-    """Main entry point when run as script."""
-    if len(sys.argv) != 3:
-        print("Usage: score_artifacts.py <test_directory> <artifact_type>", file=sys.stderr)
-        print("  artifact_type: spec, plan, or implementation", file=sys.stderr)
-        sys.exit(1)
+def build_score_section(section, max_score=DEFAULT_MAX_SCORE):
+    """
+    Convert one artifact's scanned scores to its scores.json section.
 
-    test_dir = sys.argv[1]
-    artifact_type = sys.argv[2]
+    Args:
+        section (dict): Section from scan_scores()
+        max_score (int): Highest valid score
 
-    if artifact_type not in ['spec', 'plan', 'implementation']:
-        print(f"Invalid artifact type: {artifact_type}", file=sys.stderr)
+    Returns:
+        dict: Dimension scores (snake_case keys) plus total, max_possible
+            (as stated in the section, else max_score per dimension),
+            percentage and notes (joined justifications if no notes were given)
+    """
+    result = {_snake_case(name): data["score"] for name, data in section["scores"].items()}
+    total = sum(result.values())
+    max_possible = section.get("max_possible") or len(result) * max_score
+    justifications = [d["justification"] for d in section["scores"].values() if d["justification"]]
+
+    result.update({
+        "total": total,
+        "max_possible": max_possible,
+        "percentage": round(100.0 * total / max_possible, PERCENT_DECIMALS) if max_possible else 0.0,
+        "notes": section["notes"] or " ".join(justifications) or None
+    })
+    return result
+
+
+def parse_score_report(source, test_id=None, artifact_type=None, max_score=DEFAULT_MAX_SCORE):
+    """
+    Parse judge output straight into the nested scores.json structure.
+
+    Args:
+        source: Response text, a text stream, or an iterable of lines
+        test_id (str): Test case identifier recorded as test_case_id
+        artifact_type (str): Artifact scores belong to before any section marker
+        max_score (int): Highest valid score
+
+    Returns:
+        dict: {test_case_id, timestamp, '{artifact}_scores': {...}, overall}
+
+    Raises:
+        ValueError: If a score is outside 1..max_score, or scores appear
+            outside any section and no artifact_type was given
+    """
+    sections = scan_scores(source, artifact_type, max_score)
+    if sections.get(None, {}).get("scores"):
+        raise ValueError("Scores found outside an artifact section; pass the artifact type")
+
+    report = {
+        "test_case_id": test_id,
+        "timestamp": datetime.now().isoformat(timespec="seconds")
+    }
+    total = max_possible = 0
+    for artifact in ARTIFACT_TYPES:
+        if artifact not in sections or not sections[artifact]["scores"]:
+            continue
+        scores = build_score_section(sections[artifact], max_score)
+        report[f"{artifact}_scores"] = scores
+        total += scores["total"]
+        max_possible += scores["max_possible"]
+
+    report["overall"] = {
+        "total": total,
+        "max_possible": max_possible,
+        "percentage": round(100.0 * total / max_possible, PERCENT_DECIMALS) if max_possible else 0.0
+    }
+    return report
+
+
+def main():
+    """Main entry point when run as script."""
+    parser = argparse.ArgumentParser(
+        description="Generate LLM-as-judge prompts and cache the resulting scores."
+    )
+    parser.add_argument("paths", nargs="+",
+                        help="Test directory and artifact type, or with --batch a run directory "
+                             "followed by optional artifact types")
+    parser.add_argument("--batch", action="store_true",
+                        help="Emit prompts for every artifact in a run directory as JSON lines")
+    parser.add_argument("--force", action="store_true",
+                        help="With --batch, emit prompts even for artifacts already scored")
+    parser.add_argument("--model", default=None,
+                        help=f"Judge model identifier for the score cache (default: ${score_cache.MODEL_ENV_VAR})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="With --batch, always emit prompts instead of cached scores")
+    parser.add_argument("--lookup", action="store_true",
+                        help="Print cached scores for the artifact as JSON; exit 1 on a miss")
+    parser.add_argument("--store", action="store_true",
+                        help="Read a judge response from stdin, print its scores as JSON and cache them")
+    parser.add_argument("--parse", action="store_true",
+                        help="Read a judge response from stdin and print it in scores.json format")
+    parser.add_argument("--max-score", type=int, default=DEFAULT_MAX_SCORE,
+                        help=f"Highest valid score when parsing (default: {DEFAULT_MAX_SCORE})")
+    args = parser.parse_args()
+
+    if args.batch:
+        run_dir = Path(args.paths[0])
+        artifact_types = tuple(args.paths[1:]) or ARTIFACT_TYPES
+    elif len(args.paths) == 2:
+        test_dir, artifact_type = args.paths
+        artifact_types = (artifact_type,)
+    else:
+        parser.error("expected <test_directory> <artifact_type>")
+
+    invalid = [t for t in artifact_types if t not in ARTIFACT_TYPES]
+    if invalid:
+        print(f"Invalid artifact type: {invalid[0]}", file=sys.stderr)
         print("  Must be one of: spec, plan, implementation", file=sys.stderr)
         sys.exit(1)
 
+    model = score_cache.judge_model(args.model)
+
+    if args.batch:
+        if not run_dir.is_dir():
+            print(f"Error: Run directory not found: {run_dir}", file=sys.stderr)
+            sys.exit(1)
+        instrumentation.enable(run_dir)
+
+        try:
+            counts = generate_batch_prompts(
+                run_dir, sys.stdout, artifact_types, args.force, None if args.no_cache else model
+            )
+        except FileNotFoundError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(
+            f"Emitted {counts['emitted']} prompts and {counts['cached']} cached scores, "
+            f"skipped {counts['skipped']} unchanged",
+            file=sys.stderr
+        )
+        return
+
+    instrumentation.enable(Path(test_dir).resolve().parent)
+
     try:
-        prompt = generate_evaluation_prompt(test_dir, artifact_type)
-        print(prompt)
-    except FileNotFoundError as e:
+        if args.lookup:
+            scores = lookup_scores(test_dir, artifact_type, model)
+            if scores is None:
+                print(f"No cached scores for {artifact_type} in {test_dir}", file=sys.stderr)
+                sys.exit(1)
+            print(json.dumps(scores, indent=2))
+        elif args.store:
+            response = sys.stdin.read()
+            print(json.dumps(score_response(test_dir, artifact_type, response, model, args.max_score), indent=2))
+        elif args.parse:
+            report = parse_score_report(sys.stdin, Path(test_dir).name, artifact_type, args.max_score)
+            print(json.dumps(report, indent=2))
+        else:
+            print(generate_evaluation_prompt(test_dir, artifact_type))
+    except (FileNotFoundError, ValueError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Judge score cache for Specimin evaluation framework.
+Stores parsed LLM-as-judge scores keyed by a hash of the artifact, the
+rubric text and the judge model, so unchanged artifacts are not re-scored.
+"""
+
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+
+import result_cache
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+# Default on-disk location and size bound of the cache
+CACHE_DIR = Path(__file__).parent / ".cache" / "scores"
+MAX_CACHE_BYTES = 16 * 1024 * 1024
+
+# Judge model used when none is given; set to the model that scores artifacts
+MODEL_ENV_VAR = "SPECIMIN_JUDGE_MODEL"
+DEFAULT_MODEL = "default"
+
+# Per-run outcome of the latest lookup of each artifact, counted in report.json
+COUNTERS_FILE = ".score_cache.json"
+
+
+def judge_model(model=None):
+    """
+    Resolve the judge model identifier.
+
+    Args:
+        model (str): Explicit model identifier
+
+    Returns:
+        str: `model`, else $SPECIMIN_JUDGE_MODEL, else 'default'
+    """
+    return model or os.environ.get(MODEL_ENV_VAR) or DEFAULT_MODEL
+
+
+def score_key(artifact, rubric, model):
+    """
+    Compute the cache key for scoring an artifact.
+
+    Args:
+        artifact (str): Artifact content
+        rubric (str): Rubric template text
+        model (str): Judge model identifier
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    for name, text in (("model", model), ("rubric", rubric), ("artifact", artifact)):
+        data = text.encode()
+        # Length prefix keeps field boundaries unambiguous
+        digest.update(f"{name}:{len(data)}:".encode())
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def get_cached_scores(key, cache_dir=None):
+    """
+    Look up stored scores, refreshing the entry's LRU position on a hit.
+
+    Args:
+        key (str): Key from score_key()
+        cache_dir (str): Cache location (defaults to CACHE_DIR)
+
+    Returns:
+        dict: Scores in parse_scores() format, or None on a miss
+    """
+    entry = Path(cache_dir or CACHE_DIR) / f"{key}.json"
+    try:
+        with open(entry, 'r') as f:
+            scores = json.load(f)
+        os.utime(entry)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return scores
+
+
+def store_scores(key, scores, cache_dir=None, max_bytes=MAX_CACHE_BYTES):
+    """
+    Store parsed scores and evict old entries if the cache is over budget.
+
+    Empty scores (an unparseable judge response) are not stored.
+
+    Args:
+        key (str): Key from score_key()
+        scores (dict): Scores in parse_scores() format
+        cache_dir (str): Cache location (defaults to CACHE_DIR)
+        max_bytes (int): Maximum total size of the cache
+    """
+    if not scores:
+        return
+
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    entry = cache_dir / f"{key}.json"
+    temp_file = cache_dir / f"{key}.{os.getpid()}.tmp"
+    with open(temp_file, 'w') as f:
+        json.dump(scores, f)
+    os.replace(temp_file, entry)
+
+    result_cache.evict(cache_dir, max_bytes)
+
+
+def record_lookups(run_dir, outcomes):
+    """
+    Record the outcome of score cache lookups in a run directory.
+
+    Each artifact keeps only the outcome of its latest lookup, so scoring a
+    run again (another batch, or repeated --lookup calls) replaces earlier
+    outcomes instead of adding to the counters. The counters file is locked
+    while it is updated (where fcntl is available), so concurrent scoring
+    processes for the same run do not lose outcomes.
+
+    Args:
+        run_dir (str): Run directory
+        outcomes (dict): '{test_id}/{artifact_type}' -> True on a hit,
+            False on a miss
+    """
+    if not outcomes:
+        return
+
+    with open(Path(run_dir) / COUNTERS_FILE, 'a+') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        try:
+            lookups = json.loads(f.read() or "{}").get("lookups", {})
+        except (json.JSONDecodeError, AttributeError):
+            lookups = {}
+
+        lookups.update(outcomes)
+
+        f.seek(0)
+        f.truncate()
+        json.dump({"lookups": lookups}, f, sort_keys=True)
+
+
+def load_lookups(run_dir):
+    """
+    Load the latest lookup outcome of every artifact in a run directory.
+
+    Args:
+        run_dir (str): Run directory
+
+    Returns:
+        dict: '{test_id}/{artifact_type}' -> True on a hit, False on a miss
+    """
+    try:
+        with open(Path(run_dir) / COUNTERS_FILE, 'r') as f:
+            lookups = json.load(f).get("lookups")
+    except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+        return {}
+    return lookups if isinstance(lookups, dict) else {}
+
+
+def load_counters(run_dir):
+    """
+    Count the hits and misses of a run directory's latest lookups.
+
+    Args:
+        run_dir (str): Run directory
+
+    Returns:
+        dict: {"hits": int, "misses": int}, or None if nothing was looked up
+    """
+    lookups = load_lookups(run_dir)
+    if not lookups:
+        return None
+    hits = sum(1 for hit in lookups.values() if hit)
+    return {"hits": hits, "misses": len(lookups) - hits}
+
+
+def main():
+    """Main entry point when run as script."""
+    if len(sys.argv) != 2 or sys.argv[1] not in ("clear", "stats"):
+        print("Usage: score_cache.py <clear|stats>", file=sys.stderr)
+        sys.exit(1)
+
+    if sys.argv[1] == "clear":
+        print(f"Removed {result_cache.clear_cache(CACHE_DIR)} cached scores")
+    else:
+        entries = list(CACHE_DIR.glob("*.json")) if CACHE_DIR.exists() else []
+        print(json.dumps({
+            "cache_dir": str(CACHE_DIR),
+            "entries": len(entries),
+            "bytes": sum(e.stat().st_size for e in entries),
+            "max_bytes": MAX_CACHE_BYTES,
+            "model": judge_model()
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Test-case sharding for Specimin evaluation framework.
+Splits the test-case manifest deterministically across machines and merges
+the partial runs they produce into a single report and baseline entry.
+
+Duration sharding depends on each machine's local baseline history, so the
+full assignment is recorded in every partial run and can be exported once
+with 'plan --export' and shared; merge refuses partial runs whose
+assignments differ.
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import statistics
+from pathlib import Path
+from datetime import datetime
+
+import reporter
+import manifest
+import score_cache
+import baseline_store
+import update_baseline
+
+
+# Written into every partial run directory
+SHARD_FILE = "shard.json"
+
+# Written into a merged run directory
+MERGE_FILE = "shards.json"
+
+# Past baselines whose durations feed duration-balanced sharding
+DURATION_WINDOW = 5
+
+STRATEGIES = ("hash", "duration")
+
+
+def parse_shard(text):
+    """
+    Parse a shard specification.
+
+    Args:
+        text (str): 'i/N' with 1 <= i <= N
+
+    Returns:
+        tuple: (index, count)
+
+    Raises:
+        ValueError: If the specification is malformed or out of range
+    """
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{text}', expected i/N") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{text}', expected 1 <= i <= N")
+    return index, count
+
+
+def hash_shard(test_id, count):
+    """
+    Assign a test case to a shard by a stable hash of its id.
+
+    Args:
+        test_id (str): Test case identifier
+        count (int): Number of shards
+
+    Returns:
+        int: Shard index, 1-based
+    """
+    digest = hashlib.sha256(test_id.encode()).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def historical_durations(window=DURATION_WINDOW, store_dir=None):
+    """
+    Average per-test-case durations over the most recent baselines.
+
+    Uses the recorded wall time of each test case where available, and the
+    sum of its pytest test durations for older baselines.
+
+    Args:
+        window (int): Number of recent baselines to average over
+        store_dir (str): Baseline store directory (defaults to the eval directory)
+
+    Returns:
+        dict: Test id -> mean duration in seconds
+    """
+    samples = {}
+    for entry in baseline_store.recent_entries(window, store_dir):
+        durations = dict(entry.get("test_durations") or {})
+        durations.update(entry.get("test_wall_seconds") or {})
+        for test_id, seconds in durations.items():
+            samples.setdefault(test_id, []).append(seconds)
+    return {test_id: statistics.mean(values) for test_id, values in samples.items()}
+
+
+def assign_shards(test_ids, count, strategy="hash", durations=None):
+    """
+    Assign every test case to a shard.
+
+    The 'hash' strategy is stable as test cases are added or removed. The
+    'duration' strategy places test cases longest-first onto the shard with
+    the least total duration so far; test cases without history count as
+    the median known duration. Both are deterministic for the same inputs.
+
+    Args:
+        test_ids (list): Test case identifiers
+        count (int): Number of shards
+        strategy (str): 'hash' or 'duration'
+        durations (dict): Test id -> seconds, for the 'duration' strategy
+
+    Returns:
+        dict: Test id -> shard index (1-based)
+    """
+    if strategy == "hash" or not durations:
+        return {test_id: hash_shard(test_id, count) for test_id in test_ids}
+
+    default = statistics.median(durations.values())
+    ordered = sorted(test_ids, key=lambda t: (-durations.get(t, default), t))
+
+    loads = [0.0] * count
+    assignment = {}
+    for test_id in ordered:
+        shard = min(range(count), key=lambda i: (loads[i], i))
+        loads[shard] += durations.get(test_id, default)
+        assignment[test_id] = shard + 1
+    return assignment
+
+
+def assignment_digest(assignment):
+    """
+    Fingerprint a shard assignment.
+
+    Args:
+        assignment (dict): Test id -> shard index
+
+    Returns:
+        str: SHA-256 hex digest, independent of key order
+    """
+    canonical = json.dumps(sorted(assignment.items()), separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def select_shard(test_cases, index, assignment):
+    """
+    Pick the test cases belonging to one shard.
+
+    Args:
+        test_cases (list): Test case dicts from test_cases.json
+        index (int): Shard index, 1-based
+        assignment (dict): Test id -> shard index, from assign_shards()
+            or load_assignment()
+
+    Returns:
+        list: Test cases of the shard, in manifest order
+
+    Raises:
+        ValueError: If a test case has no shard in the assignment
+    """
+    unassigned = [tc["id"] for tc in test_cases if tc["id"] not in assignment]
+    if unassigned:
+        raise ValueError(f"Test cases missing from the shard assignment: {', '.join(unassigned)}")
+    return [tc for tc in test_cases if assignment[tc["id"]] == index]
+
+
+def write_assignment(path, count, strategy, assignment):
+    """
+    Export a shard assignment for other machines to use.
+
+    Args:
+        path (str): Output file
+        count (int): Number of shards
+        strategy (str): Strategy used to compute the assignment
+        assignment (dict): Test id -> shard index
+    """
+    path = Path(path)
+    temp_file = path.with_name(f".{path.name}.tmp")
+    with open(temp_file, 'w') as f:
+        json.dump({
+            "count": count,
+            "strategy": strategy,
+            "digest": assignment_digest(assignment),
+            "assignment": dict(sorted(assignment.items()))
+        }, f, indent=2)
+    os.replace(temp_file, path)
+
+
+def load_assignment(path, count):
+    """
+    Read a shard assignment written by write_assignment().
+
+    Args:
+        path (str): Assignment file
+        count (int): Expected number of shards
+
+    Returns:
+        tuple: (strategy, assignment)
+
+    Raises:
+        ValueError: If the file is malformed or was made for another shard count
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        strategy, assignment = data["strategy"], data["assignment"]
+    except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Could not read shard assignment {path}: {e}") from None
+    if data.get("count") != count:
+        raise ValueError(f"Shard assignment {path} is for {data.get('count')} shards, not {count}")
+    if any(not isinstance(i, int) or not 1 <= i <= count for i in assignment.values()):
+        raise ValueError(f"Shard assignment {path} has shard indexes outside 1..{count}")
+    return strategy, assignment
+
+
+def write_shard_manifest(run_dir, index, count, strategy, assignment):
+    """
+    Describe a partial run so that merge_runs() can validate it.
+
+    The whole assignment is recorded, not just this shard's test cases, so
+    that merge can tell whether all partial runs used the same split.
+
+    Args:
+        run_dir (str): Partial run directory
+        index (int): Shard index, 1-based
+        count (int): Number of shards
+        strategy (str): Strategy used to assign test cases
+        assignment (dict): Test id -> shard index for every test case
+    """
+    with open(Path(run_dir) / SHARD_FILE, 'w') as f:
+        json.dump({
+            "index": index,
+            "count": count,
+            "strategy": strategy,
+            "test_ids": sorted(t for t, i in assignment.items() if i == index),
+            "assignment_digest": assignment_digest(assignment),
+            "assignment": dict(sorted(assignment.items())),
+            "created": datetime.now().isoformat()
+        }, f, indent=2)
+
+
+def load_shard_manifest(run_dir):
+    """
+    Read a partial run's shard manifest.
+
+    Args:
+        run_dir (str): Partial run directory
+
+    Returns:
+        dict: Manifest from write_shard_manifest(), or None if absent
+    """
+    try:
+        with open(Path(run_dir) / SHARD_FILE, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def merge_runs(partial_dirs, output_dir, allow_missing=False):
+    """
+    Combine partial runs into one run directory and regenerate its reports.
+
+    Test case directories are copied into output_dir, and score cache
+    lookups are combined. Every partial must carry a shard manifest with the
+    same assignment. Overlapping test cases, results for test cases outside
+    the assignment and assigned test cases without results are rejected
+    before anything is copied.
+
+    Args:
+        partial_dirs (list): Partial run directories
+        output_dir (str): Merged run directory (created if needed; must be empty)
+        allow_missing (bool): Merge even if some shards or test cases are absent
+
+    Returns:
+        dict: Report summary from reporter.stream_reports()
+
+    Raises:
+        ValueError: If the partial runs do not form a consistent sharding,
+            or output_dir already has content
+    """
+    manifests = []
+    for partial in partial_dirs:
+        manifest = load_shard_manifest(partial)
+        if manifest is None:
+            raise ValueError(f"Not a partial run (no {SHARD_FILE}): {partial}")
+        manifests.append(manifest)
+
+    counts = {m["count"] for m in manifests}
+    if len(counts) != 1:
+        raise ValueError(f"Partial runs come from different shardings: {sorted(counts)} shards")
+    count = counts.pop()
+
+    for partial, manifest in zip(partial_dirs, manifests):
+        if "assignment" not in manifest:
+            raise ValueError(f"Partial run {partial} does not record its shard assignment; re-run it")
+    digests = {assignment_digest(m["assignment"]) for m in manifests}
+    if len(digests) != 1:
+        strategies = sorted({m["strategy"] for m in manifests})
+        raise ValueError(
+            f"Partial runs assigned test cases differently (strategies: {', '.join(strategies)}); "
+            f"share one assignment with 'sharding.py plan --export'"
+        )
+    assignment = manifests[0]["assignment"]
+
+    indexes = [m["index"] for m in manifests]
+    if len(set(indexes)) != len(indexes):
+        raise ValueError(f"Duplicate shards: {sorted(indexes)}")
+    missing = sorted(set(range(1, count + 1)) - set(indexes))
+    if missing and not allow_missing:
+        raise ValueError(f"Missing shards {missing} of {count}")
+
+    seen = {}
+    for partial in partial_dirs:
+        partial = Path(partial)
+        for test_dir in sorted(partial.iterdir()):
+            if not (test_dir / "results.json").exists():
+                continue
+            if test_dir.name in seen:
+                raise ValueError(f"Test case {test_dir.name} is in both {seen[test_dir.name]} and {partial}")
+            seen[test_dir.name] = partial
+
+    unexpected = sorted(set(seen) - set(assignment))
+    if unexpected:
+        raise ValueError(f"Test cases not in the shard assignment: {', '.join(unexpected)}")
+    missing_ids = sorted(set(assignment) - set(seen))
+    if missing_ids and not allow_missing:
+        raise ValueError(f"No results for {len(missing_ids)} assigned test cases: {', '.join(missing_ids)}")
+
+    # Merging into an earlier merge or run would mix in its results
+    output_dir = Path(output_dir)
+    if output_dir.exists() and any(output_dir.iterdir()):
+        raise ValueError(f"Output directory is not empty: {output_dir}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for test_id, partial in sorted(seen.items()):
+        shutil.copytree(partial / test_id, output_dir / test_id)
+
+    for partial in partial_dirs:
+        score_cache.record_lookups(output_dir, score_cache.load_lookups(partial))
+
+    with open(output_dir / MERGE_FILE, 'w') as f:
+        json.dump({
+            "count": count,
+            "strategy": manifests[0]["strategy"],
+            "assignment_digest": digests.pop(),
+            "merged": sorted(indexes),
+            "missing": missing,
+            "missing_test_ids": missing_ids,
+            "sources": [str(Path(p).resolve()) for p in partial_dirs],
+            "merged_at": datetime.now().isoformat()
+        }, f, indent=2)
+
+    return reporter.stream_reports(output_dir)
+
+
+def main():
+    """Main entry point when run as script."""
+    parser = argparse.ArgumentParser(
+        description="Shard test cases across machines and merge the partial runs."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan = commands.add_parser("plan", help="Print the test cases of a shard")
+    plan.add_argument("shard", help="Shard as i/N")
+    plan.add_argument("--strategy", choices=STRATEGIES, default="hash",
+                      help="Assign by stable hash (default) or balance by historical duration")
+    plan.add_argument("--export", default=None, metavar="FILE",
+                      help="Also write the assignment of all shards to FILE (for orchestrator.py --shard-assignment)")
+
+    merge = commands.add_parser("merge", help="Merge partial runs into one report")
+    merge.add_argument("output_dir", help="Merged run directory")
+    merge.add_argument("partial_dirs", nargs="+", help="Partial run directories, one per shard")
+    merge.add_argument("--allow-missing", action="store_true",
+                       help="Merge even if some shards did not produce a partial run")
+    merge.add_argument("--baseline", action="store_true",
+                       help="Append one baseline entry for the merged run")
+    args = parser.parse_args()
+
+    if args.command == "plan":
+        try:
+            index, count = parse_shard(args.shard)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        test_cases = manifest.load().metadata()
+        durations = historical_durations() if args.strategy == "duration" else None
+        assignment = assign_shards([tc["id"] for tc in test_cases], count, args.strategy, durations)
+        if args.export:
+            try:
+                write_assignment(args.export, count, args.strategy, assignment)
+            except OSError as e:
+                print(f"Error: Could not write {args.export}: {e}", file=sys.stderr)
+                sys.exit(1)
+        print("\n".join(tc["id"] for tc in select_shard(test_cases, index, assignment)))
+        return
+
+    try:
+        summary = merge_runs(args.partial_dirs, args.output_dir, args.allow_missing)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.baseline:
+        summary["regression"] = update_baseline.update_baseline_with_report(
+            Path(args.output_dir) / "report.json"
+        )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Single command-line entry point for Specimin evaluation framework.
+Dispatches `specimin-eval <command> [args]` to the evaluation scripts,
+importing only the module a command needs. An optional long-lived daemon,
+reached over a Unix socket, keeps modules, the manifest index, rubric
+templates, caches and worker pools in memory between calls; commands fall
+back to running in-process when no daemon is available.
+"""
+
+import io
+import os
+import sys
+import json
+import stat
+import time
+import socket
+import struct
+import hashlib
+import tempfile
+import importlib
+import subprocess
+import contextlib
+import socketserver
+from pathlib import Path
+
+
+EVAL_DIR = Path(__file__).parent
+
+# Subcommand -> module whose main() implements it
+COMMANDS = {
+    "workspace": "workspace",
+    "run": "orchestrator",
+    "test": "test_runner",
+    "score": "score_artifacts",
+    "report": "reporter",
+    "baseline": "update_baseline",
+    "baselines": "baseline_store",
+    "regression": "regression",
+    "shard": "sharding",
+    "manifest": "manifest",
+    "schedule": "scheduler",
+    "trace": "instrumentation",
+    "checkpoint": "checkpoint",
+    "result-cache": "result_cache",
+    "score-cache": "score_cache",
+    "benchmark": "benchmark"
+}
+
+# Commands never sent to the daemon: full pipeline runs are long and load
+# backends from the caller's project
+LOCAL_COMMANDS = ("run",)
+
+# Score options that read a judge response from stdin
+STDIN_OPTIONS = ("--store", "--parse")
+
+# Overrides the daemon socket path; its directory must be private to the user
+SOCKET_ENV_VAR = "SPECIMIN_EVAL_SOCKET"
+
+# Environment sent to the daemon: these variables plus every SPECIMIN_* one.
+# Everything else (API keys, tokens) stays in the client process.
+FORWARDED_ENV = ("PATH", "PYTHONPATH", "HOME", "TMPDIR", "LANG", "LC_ALL", "LC_CTYPE",
+                 "TZ", "VIRTUAL_ENV")
+FORWARDED_ENV_PREFIX = "SPECIMIN_"
+
+# Set to 1 to always run commands in-process
+NO_DAEMON_ENV_VAR = "SPECIMIN_EVAL_NO_DAEMON"
+
+# Seconds without requests after which the daemon exits
+IDLE_TIMEOUT = 1800
+
+# Seconds `daemon start` waits for the socket to accept connections
+START_TIMEOUT = 10
+
+
+def socket_dir():
+    """
+    Returns:
+        Path: Per-user directory for daemon sockets: $XDG_RUNTIME_DIR/specimin-eval,
+            else specimin-eval-{uid} in the temp directory
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return Path(runtime_dir) / "specimin-eval"
+    return Path(tempfile.gettempdir()) / f"specimin-eval-{os.getuid()}"
+
+
+def default_socket_path():
+    """
+    Returns:
+        Path: Per-checkout socket path in socket_dir() (or $SPECIMIN_EVAL_SOCKET)
+    """
+    if os.environ.get(SOCKET_ENV_VAR):
+        return Path(os.environ[SOCKET_ENV_VAR])
+    checkout = hashlib.sha256(str(EVAL_DIR.resolve()).encode()).hexdigest()[:12]
+    return socket_dir() / f"{checkout}.sock"
+
+
+def _is_private(path, is_kind):
+    """Whether path is of the given kind, owned by this user and closed to group and others."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return is_kind(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def is_trusted_socket(socket_path):
+    """
+    Check that a socket and its directory belong to this user alone.
+
+    Another local user could otherwise bind the path first and receive the
+    commands, working directory and environment sent to the daemon.
+
+    Args:
+        socket_path (Path): Daemon socket
+
+    Returns:
+        bool: Whether it is safe to connect
+    """
+    socket_path = Path(socket_path)
+    return _is_private(socket_path.parent, stat.S_ISDIR) and _is_private(socket_path, stat.S_ISSOCK)
+
+
+def _require_private_dir(socket_path):
+    """Create the socket's directory (0700) if needed; exit unless it is private."""
+    with contextlib.suppress(FileExistsError):
+        socket_path.parent.mkdir(mode=0o700)
+    if not _is_private(socket_path.parent, stat.S_ISDIR):
+        print(f"Error: Socket directory {socket_path.parent} must be owned by you "
+              f"and not accessible to group or others", file=sys.stderr)
+        sys.exit(1)
+
+
+def forwarded_env():
+    """
+    Returns:
+        dict: The part of os.environ the daemon needs to run a command
+    """
+    return {
+        name: value for name, value in os.environ.items()
+        if name in FORWARDED_ENV or name.startswith(FORWARDED_ENV_PREFIX)
+    }
+
+
+def source_stamp():
+    """
+    Change detector for the code and rubrics a daemon has loaded.
+
+    Returns:
+        int: Latest modification time (ns) of the eval scripts and rubrics
+    """
+    paths = list(EVAL_DIR.glob("*.py")) + list((EVAL_DIR / "rubrics").glob("*"))
+    return max((p.stat().st_mtime_ns for p in paths if p.exists()), default=0)
+
+
+def run_command(command, args):
+    """
+    Run a subcommand in this process.
+
+    Args:
+        command (str): Key of COMMANDS
+        args (list): Arguments after the subcommand
+
+    Returns:
+        int: Exit code
+    """
+    module = importlib.import_module(COMMANDS[command])
+    saved_argv = sys.argv
+    sys.argv = [f"specimin-eval {command}"] + list(args)
+    try:
+        module.main()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Serves one JSON-line request: a control message or a command."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            return
+
+        server = self.server
+        server.last_request = time.monotonic()
+        control = request.get("control")
+        if control == "stop":
+            reply = {"stopped": True}
+            server.stopping = True
+        elif control == "status":
+            reply = {
+                "pid": os.getpid(),
+                "socket": str(server.server_address),
+                "uptime_seconds": round(time.monotonic() - server.started, 1),
+                "requests": server.requests
+            }
+        elif source_stamp() != server.stamp:
+            # Scripts or rubrics changed; the client reruns the command itself
+            reply = {"stale": True}
+            server.stopping = True
+        else:
+            server.requests += 1
+            reply = _serve_command(request)
+
+        self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+
+def _serve_command(request):
+    """Run a client's command with its cwd, environment, argv and stdin."""
+    import instrumentation
+
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    saved_stdin = sys.stdin
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    try:
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        sys.stdin = io.StringIO(request.get("stdin") or "")
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                exit_code = run_command(request["command"], request["args"])
+            except Exception as e:
+                print(f"Error: {type(e).__name__}: {e}", file=sys.stderr)
+                exit_code = 1
+            finally:
+                instrumentation.disable()
+    finally:
+        sys.stdin = saved_stdin
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+
+    return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Unix socket server handling one request at a time."""
+
+    def __init__(self, socket_path):
+        """
+        Args:
+            socket_path (Path): Socket to listen on
+        """
+        super().__init__(str(socket_path), _Handler)
+        os.chmod(socket_path, 0o600)
+        self.stamp = source_stamp()
+        self.started = self.last_request = time.monotonic()
+        self.requests = 0
+        self.stopping = False
+
+
+def preload():
+    """Import every command module and warm the in-memory caches."""
+    for module_name in COMMANDS.values():
+        importlib.import_module(module_name)
+
+    import manifest
+    import test_runner
+    import score_artifacts
+
+    test_runner.keep_worker_pools()
+    with contextlib.suppress(OSError, ValueError):
+        manifest.load()
+    for artifact_type in score_artifacts.ARTIFACT_TYPES:
+        with contextlib.suppress(OSError):
+            score_artifacts.load_template(artifact_type)
+
+
+def serve(socket_path, idle_timeout=IDLE_TIMEOUT):
+    """
+    Run the daemon in this process until stopped, stale or idle.
+
+    Args:
+        socket_path (Path): Socket to listen on
+        idle_timeout (int): Seconds without requests before exiting
+    """
+    import test_runner
+
+    socket_path = Path(socket_path)
+    _require_private_dir(socket_path)
+    if _connect(socket_path) is not None:
+        print(f"Error: A daemon is already listening on {socket_path}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        socket_path.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Error: Could not remove stale socket {socket_path}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    preload()
+    server = DaemonServer(socket_path)
+    server.timeout = 1
+    try:
+        while not server.stopping and time.monotonic() - server.last_request < idle_timeout:
+            server.handle_request()
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+        test_runner.shutdown_worker_pools()
+
+
+def _connect(socket_path):
+    """Return a connected socket, or None if no trusted daemon is listening."""
+    if not is_trusted_socket(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+        if hasattr(socket, "SO_PEERCRED"):
+            credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+            _, uid, _ = struct.unpack("3i", credentials)
+            if uid != os.getuid():
+                raise OSError(f"daemon runs as uid {uid}")
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def request_daemon(socket_path, request):
+    """
+    Send one request to the daemon.
+
+    Args:
+        socket_path (Path): Daemon socket
+        request (dict): JSON-serializable request
+
+    Returns:
+        dict: The reply, or None if no daemon answered
+    """
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+    try:
+        with sock, sock.makefile("rwb") as stream:
+            stream.write((json.dumps(request) + "\n").encode("utf-8"))
+            stream.flush()
+            line = stream.readline()
+    except OSError:
+        return None
+    return json.loads(line) if line else None
+
+
+def start_daemon(socket_path, idle_timeout=IDLE_TIMEOUT):
+    """
+    Start a background daemon and wait until it accepts connections.
+
+    Args:
+        socket_path (Path): Socket to listen on
+        idle_timeout (int): Seconds without requests before it exits
+
+    Returns:
+        bool: Whether a daemon is listening
+    """
+    if request_daemon(socket_path, {"control": "status"}) is not None:
+        return True
+
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "daemon", "run",
+         "--socket", str(socket_path), "--idle-timeout", str(idle_timeout)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if request_daemon(socket_path, {"control": "status"}) is not None:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def run_via_daemon(socket_path, command, args):
+    """
+    Run a command on the daemon, if one is listening and up to date.
+
+    Args:
+        socket_path (Path): Daemon socket
+        command (str): Key of COMMANDS
+        args (list): Arguments after the subcommand
+
+    Returns:
+        int: Exit code, or None if the command must run locally
+    """
+    if command in LOCAL_COMMANDS or not os.path.lexists(socket_path):
+        return None
+    if not is_trusted_socket(socket_path):
+        print(f"Warning: Ignoring daemon socket {socket_path}: not private to this user", file=sys.stderr)
+        return None
+
+    stdin = None
+    if command == "score" and any(option in args for option in STDIN_OPTIONS):
+        stdin = sys.stdin.read()
+
+    reply = request_daemon(socket_path, {
+        "command": command,
+        "args": args,
+        "cwd": os.getcwd(),
+        "env": forwarded_env(),
+        "stdin": stdin
+    })
+    if reply is None or reply.get("stale"):
+        if stdin is not None:
+            sys.stdin = io.StringIO(stdin)
+        return None
+
+    sys.stdout.write(reply["stdout"])
+    sys.stderr.write(reply["stderr"])
+    return reply["exit_code"]
+
+
+def daemon_main(args):
+    """Handle `specimin-eval daemon <start|stop|status|run> [--socket PATH] [--idle-timeout S]`."""
+    usage = "Usage: specimin-eval daemon <start|stop|status|run> [--socket PATH] [--idle-timeout SECONDS]"
+    if not args or args[0] not in ("start", "stop", "status", "run"):
+        print(usage, file=sys.stderr)
+        sys.exit(1)
+
+    action = args.pop(0)
+    socket_path = default_socket_path()
+    idle_timeout = IDLE_TIMEOUT
+    while args:
+        option = args.pop(0)
+        if option not in ("--socket", "--idle-timeout") or not args:
+            print(usage, file=sys.stderr)
+            sys.exit(1)
+        value = args.pop(0)
+        if option == "--socket":
+            socket_path = Path(value)
+        else:
+            try:
+                idle_timeout = int(value)
+            except ValueError:
+                print(f"Error: Invalid idle timeout '{value}'", file=sys.stderr)
+                sys.exit(1)
+
+    if action == "run":
+        serve(socket_path, idle_timeout)
+    elif action == "start":
+        _require_private_dir(socket_path)
+        if not start_daemon(socket_path, idle_timeout):
+            print(f"Error: Daemon did not start listening on {socket_path}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(request_daemon(socket_path, {"control": "status"}), indent=2))
+    elif action == "stop":
+        if request_daemon(socket_path, {"control": "stop"}) is None:
+            print(f"No daemon listening on {socket_path}")
+    else:
+        status = request_daemon(socket_path, {"control": "status"})
+        if status is None:
+            print(f"No daemon listening on {socket_path}")
+            sys.exit(1)
+        print(json.dumps(status, indent=2))
+
+
+def main():
+    """Main entry point when run as script."""
+    args = sys.argv[1:]
+    use_daemon = os.environ.get(NO_DAEMON_ENV_VAR) != "1"
+    if args and args[0] == "--no-daemon":
+        use_daemon = False
+        args.pop(0)
+
+    if not args or (args[0] not in COMMANDS and args[0] != "daemon"):
+        print("Usage: specimin-eval [--no-daemon] <command> [args]", file=sys.stderr)
+        print(f"Commands: daemon, {', '.join(COMMANDS)}", file=sys.stderr)
+        sys.exit(1)
+
+    command = args.pop(0)
+    if command == "daemon":
+        daemon_main(args)
+        return
+
+    exit_code = run_via_daemon(default_socket_path(), command, args) if use_daemon else None
+    if exit_code is None:
+        exit_code = run_command(command, args)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,27 +4,48 @@ Test execution module for Specimin evaluation framework.
 Runs pytest on generated code and captures results.
 """
 
+import os
 import sys
+import time
+import argparse
+import functools
 import subprocess
+import tempfile
 import json
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
+import result_cache
+import pytest_results
+import instrumentation
 
-def run_test(test_dir):
+
+EVAL_DIR = Path(__file__).parent
+
+# Working directory of pytest runs; never the test directory itself
+PYTEST_CWD = tempfile.gettempdir()
+
+# Wall-clock limit for a single test case, in seconds
+TEST_TIMEOUT = 30
+
+# Process pools kept alive between batches, by (cwd, workers, initializer);
+# None unless keep_worker_pools() was called
+_worker_pools = None
+
+# Raw output kept inline in results.json; the full text goes to OUTPUT_FILE
+MAX_INLINE_OUTPUT = 4000
+OUTPUT_FILE = "pytest_output.txt"
+
+
+def check_test_files(test_dir):
     """
-    Run pytest on code and test files in the given directory.
+    Verify a test directory has code.py and test.py and the code compiles.
 
     Args:
         test_dir (str): Directory containing code.py and test.py
 
     Returns:
-        dict: Test result with keys:
-            - test_id (str): Test case identifier
-            - passed (bool): Whether all tests passed
-            - error_type (str): Type of error if failed
-            - error_message (str): Error details if failed
-            - stdout (str): Standard output
-            - stderr (str): Standard error
+        dict: Failed result dict (see run_test) if a check fails, otherwise None
     """
     test_dir = Path(test_dir)
     test_id = test_dir.name
@@ -68,74 +89,164 @@ def run_test(test_dir):
             "stderr": str(e)
         }
 
-    # Run pytest
-    try:
-        # Modify test file to import the implementation module
-        # This assumes test code uses `implementation` as module name
-        temp_test_file = test_dir / "test_modified.py"
-        with open(test_file, 'r') as f:
-            test_content = f.read()
-
-        # Inject import statement
-        modified_test = f"""
-import sys
-from pathlib import Path
+    return None
 
-# Add code directory to path
-sys.path.insert(0, str(Path(__file__).parent))
 
-# Import implementation as a module
-import code as implementation
+def pytest_command(test_dir, junit_file):
+    """
+    Build the pytest command line for a test case.
 
-{test_content}
-"""
-        with open(temp_test_file, 'w') as f:
-            f.write(modified_test)
+    test.py runs unmodified: implementation_plugin makes code.py importable
+    as `implementation` and provides it as a fixture and module global.
+    Nothing is written to the test directory, so it may be read-only or
+    shared by concurrent runs. Run it from a directory other than the test
+    directory (see PYTEST_CWD), or code.py would shadow the stdlib `code`
+    module that pytest imports.
+
+    Args:
+        test_dir (Path): Directory containing code.py and test.py
+        junit_file (str): Where pytest writes its JUnit XML
+
+    Returns:
+        list: Command and arguments
+    """
+    return [
+        "python3", "-m", "pytest", str(test_dir / "test.py"), "-v",
+        "-p", "no:cacheprovider", "--import-mode=importlib", "--rootdir", str(test_dir),
+        "-p", "implementation_plugin", "--implementation", str(test_dir / "code.py")
+    ] + pytest_results.junit_args(junit_file)
+
+
+def pytest_env():
+    """
+    Environment for pytest subprocesses.
+
+    Returns:
+        dict: os.environ with this directory on PYTHONPATH (for
+            implementation_plugin) and bytecode writing disabled
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(EVAL_DIR), env.get("PYTHONPATH")]))
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def classify_failure(stderr):
+    """
+    Determine the error type of a failed pytest run from its output.
+
+    Only used when no structured results are available (see
+    pytest_results.classify_tests).
+
+    Args:
+        stderr (str): Captured standard error
+
+    Returns:
+        str: One of 'import_error', 'missing_function', 'assertion_failure'
+    """
+    if "ImportError" in stderr or "ModuleNotFoundError" in stderr:
+        return "import_error"
+    elif "AttributeError" in stderr:
+        return "missing_function"
+    return "assertion_failure"
+
+
+def build_pytest_result(test_id, returncode, stdout, stderr, tests):
+    """
+    Build a run_test() result from a finished pytest run.
+
+    Args:
+        test_id (str): Test case identifier
+        returncode (int): pytest exit code
+        stdout (str): Captured standard output
+        stderr (str): Captured standard error
+        tests (list): Structured outcomes from pytest_results.read_junit(), or None
+
+    Returns:
+        dict: Result dict as described in run_test()
+    """
+    passed = returncode == 0
+    result = {
+        "test_id": test_id,
+        "passed": passed,
+        "error_type": None,
+        "error_message": None,
+        "stdout": stdout,
+        "stderr": stderr,
+        "tests": tests or []
+    }
+    if passed:
+        return result
+
+    if tests and any(t["outcome"] in ("failed", "error") for t in tests):
+        result["error_type"] = pytest_results.classify_tests(tests)
+        result["error_message"] = pytest_results.summarize_failures(tests)
+    else:
+        result["error_type"] = classify_failure(stderr)
+        result["error_message"] = stderr or stdout
+    return result
+
+
+def run_test(test_dir, limits=None, timeout=None):
+    """
+    Run pytest on code and test files in the given directory.
+
+    Args:
+        test_dir (str): Directory containing code.py and test.py
+        limits (dict): If given, run under resource limits (see
+            sandbox.DEFAULT_LIMITS); a limit that is hit becomes the
+            error_type ('cpu_limit', 'memory_limit', 'process_limit')
+        timeout (int): Wall-clock limit in seconds (defaults to TEST_TIMEOUT)
+
+    Returns:
+        dict: Test result with keys:
+            - test_id (str): Test case identifier
+            - passed (bool): Whether all tests passed
+            - error_type (str): Type of error if failed
+            - error_message (str): Error details if failed
+            - stdout (str): Standard output
+            - stderr (str): Standard error
+            - tests (list): Per-test outcomes (see pytest_results.parse_junit)
+            - resource_usage (dict): CPU seconds and peak RSS (sandboxed runs only)
+    """
+    test_dir = Path(test_dir)
+    test_id = test_dir.name
+    timeout = timeout or TEST_TIMEOUT
+
+    error = check_test_files(test_dir)
+    if error:
+        return error
+
+    # JUnit XML goes outside the test directory
+    fd, junit_file = tempfile.mkstemp(suffix=".xml", prefix=f"{test_id}-")
+    os.close(fd)
+
+    try:
+        cmd = pytest_command(test_dir.resolve(), junit_file)
+        instrumentation.count("subprocess_spawns")
+        if limits is not None:
+            return _run_sandboxed_pytest(test_id, cmd, junit_file, limits, timeout)
 
-        # Run pytest
         result = subprocess.run(
-            ["python3", "-m", "pytest", str(temp_test_file), "-v"],
+            cmd,
             capture_output=True,
             text=True,
-            timeout=30,
-            cwd=str(test_dir)
+            timeout=timeout,
+            cwd=PYTEST_CWD,
+            env=pytest_env()
         )
 
-        # Clean up temp file
-        temp_test_file.unlink()
-
-        if result.returncode == 0:
-            return {
-                "test_id": test_id,
-                "passed": True,
-                "error_type": None,
-                "error_message": None,
-                "stdout": result.stdout,
-                "stderr": result.stderr
-            }
-        else:
-            # Determine error type from output
-            error_type = "assertion_failure"
-            if "ImportError" in result.stderr or "ModuleNotFoundError" in result.stderr:
-                error_type = "import_error"
-            elif "AttributeError" in result.stderr:
-                error_type = "missing_function"
-
-            return {
-                "test_id": test_id,
-                "passed": False,
-                "error_type": error_type,
-                "error_message": result.stderr or result.stdout,
-                "stdout": result.stdout,
-                "stderr": result.stderr
-            }
+        return build_pytest_result(
+            test_id, result.returncode, result.stdout, result.stderr,
+            pytest_results.read_junit(junit_file)
+        )
 
     except subprocess.TimeoutExpired:
         return {
             "test_id": test_id,
             "passed": False,
             "error_type": "timeout",
-            "error_message": "Test execution timed out after 30 seconds",
+            "error_message": f"Test execution timed out after {timeout} seconds",
             "stdout": "",
             "stderr": ""
         }
@@ -148,19 +259,510 @@ import code as implementation
             "stdout": "",
             "stderr": str(e)
         }
+    finally:
+        if os.path.exists(junit_file):
+            instrumentation.count("bytes_read", os.path.getsize(junit_file))
+            os.unlink(junit_file)
+
+
+def _run_sandboxed_pytest(test_id, cmd, junit_file, limits, timeout):
+    """Run pytest under rlimits and build a run_test() result from the outcome."""
+    import sandbox
+
+    outcome = sandbox.run_sandboxed(cmd, PYTEST_CWD, limits, timeout=timeout, env=pytest_env())
+
+    result = build_pytest_result(
+        test_id, outcome["returncode"], outcome["stdout"], outcome["stderr"],
+        pytest_results.read_junit(junit_file)
+    )
+    result["resource_usage"] = outcome["resource_usage"]
+
+    limit = outcome["limit_hit"]
+    if result["passed"] or not limit:
+        return result
+
+    result["error_type"] = limit
+    if limit == "timeout":
+        result["error_message"] = f"Test execution timed out after {timeout} seconds"
+    else:
+        result["error_message"] = f"Test execution exceeded its {limit.replace('_', ' ')}"
+    return result
+
+
+def find_test_dirs(run_dir):
+    """
+    Find all test case directories in a run directory.
+
+    Args:
+        run_dir (str): Run directory containing test case subdirectories
+
+    Returns:
+        list: Sorted list of Path objects for directories containing code.py or test.py
+    """
+    run_dir = Path(run_dir)
+    return sorted(
+        d for d in run_dir.iterdir()
+        if d.is_dir() and ((d / "code.py").exists() or (d / "test.py").exists())
+    )
+
+
+def _truncate_output(text):
+    if len(text) <= MAX_INLINE_OUTPUT:
+        return text
+    omitted = len(text) - MAX_INLINE_OUTPUT
+    return f"[... {omitted} characters truncated, see {OUTPUT_FILE} ...]\n" + text[-MAX_INLINE_OUTPUT:]
+
+
+def write_results(test_dir, result):
+    """
+    Write a test result into the test case's results.json.
+
+    Existing keys (e.g. test_name, rubric_scores) are preserved; only the
+    test execution fields are replaced. Structured per-test outcomes are
+    stored under 'tests'; stdout/stderr longer than MAX_INLINE_OUTPUT are
+    truncated, with the full text written to OUTPUT_FILE. The file is
+    written atomically so a concurrent reporter never sees a partial file.
+
+    Args:
+        test_dir (str): Test case directory
+        result (dict): Result dict from run_test()
+    """
+    results_file = Path(test_dir) / "results.json"
+
+    record = {}
+    if results_file.exists():
+        try:
+            with open(results_file, 'r') as f:
+                record = json.load(f)
+        except json.JSONDecodeError:
+            record = {}
+
+    record["test_id"] = result["test_id"]
+    record["test_passed"] = result["passed"]
+    record["test_error"] = None if result["passed"] else {
+        "error_type": result["error_type"],
+        "error_message": result["error_message"]
+    }
+    record["tests"] = result.get("tests", [])
+    record.pop("output_file", None)
+
+    # Keep the tail of long output inline (pytest's summary is at the end)
+    stdout, stderr = result["stdout"], result["stderr"]
+    if len(stdout) > MAX_INLINE_OUTPUT or len(stderr) > MAX_INLINE_OUTPUT:
+        output = stdout + ("\n--- stderr ---\n" + stderr if stderr else "")
+        with open(Path(test_dir) / OUTPUT_FILE, 'w') as f:
+            f.write(output)
+        instrumentation.count("bytes_written", len(output))
+        record["output_file"] = OUTPUT_FILE
+    record["stdout"] = _truncate_output(stdout)
+    record["stderr"] = _truncate_output(stderr)
+    # A run without --benchmark must not keep an earlier run's statistics
+    if "benchmark" in result:
+        record["benchmark"] = result["benchmark"]
+    else:
+        record.pop("benchmark", None)
+    if "resource_usage" in result:
+        record["resource_usage"] = result["resource_usage"]
+    else:
+        record.pop("resource_usage", None)
+    # A cached result has no timings; drop those of an earlier execution
+    for key in result_cache.TIMING_FIELDS:
+        if key in result:
+            record[key] = result[key]
+        else:
+            record.pop(key, None)
+
+    data = json.dumps(record, indent=2)
+    temp_file = results_file.with_suffix(".json.tmp")
+    with open(temp_file, 'w') as f:
+        f.write(data)
+    os.replace(temp_file, results_file)
+    instrumentation.count("bytes_written", len(data))
+
+
+def attach_benchmark(test_dir, result):
+    """
+    Run the test case's declared benchmark if its functional tests passed.
+
+    Benchmarks are looked up in test_cases.json by test id; the result gains
+    a 'benchmark' key (see benchmark.run_benchmark) when one is declared.
+
+    Args:
+        test_dir (str): Directory containing code.py
+        result (dict): Result dict from run_test()
+
+    Returns:
+        dict: The result, with 'benchmark' added if a benchmark ran
+    """
+    import benchmark
+
+    if not result["passed"]:
+        return result
+
+    spec = benchmark.load_benchmark_spec(Path(test_dir).name)
+    if spec is not None:
+        with instrumentation.span("benchmark.run", test_id=Path(test_dir).name, stage="benchmark"):
+            result["benchmark"] = benchmark.run_benchmark(test_dir, spec)
+    return result
+
+
+def timed_run(run_fn, test_dir, timeout=None):
+    """
+    Run a test case and record its wall time.
+
+    Args:
+        run_fn: run_test, inprocess_runner.run_test_inprocess or a partial of them
+        test_dir (str): Directory containing code.py and test.py
+        timeout (int): Wall-clock limit in seconds (defaults to TEST_TIMEOUT)
+
+    Returns:
+        dict: Result from run_fn with 'wall_seconds' and 'timeout_seconds' added
+    """
+    with instrumentation.span("test_runner.run_test", test_id=Path(test_dir).name, stage="test"):
+        start = time.perf_counter()
+        result = run_fn(test_dir, timeout=timeout)
+        result["wall_seconds"] = round(time.perf_counter() - start, 3)
+    result["timeout_seconds"] = timeout or TEST_TIMEOUT
+    return result
+
+
+def run_test_case(test_dir, engine="subprocess", use_cache=True, run_benchmark=False,
+                  limits=None, timeout=None):
+    """
+    Run a single test case, consulting the result cache first.
+
+    Args:
+        test_dir (str): Directory containing code.py and test.py
+        engine (str): 'subprocess' or 'inprocess'
+        use_cache (bool): Return and store results in the result cache
+            (ignored for sandboxed runs)
+        run_benchmark (bool): Also run the test case's declared benchmark
+        limits (dict): Resource limits for sandboxed execution (subprocess engine only)
+        timeout (int): Wall-clock limit in seconds (defaults to TEST_TIMEOUT)
+
+    Returns:
+        dict: Result dict as described in run_test()
+    """
+    test_dir = Path(test_dir).resolve()
+    # Sandboxed runs are always executed so their limits and usage apply
+    use_cache = use_cache and limits is None
+    result = result_cache.get_cached_result(test_dir) if use_cache else None
+    if use_cache:
+        instrumentation.count("result_cache_misses" if result is None else "result_cache_hits")
+
+    if result is None:
+        if engine == "inprocess":
+            import inprocess_runner
+            result = timed_run(inprocess_runner.run_test_inprocess, test_dir, timeout)
+        else:
+            result = timed_run(functools.partial(run_test, limits=limits), test_dir, timeout)
+
+        if use_cache:
+            result_cache.store_result(test_dir, result)
+
+    # Timings are never cached
+    if run_benchmark:
+        attach_benchmark(test_dir, result)
+    return result
+
+
+def run_batch(test_dirs, max_workers=None, engine="subprocess", use_cache=True,
+              run_benchmark=False, limits=None, use_history=True):
+    """
+    Run many test cases concurrently on a bounded process pool.
+
+    Each test's results.json is written as soon as that test finishes, so a
+    partially completed batch still leaves usable results on disk. Cache hits
+    are resolved up front and never reach the pool. Benchmarks run one at a
+    time after the pool has drained, so they are not skewed by parallel tests.
+
+    With timing history, test cases are submitted longest-first (by median
+    past wall time) and each gets an adaptive timeout derived from its p95
+    (see scheduler.py), so slow test cases do not land at the tail of the
+    run and hung ones are stopped sooner.
+
+    Args:
+        test_dirs (list): Test case directories to run
+        max_workers (int): Pool size (defaults to the number of CPUs)
+        engine (str): 'subprocess' to spawn pytest per test, or 'inprocess'
+            to run tests in warm workers with pytest already imported
+        use_cache (bool): Reuse results for unchanged code.py/test.py pairs
+            (ignored for sandboxed runs)
+        run_benchmark (bool): Run declared benchmarks for passing test cases
+        limits (dict): Per-test resource limits for sandboxed execution
+            (subprocess engine only)
+        use_history (bool): Order and time out test cases using the wall
+            times recorded in the baseline history
+
+    Returns:
+        dict: Combined summary with keys:
+            - total (int): Number of test cases run
+            - passed (int): Number of passing test cases
+            - failed (int): Number of failing test cases
+            - pass_rate (float): Percentage of passing test cases
+            - error_types (dict): Count of failures per error_type
+            - results (list): Per-test {test_id, passed, error_type}
+            - cache_hits (int): Number of results served from the cache
+            - wall_seconds (float): Elapsed time of the whole batch
+    """
+    with instrumentation.span("test_runner.batch"):
+        return _run_batch(test_dirs, max_workers, engine, use_cache, run_benchmark, limits, use_history)
+
+
+def _run_batch(test_dirs, max_workers, engine, use_cache, run_benchmark, limits, use_history):
+    start = time.perf_counter()
+    # Absolute paths: kept workers may have started in another directory
+    test_dirs = [Path(d).resolve() for d in test_dirs]
+    # Sandboxed runs are always executed so their limits and usage apply
+    use_cache = use_cache and limits is None
+
+    # (test_dir, result) pairs; test ids need not be unique across run dirs
+    completed = []
+    pending = []
+    for test_dir in test_dirs:
+        cached = result_cache.get_cached_result(test_dir) if use_cache else None
+        if cached is not None:
+            write_results(test_dir, cached)
+            completed.append((test_dir, cached))
+        else:
+            pending.append(test_dir)
+    cache_hits = len(completed)
+    if use_cache:
+        instrumentation.count("result_cache_hits", cache_hits)
+        instrumentation.count("result_cache_misses", len(pending))
+
+    timeouts = {}
+    if pending and use_history:
+        import scheduler
+        plan = scheduler.plan_schedule(
+            sorted({d.name for d in pending}), scheduler.load_timing_history(), TEST_TIMEOUT
+        )
+        rank = {test_id: (position, timeout) for position, (test_id, _, timeout) in enumerate(plan)}
+        pending.sort(key=lambda d: rank[d.name][0])
+        timeouts = {d: rank[d.name][1] for d in pending}
+
+    if pending:
+        completed.extend(_run_pool(pending, max_workers, engine, use_cache, limits, timeouts))
+
+    if run_benchmark:
+        for test_dir, result in completed:
+            if "benchmark" in attach_benchmark(test_dir, result):
+                write_results(test_dir, result)
+
+    summary = summarize_results([result for _, result in completed])
+    summary["cache_hits"] = cache_hits
+    summary["wall_seconds"] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def keep_worker_pools():
+    """
+    Keep worker processes alive between batches instead of starting a pool per batch.
+
+    Used by long-lived processes (see specimin_eval.py) so warm workers,
+    e.g. of the in-process engine, are reused across calls.
+    """
+    global _worker_pools
+    if _worker_pools is None:
+        _worker_pools = {}
+
+
+def shutdown_worker_pools():
+    """Stop the worker processes kept by keep_worker_pools()."""
+    global _worker_pools
+    for pool in (_worker_pools or {}).values():
+        pool.shutdown(cancel_futures=True)
+    _worker_pools = None
+
+
+def _worker_pool(max_workers, initializer):
+    """Return (executor, shared): a kept pool if enabled, otherwise a new one."""
+    if _worker_pools is None:
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=initializer), False
+
+    # Workers keep the cwd they started in; never share them across directories
+    key = (os.getcwd(), max_workers, initializer)
+    pool = _worker_pools.get(key)
+    if pool is None or getattr(pool, "_broken", False):
+        pool = _worker_pools[key] = ProcessPoolExecutor(max_workers=max_workers, initializer=initializer)
+    return pool, True
+
+
+def _pooled_run(trace_dir, trace_session, run_fn, test_dir, timeout):
+    """Worker-side timed_run() that records into the submitting batch's trace session."""
+    if trace_dir is not None:
+        instrumentation.enable(trace_dir, trace_session)
+    else:
+        instrumentation.disable()
+    return timed_run(run_fn, test_dir, timeout)
+
+
+def _run_pool(pending, max_workers, engine, use_cache, limits=None, timeouts=None):
+    """
+    Run uncached test cases on the process pool, writing each results.json.
+
+    Test cases are submitted in the given order; `timeouts` maps test
+    directories to their wall-clock limits (TEST_TIMEOUT for any not
+    listed). Test directories must be absolute, since workers may outlive
+    the caller's cwd. Returns (test_dir, result) pairs in completion order.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if _worker_pools is None:
+        max_workers = max(1, min(max_workers, len(pending)))
+
+    if engine == "inprocess":
+        import inprocess_runner
+        run_fn = inprocess_runner.run_test_inprocess
+        initializer = inprocess_runner.init_worker
+    elif limits is not None:
+        run_fn = functools.partial(run_test, limits=limits)
+        initializer = None
+    else:
+        run_fn = run_test
+        initializer = None
+
+    results = []
+    trace_dir = instrumentation.trace_dir()
+    trace_session = instrumentation.session()
+    executor, shared = _worker_pool(max_workers, initializer)
+    try:
+        futures = {
+            executor.submit(_pooled_run, trace_dir, trace_session, run_fn, str(d), (timeouts or {}).get(d)): d
+            for d in pending
+        }
+        for future in as_completed(futures):
+            test_dir = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {
+                    "test_id": test_dir.name,
+                    "passed": False,
+                    "error_type": "execution_error",
+                    "error_message": str(e),
+                    "stdout": "",
+                    "stderr": str(e)
+                }
+            write_results(test_dir, result)
+            if use_cache:
+                result_cache.store_result(test_dir, result)
+            results.append((test_dir, result))
+    finally:
+        if not shared:
+            executor.shutdown()
+
+    return results
+
+
+def summarize_results(results):
+    """
+    Combine individual run_test() results into a batch summary.
+
+    Args:
+        results (list): Result dicts from run_test()
+
+    Returns:
+        dict: Summary as described in run_batch()
+    """
+    results = sorted(results, key=lambda r: r["test_id"])
+    total = len(results)
+    passed = sum(1 for r in results if r["passed"])
+
+    error_types = {}
+    for r in results:
+        if not r["passed"]:
+            error_types[r["error_type"]] = error_types.get(r["error_type"], 0) + 1
+
+    return {
+        "total": total,
+        "passed": passed,
+        "failed": total - passed,
+        "pass_rate": round(passed / total * 100, 2) if total > 0 else 0,
+        "error_types": error_types,
+        "results": [
+            {"test_id": r["test_id"], "passed": r["passed"], "error_type": r["error_type"]}
+            for r in results
+        ]
+    }
 
 
 def main():
     """Main entry point when run as script."""
-    if len(sys.argv) != 2:
-        print("Usage: test_runner.py <test_directory>", file=sys.stderr)
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Run pytest on generated code for one or more test cases."
+    )
+    parser.add_argument("paths", nargs="+",
+                        help="Test directory, or with --batch a run directory or several test directories")
+    parser.add_argument("--batch", action="store_true",
+                        help="Run test cases in parallel and write each results.json")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of parallel workers (default: CPU count)")
+    parser.add_argument("--engine", choices=["subprocess", "inprocess"], default="subprocess",
+                        help="Spawn pytest per test (default) or reuse warm in-process workers")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always execute tests, bypassing the result cache")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Run in directory order with the fixed timeout instead of using timing history")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Run benchmarks declared in test_cases.json for passing test cases")
+    parser.add_argument("--sandbox", action="store_true",
+                        help="Run each test under CPU, memory and process-count rlimits")
+    parser.add_argument("--cpu-limit", type=int, metavar="SECONDS",
+                        help="CPU time limit per test in sandbox mode")
+    parser.add_argument("--memory-limit", type=int, metavar="MB",
+                        help="Address space limit per test in sandbox mode")
+    parser.add_argument("--process-limit", type=int, metavar="N",
+                        help="RLIMIT_NPROC per test in sandbox mode")
+    args = parser.parse_args()
+
+    limits = None
+    if args.sandbox:
+        import sandbox
+        if args.engine == "inprocess":
+            print("Error: --sandbox requires the subprocess engine", file=sys.stderr)
+            sys.exit(1)
+        if not sandbox.is_supported():
+            print("Error: --sandbox requires a POSIX platform", file=sys.stderr)
+            sys.exit(1)
+        limits = dict(sandbox.DEFAULT_LIMITS)
+        if args.cpu_limit is not None:
+            limits["cpu_seconds"] = args.cpu_limit
+        if args.memory_limit is not None:
+            limits["memory_bytes"] = args.memory_limit * 1024 * 1024
+        if args.process_limit is not None:
+            limits["max_processes"] = args.process_limit
+
+    if not args.batch:
+        if len(args.paths) != 1:
+            print("Usage: test_runner.py <test_directory>", file=sys.stderr)
+            print("       test_runner.py --batch <run_directory | test_directory...>", file=sys.stderr)
+            sys.exit(1)
+
+        result = run_test_case(args.paths[0], engine=args.engine, use_cache=not args.no_cache,
+                               run_benchmark=args.benchmark, limits=limits)
+
+        # Print JSON result
+        print(json.dumps(result, indent=2))
+        return
 
-    test_dir = sys.argv[1]
-    result = run_test(test_dir)
+    # A single path without code.py/test.py is treated as a run directory
+    single = Path(args.paths[0])
+    if len(args.paths) == 1 and not (single / "code.py").exists() and not (single / "test.py").exists():
+        if not single.is_dir():
+            print(f"Error: Run directory not found: {single}", file=sys.stderr)
+            sys.exit(1)
+        test_dirs = find_test_dirs(single)
+        instrumentation.enable(single)
+    else:
+        test_dirs = [Path(p) for p in args.paths]
+        parents = {d.resolve().parent for d in test_dirs}
+        if len(parents) == 1:
+            instrumentation.enable(parents.pop())
 
-    # Print JSON result
-    print(json.dumps(result, indent=2))
+    summary = run_batch(test_dirs, max_workers=args.workers, engine=args.engine,
+                        use_cache=not args.no_cache, run_benchmark=args.benchmark,
+                        limits=limits, use_history=not args.no_history)
+    print(json.dumps(summary, indent=2))
 
 
 if __name__ == "__main__":
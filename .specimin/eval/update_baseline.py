@@ -9,40 +9,21 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+import baseline_store
+import regression
+import instrumentation
 
-def load_baselines():
-    """
-    Load existing baseline data or create empty baseline.
 
-    Returns:
-        list: List of baseline entries
+def load_baselines():
     """
-    eval_dir = Path(__file__).parent
-    baseline_file = eval_dir / "baselines.json"
-
-    if not baseline_file.exists():
-        return []
-
-    try:
-        with open(baseline_file, 'r') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        print("Warning: Corrupted baselines.json, starting fresh", file=sys.stderr)
-        return []
+    Load all baseline entries from the baseline store.
 
+    A legacy baselines.json file is migrated into the store on first use.
 
-def save_baselines(baselines):
-    """
-    Save baselines to file.
-
-    Args:
-        baselines (list): List of baseline entries
+    Returns:
+        list: List of baseline entries, oldest first
     """
-    eval_dir = Path(__file__).parent
-    baseline_file = eval_dir / "baselines.json"
-
-    with open(baseline_file, 'w') as f:
-        json.dump(baselines, f, indent=2)
+    return list(baseline_store.iter_entries())
 
 
 def create_baseline_entry(report):
@@ -60,29 +41,50 @@ def create_baseline_entry(report):
     entry = {
         "timestamp": report['timestamp'],
         "run_directory": report['run_directory'],
+        "plugin_version": baseline_store.entry_plugin_version(report),
         "total_tests": stats['total_tests'],
         "passed": stats['passed'],
         "failed": stats['failed'],
         "pass_rate": stats['pass_rate'],
-        "average_scores": stats['average_scores']
+        "average_scores": stats['average_scores'],
+        "test_outcomes": {
+            r.get('test_id', 'unknown'): bool(r.get('test_passed', False))
+            for r in report.get('test_results', [])
+        },
+        "failure_classes": stats.get('failure_classes', {}),
+        "test_durations": {
+            r.get('test_id', 'unknown'): round(sum(t.get('duration', 0.0) for t in r.get('tests', [])), 3)
+            for r in report.get('test_results', [])
+        },
+        "test_wall_seconds": {
+            r.get('test_id', 'unknown'): r['wall_seconds']
+            for r in report.get('test_results', [])
+            if r.get('wall_seconds') is not None
+        }
     }
 
     return entry
 
 
-def detect_regression(current, previous):
+def detect_regression(current, previous, history=None):
     """
     Detect if current run represents a regression from previous.
 
+    With at least regression.MIN_HISTORY past baselines, the decision is made
+    statistically over a rolling window (see regression.analyze_regression);
+    otherwise a pass rate drop of more than 5% from previous is a regression.
+
     Args:
         current (dict): Current baseline entry
         previous (dict): Previous baseline entry
+        history (list): Recent baseline entries, oldest first (optional)
 
     Returns:
         dict: Regression analysis with keys:
             - has_regression (bool)
             - pass_rate_change (float)
             - message (str)
+            - statistical (dict): Rolling window analysis, if history was used
     """
     if not previous:
         return {
@@ -95,26 +97,45 @@ def detect_regression(current, previous):
     previous_rate = previous['pass_rate']
     change = current_rate - previous_rate
 
-    # Regression if pass rate drops by more than 5%
-    has_regression = change < -5.0
-
-    if has_regression:
+    analysis = None
+    if history and len(history) >= regression.MIN_HISTORY:
+        analysis = regression.analyze_regression(current, history)
+        has_regression = analysis["has_regression"]
+    else:
+        # Regression if pass rate drops by more than 5%
+        has_regression = change < -5.0
+
+    if has_regression and analysis:
+        details = []
+        for metric in analysis["regressed_metrics"]:
+            m = analysis["metrics"][metric]
+            lower, upper = m["interval"]
+            details.append(f"{metric} {m['value']} below 95% interval [{lower:.2f}, {upper:.2f}]")
+        new_failures = analysis["flips"]["new_failures"]
+        if new_failures:
+            details.append(f"previously stable test cases now fail: {', '.join(new_failures)}")
+        message = f"⚠️  REGRESSION DETECTED over last {analysis['window']} runs: {'; '.join(details)}"
+    elif has_regression:
         message = f"⚠️  REGRESSION DETECTED: Pass rate dropped {abs(change):.1f}% ({previous_rate}% → {current_rate}%)"
     elif change > 0:
         message = f"✅ Improvement: Pass rate increased {change:.1f}% ({previous_rate}% → {current_rate}%)"
     else:
         message = f"Stable: Pass rate changed {change:.1f}% ({previous_rate}% → {current_rate}%)"
 
-    return {
+    result = {
         "has_regression": has_regression,
         "pass_rate_change": change,
         "message": message
     }
+    if analysis:
+        result["statistical"] = analysis
+
+    return result
 
 
 def update_baseline_with_report(report_path):
     """
-    Update baseline file with new report and check for regressions.
+    Append a new report to the baseline store and check for regressions.
 
     Args:
         report_path (str): Path to report.json file
@@ -122,27 +143,25 @@ def update_baseline_with_report(report_path):
     Returns:
         dict: Regression analysis result
     """
-    # Load report
-    with open(report_path, 'r') as f:
-        report = json.load(f)
-
-    # Load existing baselines
-    baselines = load_baselines()
+    with instrumentation.span("update_baseline.update", stage="baseline") as span:
+        # Load report
+        with open(report_path, 'r') as f:
+            content = f.read()
+        span.count("bytes_read", len(content))
+        report = json.loads(content)
 
-    # Get previous baseline (most recent)
-    previous = baselines[-1] if baselines else None
+        # Get recent baselines (most recent last)
+        history = baseline_store.recent_entries(regression.DEFAULT_WINDOW)
+        previous = history[-1] if history else None
 
-    # Create new baseline entry
-    current = create_baseline_entry(report)
+        # Create new baseline entry
+        current = create_baseline_entry(report)
 
-    # Detect regression
-    regression_analysis = detect_regression(current, previous)
+        # Detect regression
+        regression_analysis = detect_regression(current, previous, history)
 
-    # Append to baselines
-    baselines.append(current)
-
-    # Save updated baselines
-    save_baselines(baselines)
+        # Append to baselines
+        baseline_store.append_entry(current)
 
     return regression_analysis
 
@@ -159,11 +178,13 @@ def main():
         print(f"Error: Report file not found: {report_path}", file=sys.stderr)
         sys.exit(1)
 
+    instrumentation.enable(Path(report_path).parent)
+
     try:
-        regression = update_baseline_with_report(report_path)
+        regression_analysis = update_baseline_with_report(report_path)
 
         # Print regression analysis
-        print(json.dumps(regression, indent=2))
+        print(json.dumps(regression_analysis, indent=2))
 
     except Exception as e:
         print(f"Error updating baseline: {e}", file=sys.stderr)
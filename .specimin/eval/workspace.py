@@ -8,6 +8,8 @@ import json
 import os
 import sys
 from pathlib import Path
+from datetime import datetime
+from functools import lru_cache
 
 
 def get_plugin_version():
@@ -25,6 +27,16 @@ def get_plugin_version():
     project_root = eval_dir.parent.parent
     plugin_json_path = project_root / ".claude-plugin" / "plugin.json"
 
+    try:
+        return _read_plugin_version(plugin_json_path, plugin_json_path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        print(f"Error: plugin.json not found at {plugin_json_path}", file=sys.stderr)
+        sys.exit(1)
+
+
+@lru_cache(maxsize=4)
+def _read_plugin_version(plugin_json_path, mtime_ns):
+    """Read plugin.json; cached per modification time for long-lived processes."""
     try:
         with open(plugin_json_path, 'r') as f:
             plugin_data = json.load(f)
@@ -44,10 +56,41 @@ def get_plugin_version():
         sys.exit(1)
 
 
-def create_run_directory():
+def prepare_run_directory(run_dir, resume=False):
+    """
+    Create a run directory, setting aside the output of an earlier run.
+
+    Unless resuming, a non-empty existing directory is renamed to
+    '{name}.superseded-{timestamp}' next to it, so a new run never mixes
+    its results with those of a previous one.
+
+    Args:
+        run_dir (str): Run directory path
+        resume (bool): Keep the existing directory to continue a run in it
+
+    Returns:
+        str: Path to the run directory
+    """
+    run_dir = Path(run_dir)
+
+    try:
+        if not resume and run_dir.is_dir() and any(run_dir.iterdir()):
+            stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+            run_dir.rename(run_dir.with_name(f"{run_dir.name}.superseded-{stamp}"))
+        run_dir.mkdir(parents=True, exist_ok=True)
+        return str(run_dir)
+    except OSError as e:
+        print(f"Error creating run directory: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def create_run_directory(resume=False):
     """
     Create a version-based run directory for evaluation artifacts.
 
+    Args:
+        resume (bool): Reuse an existing run directory instead of superseding it
+
     Returns:
         str: Path to the created run directory
     """
@@ -59,18 +102,16 @@ def create_run_directory():
     runs_dir = eval_dir / "runs"
     run_dir = runs_dir / f"v{version}"
 
-    # Create directory if it doesn't exist
-    try:
-        run_dir.mkdir(parents=True, exist_ok=True)
-        return str(run_dir)
-    except OSError as e:
-        print(f"Error creating run directory: {e}", file=sys.stderr)
-        sys.exit(1)
+    return prepare_run_directory(run_dir, resume=resume)
 
 
 def main():
     """Main entry point when run as script."""
-    run_dir = create_run_directory()
+    if len(sys.argv) > 2 or (len(sys.argv) == 2 and sys.argv[1] != "--resume"):
+        print("Usage: workspace.py [--resume]", file=sys.stderr)
+        sys.exit(1)
+
+    run_dir = create_run_directory(resume=len(sys.argv) == 2)
     print(run_dir)
 
 